@@ -0,0 +1,109 @@
+import argparse
+import sys
+import time
+from collections.abc import Iterable
+from itertools import islice
+
+import numpy as np
+
+from compact import CompactBoard
+from evaluation import MIDDLEGAME_SCORES, ENDGAME_SCORES, PHASES, MAX_PHASE
+from piece_info import PIECE_FEN, PIECE_INDEX, TYPE_MASK, BLACK_BIT, EMPTY, encode_piece
+
+# Positions are (N, 64) int8 arrays of piece_info codes without the castling bit, indexed like CompactBoard squares.
+SQUARES = np.arange(64)
+DEFAULT_CHUNK_SIZE = 1 << 16
+_INVALID = 0xFF
+
+# FEN placement to one character per square: digits become runs of empty squares and rank separators are dropped.
+_EXPAND = str.maketrans({**{str(n): "." * n for n in range(1, 9)}, "/": None})
+
+def _code_table() -> bytes:
+    table = bytearray([_INVALID] * 256)
+    for piece_type, chars in PIECE_FEN.items():
+        for color, char in enumerate(chars):
+            table[ord(char)] = encode_piece(color, PIECE_INDEX[piece_type]) if piece_type != EMPTY else 0
+    return bytes(table)
+
+_CODES = _code_table()
+
+def _scores_by_code(scores: list[list[list[int]]]) -> np.ndarray:
+    res = np.zeros((BLACK_BIT << 1, 64), dtype=np.int32)
+    for color in range(2):
+        for index in range(1, len(PHASES)):
+            res[encode_piece(color, index)] = scores[color][index]
+    return res
+
+MIDDLEGAME_BY_CODE = _scores_by_code(MIDDLEGAME_SCORES)
+ENDGAME_BY_CODE = _scores_by_code(ENDGAME_SCORES)
+PHASE_BY_CODE = np.array([PHASES[code & TYPE_MASK] if code & TYPE_MASK < len(PHASES) else 0
+                          for code in range(BLACK_BIT << 1)], dtype=np.int32)
+
+def encode_fens(fens: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Piece codes (N, 64) and side to move (N,) for a batch of FENs, without building any ChessPiece.
+
+    The side to move is 0 for white and 1 for black. Raises ValueError on a malformed placement.
+    """
+    placements = []
+    sides = []
+    for fen in fens:
+        fields = fen.split()
+        if len(fields) < 2:
+            raise ValueError("Invalid FEN string.")
+        placements.append(fields[0].translate(_EXPAND))
+        sides.append(fields[1] == "b")
+    if any(len(placement) != 64 for placement in placements):
+        raise ValueError("Invalid FEN string.")
+    # FEN lists squares from A8 to H1, the reverse of rank * 8 + col with column 0 on the H file.
+    codes = np.frombuffer("".join(placements).encode("ascii").translate(_CODES), dtype=np.int8).reshape(-1, 64)
+    if (codes < 0).any():
+        raise ValueError("Invalid FEN string.")
+    return np.ascontiguousarray(codes[:, ::-1]), np.array(sides, dtype=np.int8)
+
+def encode_compact(boards: Iterable[CompactBoard | bytes]) -> np.ndarray:
+    """Piece codes (N, 64) for CompactBoards or their 64 byte squares."""
+    data = b"".join(bytes(board.squares) if isinstance(board, CompactBoard) else bytes(board) for board in boards)
+    codes = np.frombuffer(data, dtype=np.uint8).reshape(-1, 64) & (TYPE_MASK | BLACK_BIT)
+    return codes.astype(np.int8)
+
+def evaluate(codes: np.ndarray, sides: np.ndarray = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """Tapered material and piece-square scores, as Evaluation.score computes them, for every position.
+
+    Scores are from white's point of view, or from the side to move's if sides is given. Positions are
+    scored chunk_size at a time to bound the size of the intermediate arrays.
+    """
+    res = np.empty(len(codes), dtype=np.int32)
+    for start in range(0, len(codes), chunk_size):
+        chunk = codes[start:start + chunk_size]
+        middlegame = MIDDLEGAME_BY_CODE[chunk, SQUARES].sum(axis=1, dtype=np.int64)
+        endgame = ENDGAME_BY_CODE[chunk, SQUARES].sum(axis=1, dtype=np.int64)
+        phase = np.minimum(PHASE_BY_CODE[chunk].sum(axis=1), MAX_PHASE)
+        total = middlegame * phase + endgame * (MAX_PHASE - phase)
+        # Rounded toward zero, like Evaluation.score.
+        res[start:start + chunk_size] = np.sign(total) * (np.abs(total) // MAX_PHASE)
+    if sides is not None:
+        res = np.where(sides != 0, -res, res)
+    return res
+
+def evaluate_fens(fens: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """Scores of a batch of FENs from the side to move's point of view, as Search.evaluate returns them."""
+    codes, sides = encode_fens(fens)
+    return evaluate(codes, sides, chunk_size)
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Score every FEN in a file, one per line, from the side to move.")
+    parser.add_argument("file", type=str, help="File with one FEN per line.")
+    parser.add_argument("-c", "--chunk", type=int, default=DEFAULT_CHUNK_SIZE, help="Positions scored per batch.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    count = 0
+    with open(args.file) as f:
+        while lines := list(islice(f, args.chunk)):
+            fens = [line for line in lines if line.strip()]
+            sys.stdout.write("".join(f"{score}\n" for score in evaluate_fens(fens, args.chunk)))
+            count += len(fens)
+    elapsed = time.perf_counter() - start
+    print(f"{count} positions in {elapsed:.3f}s ({count / elapsed if elapsed else 0:.0f} positions/s)", file=sys.stderr)
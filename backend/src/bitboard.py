@@ -0,0 +1,227 @@
+import numpy as np
+
+from piece_info import PIECE_INDEX, PIECE_TYPES, Color, PieceType, EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, BLACK
+from pieces import ChessPiece, Empty, PIECE_CLASS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS, KNIGHT_MOVES, KING_MOVES, PAWN_CAPTURES, \
+                   ROOK_LINES, BISHOP_LINES, RAYS as PIECE_RAYS
+
+# Squares are numbered rank * 8 + column, using the same (rank, column) tuples as Board.
+def square(position: tuple[int, int]) -> int:
+    return position[0] * 8 + position[1]
+
+def position(square: int) -> tuple[int, int]:
+    return divmod(square, 8)
+
+def squares(mask: int) -> list[int]:
+    res = []
+    while mask:
+        low = mask & -mask
+        res.append(low.bit_length() - 1)
+        mask ^= low
+    return res
+
+def lsb(mask: int) -> int:
+    return (mask & -mask).bit_length() - 1
+
+def msb(mask: int) -> int:
+    return mask.bit_length() - 1
+
+def mask(positions: list[tuple[int, int]]) -> int:
+    res = 0
+    for pos in positions:
+        res |= 1 << square(pos)
+    return res
+
+# Bitmask forms of the move tables in pieces, indexed by square.
+KNIGHT_ATTACKS: list[int] = [mask(KNIGHT_MOVES[position(sq)]) for sq in range(64)]
+KING_ATTACKS: list[int] = [mask(KING_MOVES[position(sq)]) for sq in range(64)]
+# Squares attacked by a pawn of the indexed color standing on each square.
+PAWN_ATTACKS: tuple[list[int], list[int]] = \
+    tuple([mask({move[:2] for move in PAWN_CAPTURES[color][position(sq)]}) for sq in range(64)] for color in range(2))
+RAYS: dict[tuple[int, int], list[int]] = \
+    {direction: [mask(PIECE_RAYS[position(sq)][direction]) for sq in range(64)] for direction in ROOK_DIRECTIONS + BISHOP_DIRECTIONS}
+# BETWEEN[a][b]: squares strictly between two squares on a common rank, file or diagonal, else 0.
+BETWEEN: list[list[int]] = [[mask(ROOK_LINES[position(a)].get(position(b)) or BISHOP_LINES[position(a)].get(position(b)) or [])
+                             for b in range(64)] for a in range(64)]
+POSITIONS: list[tuple[int, int]] = [position(sq) for sq in range(64)]
+# Mask index per piece class; classes hash by identity, which is much cheaper than hashing PieceType members.
+_CLASS_INDEX = {cls: PIECE_INDEX[piece_type] for piece_type, cls in PIECE_CLASS.items()}
+
+# (ray table, ray runs towards higher squares) per direction, so the nearest blocker is the lsb or msb.
+_ROOK_RAYS = [(RAYS[direction], direction > (0, 0)) for direction in ROOK_DIRECTIONS]
+_BISHOP_RAYS = [(RAYS[direction], direction > (0, 0)) for direction in BISHOP_DIRECTIONS]
+
+def _slider_attacks(sq: int, occupied: int, rays: list[tuple[list[int], bool]]) -> int:
+    attacks = 0
+    for table, increasing in rays:
+        ray = table[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= table[lsb(blockers) if increasing else msb(blockers)]
+        attacks |= ray
+    return attacks
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    return _slider_attacks(sq, occupied, _ROOK_RAYS)
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    return _slider_attacks(sq, occupied, _BISHOP_RAYS)
+
+def queen_attacks(sq: int, occupied: int) -> int:
+    return rook_attacks(sq, occupied) | bishop_attacks(sq, occupied)
+
+
+class BitboardRow:
+    """View of one rank of a Bitboards, so board[i][j] reads and writes like a NumPy row."""
+    def __init__(self, bitboards: "Bitboards", rank: int) -> None:
+        self.bitboards = bitboards
+        self.rank = rank
+
+    def __getitem__(self, col: int) -> ChessPiece:
+        return self.bitboards.piece_at(self.rank * 8 + col)
+
+    def __setitem__(self, col: int, piece: ChessPiece) -> None:
+        self.bitboards.set_piece(self.rank * 8 + col, piece)
+
+    def __len__(self) -> int:
+        return 8
+
+    def __iter__(self):
+        return (self[col] for col in range(8))
+
+    def __eq__(self, other) -> np.ndarray:
+        return np.array([piece == other_piece for piece, other_piece in zip(self, other)])
+
+    def __repr__(self) -> str:
+        return str(list(self))
+
+
+class Bitboards:
+    """Piece placement stored as one 64-bit integer per color and piece type.
+
+    Pieces are materialized as ChessPiece objects only when a square is read, so Board code written
+    against the NumPy backend keeps working while hot paths use the masks directly.
+    """
+    def __init__(self) -> None:
+        self.pieces = [[0] * len(PIECE_TYPES) for _ in range(2)]
+        self.occupied = [0, 0]
+        # Squares whose rook or king still has its can_castle flag set.
+        self.castling = 0
+
+    def __getitem__(self, index: int | tuple[int, int]) -> ChessPiece | BitboardRow:
+        if isinstance(index, tuple):
+            return self.piece_at(square(index))
+        return BitboardRow(self, index)
+
+    def __setitem__(self, index: int | tuple[int, int], value: ChessPiece | list[ChessPiece]) -> None:
+        if isinstance(index, tuple):
+            self.set_piece(square(index), value)
+        else:
+            for col, piece in enumerate(value):
+                self.set_piece(index * 8 + col, piece)
+
+    def __len__(self) -> int:
+        return 8
+
+    def __iter__(self):
+        return (BitboardRow(self, rank) for rank in range(8))
+
+    @property
+    def occupancy(self) -> int:
+        return self.occupied[0] | self.occupied[1]
+
+    @classmethod
+    def from_board(cls, board) -> "Bitboards":
+        """Snapshot of any square-indexable board (e.g. the NumPy backend) as bitboards."""
+        res = cls()
+        pieces, occupied = res.pieces, res.occupied
+        for i in range(8):
+            row = board[i]
+            for j in range(8):
+                piece = row[j]
+                if piece is EMPTY:
+                    continue
+                index = _CLASS_INDEX[piece.__class__]
+                if index:
+                    bit = 1 << (i * 8 + j)
+                    color = 1 if piece.color is BLACK else 0
+                    pieces[color][index] |= bit
+                    occupied[color] |= bit
+                    if piece.can_castle:
+                        res.castling |= bit
+        return res
+
+    def copy(self) -> "Bitboards":
+        res = Bitboards()
+        res.pieces = [list(masks) for masks in self.pieces]
+        res.occupied = list(self.occupied)
+        res.castling = self.castling
+        return res
+
+    def piece_at(self, sq: int) -> ChessPiece:
+        bit = 1 << sq
+        if self.occupied[0] & bit:
+            color = WHITE
+        elif self.occupied[1] & bit:
+            color = BLACK
+        else:
+            return Empty()
+        masks = self.pieces[color.value]
+        for index in range(1, len(PIECE_TYPES)):
+            if masks[index] & bit:
+                piece = PIECE_CLASS[PIECE_TYPES[index]](color)
+                if index == PIECE_INDEX[ROOK] or index == PIECE_INDEX[KING]:
+                    piece.can_castle = bool(self.castling & bit)
+                return piece
+        raise ValueError(f"Square {position(sq)} is occupied but holds no piece.")
+
+    def remove(self, sq: int) -> None:
+        keep = ~(1 << sq)
+        for color in range(2):
+            if self.occupied[color] & ~keep:
+                self.occupied[color] &= keep
+                masks = self.pieces[color]
+                for index in range(1, len(masks)):
+                    masks[index] &= keep
+        self.castling &= keep
+
+    def set_piece(self, sq: int, piece: ChessPiece | PieceType) -> None:
+        self.remove(sq)
+        # Evaluators write the bare EMPTY enum when probing moves.
+        if piece is EMPTY or piece.type == EMPTY:
+            return
+        self.add(sq, piece)
+
+    def add(self, sq: int, piece: ChessPiece) -> None:
+        # Assumes sq is empty.
+        bit = 1 << sq
+        color = int(piece.color)
+        self.pieces[color][PIECE_INDEX[piece.type]] |= bit
+        self.occupied[color] |= bit
+        if piece.can_castle:
+            self.castling |= bit
+
+    def pieces_of(self, piece_type: PieceType, color: Color) -> int:
+        return self.pieces[int(color)][PIECE_INDEX[piece_type]]
+
+    def find(self, piece_type: PieceType, color: Color) -> tuple[int, int]:
+        mask = self.pieces_of(piece_type, color)
+        return position(lsb(mask)) if mask else None
+
+    def find_all(self, piece_type: PieceType, color: Color) -> list[tuple[int, int]]:
+        return [position(sq) for sq in squares(self.pieces_of(piece_type, color))]
+
+    def attackers_to(self, sq: int, color: Color, occupied: int = None) -> int:
+        """Mask of the given color's pieces attacking sq, with sliders blocked by occupied."""
+        if occupied is None:
+            occupied = self.occupancy
+        color = int(color)
+        masks = self.pieces[color]
+        queens = masks[PIECE_INDEX[QUEEN]]
+        return (KNIGHT_ATTACKS[sq] & masks[PIECE_INDEX[KNIGHT]]) | \
+               (KING_ATTACKS[sq] & masks[PIECE_INDEX[KING]]) | \
+               (PAWN_ATTACKS[1 - color][sq] & masks[PIECE_INDEX[PAWN]]) | \
+               (rook_attacks(sq, occupied) & (masks[PIECE_INDEX[ROOK]] | queens)) | \
+               (bishop_attacks(sq, occupied) & (masks[PIECE_INDEX[BISHOP]] | queens))
+
+    def is_attacked(self, sq: int, color: Color) -> bool:
+        return self.attackers_to(sq, color) != 0
@@ -1,11 +1,41 @@
 import numpy as np
 from collections import Counter
+from typing import NamedTuple
 
-from piece_info import PIECE_FEN, PAWN, coord_to_board, board_to_coord
-from pieces import FEN_MAP, ChessPiece, EMPTY, KING, ROOK, PieceType, Color, WHITE, BLACK, FEN_MAP, Empty, Pawn, Rook, King, Knight, Bishop, Queen
+from piece_info import PIECE_FEN, PAWN, coord_to_board, board_to_coord, encode_piece
+from pieces import FEN_MAP, ChessPiece, EMPTY, KING, ROOK, PieceType, Color, WHITE, BLACK, FEN_MAP, Empty, Pawn, Rook, King, Knight, Bishop, Queen, piece_from_code
+from bitboard import Bitboards, squares
+from compact import CompactBoard
+from encoding import NO_EN_PASSANT, encode_position, decode_position
+from evaluation import Evaluation
+from zobrist import SIDE_KEY, CASTLING_KEYS, piece_key, en_passant_key, hash_board
+
+BACKENDS = ("array", "bitboard", "compact")
+
+# KQkq castling rights bitmask: (flag, FEN character, color, king position, rook position).
+CASTLING_RIGHTS = ((1, "K", WHITE, (0, 3), (0, 0)), (2, "Q", WHITE, (0, 3), (0, 7)),
+                   (4, "k", BLACK, (7, 3), (7, 0)), (8, "q", BLACK, (7, 3), (7, 7)))
+CASTLING_SQUARES = {position for (_, _, _, king_pos, rook_pos) in CASTLING_RIGHTS for position in (king_pos, rook_pos)}
+
+class Undo(NamedTuple):
+    """Everything move() overwrites, so pop() can restore the previous position exactly."""
+    move: tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]
+    piece: ChessPiece
+    can_castle: bool
+    captured: ChessPiece
+    captured_pos: tuple[int, int]
+    rook_can_castle: bool
+    en_passant_square: str
+    halfmove_clock: int
+    hash: int
+    # Repetition counter replaced by an irreversible move, None if the move kept it.
+    fen_counter: Counter
 
 class Board:
-    def __init__(self, fen=None) -> None:
+    def __init__(self, fen=None, backend: str = "array") -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown board backend {backend}. Backend must be one of {BACKENDS}.")
+        self.backend = backend
         if fen:
             try:
                 self.load_fen(fen)
@@ -31,13 +61,23 @@ class Board:
         return self.chessboard() + self.info()
     
     def clear(self) -> None:
-        self.board = np.array([[Empty() for _ in range(8)] for _ in range(8)])
+        if self.backend == "bitboard":
+            self.board = Bitboards()
+        elif self.backend == "compact":
+            self.board = CompactBoard()
+        else:
+            self.board = np.array([[Empty() for _ in range(8)] for _ in range(8)])
         self.current_player = WHITE
         self.en_passant_square = "-"
         self.halfmove_clock = 0
         self.history = []
+        self.undo_stack = []
         self.move_num = 1
-        self.fen_counter = Counter()
+        # Key of the empty board with white to move.
+        self.hash = 0
+        # Position keys seen since the last irreversible move.
+        self.fen_counter = Counter([self.hash])
+        self.evaluation = Evaluation()
 
     def setup(self) -> None:
         self.clear()
@@ -47,6 +87,7 @@ class Board:
         self.board[6] = [Pawn(BLACK) for _ in range(8)]
         self.board[7] = [Rook(BLACK, True), Knight(BLACK), Bishop(BLACK), King(BLACK, True),
                          Queen(BLACK), Bishop(BLACK), Knight(BLACK), Rook(BLACK, True)]
+        self.rehash()
 
     def char_to_piece(self, char: str) -> ChessPiece:
         return FEN_MAP[char.lower()]
@@ -74,27 +115,68 @@ class Board:
             if "K" in castling_rights and \
                 self.board[0][3] == KING and self.board[0][3] == WHITE and \
                 self.board[0][0] == ROOK and self.board[0][0] == WHITE:
-                self.board[0][3].can_castle = True
-                self.board[0][0].can_castle = True
+                self.set_can_castle((0, 3), True)
+                self.set_can_castle((0, 0), True)
             if "Q" in castling_rights and \
                 self.board[0][3] == KING and self.board[0][3] == WHITE and \
                 self.board[0][7] == ROOK and self.board[0][7] == WHITE:
-                self.board[0][3].can_castle = True
-                self.board[0][7].can_castle = True
+                self.set_can_castle((0, 3), True)
+                self.set_can_castle((0, 7), True)
             if "k" in castling_rights and \
                 self.board[7][3] == KING and self.board[7][3] == BLACK and \
                 self.board[7][0] == ROOK and self.board[7][0] == BLACK:
-                self.board[7][3].can_castle = True
-                self.board[7][0].can_castle = True
+                self.set_can_castle((7, 3), True)
+                self.set_can_castle((7, 0), True)
             if "q" in castling_rights and \
                 self.board[7][3] == KING and self.board[7][3] == BLACK \
                 and self.board[7][7] == ROOK and self.board[7][7] == BLACK:
-                self.board[7][3].can_castle = True
-                self.board[7][7].can_castle = True
+                self.set_can_castle((7, 3), True)
+                self.set_can_castle((7, 7), True)
 
         self.en_passant_square = fen[3]
         self.halfmove_clock = int(fen[4])
         self.move_num = int(fen[5])
+        self.rehash()
+
+    def set_can_castle(self, position: tuple[int, int], can_castle: bool) -> None:
+        # Written back so backends that rebuild pieces on every read keep the flag.
+        piece = self.board[position]
+        piece.can_castle = can_castle
+        self.board[position] = piece
+
+    def castling_rights(self) -> int:
+        rights = 0
+        for flag, _, color, king_pos, rook_pos in CASTLING_RIGHTS:
+            king, rook = self.board[king_pos], self.board[rook_pos]
+            if king == KING and king == color and king.can_castle and \
+               rook == ROOK and rook == color and rook.can_castle:
+                rights |= flag
+        return rights
+
+    def can_capture_en_passant(self) -> bool:
+        """Whether a pawn of the side to move stands next to the en passant square, legal or not."""
+        if self.en_passant_square == "-":
+            return False
+        rank, col = board_to_coord(self.en_passant_square)
+        # The capturing pawn stands one rank behind the en passant square, from the mover's side.
+        rank -= 1 if rank == 5 else -1
+        for side_col in (col - 1, col + 1):
+            if 0 <= side_col < 8:
+                piece = self.board[rank][side_col]
+                if piece == PAWN and piece == self.current_player:
+                    return True
+        return False
+
+    def en_passant_hash(self) -> int:
+        """Zobrist key of the en passant file, 0 unless a pawn of the side to move could capture."""
+        return en_passant_key(self.en_passant_square) if self.can_capture_en_passant() else 0
+
+    def rehash(self) -> None:
+        # Needed after writing squares directly instead of through move(); restarts repetition counting
+        # and recomputes the incremental evaluation.
+        self.hash = hash_board(self)
+        self.fen_counter = Counter([self.hash])
+        self.evaluation = Evaluation.from_board(self.board)
 
     def to_fen(self) -> str:
         fen = ""
@@ -114,64 +196,179 @@ class Board:
                 fen += "/"
 
         fen += " " + ("w" if self.current_player == WHITE else "b") + " "
-        castling_rights = ""
-        if self.board[0][3] == KING and self.board[0][3] == WHITE and self.board[0][3].can_castle and \
-           self.board[0][0] == ROOK and self.board[0][0] == WHITE and self.board[0][0].can_castle:
-            castling_rights += "K"
-        if self.board[0][3] == KING and self.board[0][3] == WHITE and self.board[0][3].can_castle and \
-           self.board[0][7] == ROOK and self.board[0][7] == WHITE and self.board[0][7].can_castle:
-            castling_rights += "Q"
-        if self.board[7][3] == KING and self.board[7][3] == BLACK and self.board[7][3].can_castle and \
-           self.board[7][0] == ROOK and self.board[7][0] == BLACK and self.board[7][0].can_castle:
-            castling_rights += "k"
-        if self.board[7][3] == KING and self.board[7][3] == BLACK and self.board[7][3].can_castle and \
-           self.board[7][7] == ROOK and self.board[7][7] == BLACK and self.board[7][7].can_castle:
-            castling_rights += "q"
+        rights = self.castling_rights()
+        castling_rights = "".join(char for flag, char, _, _, _ in CASTLING_RIGHTS if rights & flag)
         fen += castling_rights if castling_rights else "-"
         fen += " " + self.en_passant_square + " " + str(self.halfmove_clock) + " " + str(self.move_num)
         return fen
 
+    def to_bytes(self) -> bytes:
+        """The position in the fixed 32 byte format of encoding.encode_position. Move history is not kept."""
+        if self.backend == "compact":
+            codes = self.board.squares
+        else:
+            codes = [0] * 64
+            for color, masks in enumerate(self.bitboards().pieces):
+                for index in range(1, len(masks)):
+                    for sq in squares(masks[index]):
+                        codes[sq] = encode_piece(color, index)
+        en_passant = board_to_coord(self.en_passant_square) if self.en_passant_square != "-" else None
+        return encode_position(codes, int(self.current_player), self.castling_rights(),
+                               en_passant[0] * 8 + en_passant[1] if en_passant else NO_EN_PASSANT,
+                               self.halfmove_clock, self.move_num)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, backend: str = "array") -> "Board":
+        position = decode_position(data)
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown board backend {backend}. Backend must be one of {BACKENDS}.")
+        # Skips __init__, which would set up the starting position only for it to be cleared.
+        board = cls.__new__(cls)
+        board.backend = backend
+        board.clear()
+        for sq, code in enumerate(position.codes):
+            if code:
+                board.board[divmod(sq, 8)] = piece_from_code(code)
+        for flag, _, _, king_pos, rook_pos in CASTLING_RIGHTS:
+            if position.castling & flag:
+                board.set_can_castle(king_pos, True)
+                board.set_can_castle(rook_pos, True)
+        board.current_player = Color(position.side)
+        if position.en_passant != NO_EN_PASSANT:
+            board.en_passant_square = coord_to_board(divmod(position.en_passant, 8)).lower()
+        board.halfmove_clock = position.halfmove
+        board.move_num = position.fullmove
+        board.rehash()
+        return board
+
     def move(self, start_pos: tuple[int, int], end_pos: tuple[int, int] | tuple[int, int, str]) -> None:
         self.history.append((start_pos, end_pos))
         self.move_num += 1
         piece = self.board[start_pos]
         destination = self.board[end_pos[:2]]
+        can_castle = piece.can_castle
+        captured, captured_pos, rook_can_castle = destination, end_pos[:2], None
+
+        # Zobrist key is updated incrementally: xor out what leaves, xor in what arrives.
+        key = self.hash ^ SIDE_KEY ^ self.en_passant_hash() ^ \
+              piece_key(piece, start_pos) ^ piece_key(destination, end_pos[:2])
+        touches_castling = start_pos in CASTLING_SQUARES or end_pos[:2] in CASTLING_SQUARES
+        if touches_castling:
+            key ^= CASTLING_KEYS[self.castling_rights()]
+        evaluation = self.evaluation
+        evaluation.remove(piece, start_pos)
+        evaluation.remove(destination, end_pos[:2])
 
         if piece == KING or piece == ROOK:
-            self.board[start_pos].can_castle = False
+            piece.can_castle = False
         
         if len(end_pos) == 3:
-            self.board[end_pos[:2]] = FEN_MAP[end_pos[2]](self.current_player)
+            promoted = FEN_MAP[end_pos[2]](self.current_player)
+            self.board[end_pos[:2]] = promoted
+            key ^= piece_key(promoted, end_pos[:2])
+            evaluation.add(promoted, end_pos[:2])
         elif piece == PAWN and self.en_passant_square != "-" and end_pos == board_to_coord(self.en_passant_square):
             self.board[end_pos] = piece
+            captured, captured_pos = self.board[start_pos[0]][end_pos[1]], (start_pos[0], end_pos[1])
+            key ^= piece_key(piece, end_pos) ^ piece_key(captured, captured_pos)
+            evaluation.add(piece, end_pos)
+            evaluation.remove(captured, captured_pos)
             self.board[start_pos[0]][end_pos[1]] = Empty()
         elif piece == KING and abs(start_pos[1] - end_pos[1]) == 2:
             self.board[end_pos] = piece
             side = end_pos[1] > start_pos[1]
             rook = self.board[7*self.current_player][7*side]
+            rook_can_castle = rook.can_castle
             rook.can_castle = False
             self.board[7*self.current_player][7*side] = Empty()
             self.board[7*self.current_player][(start_pos[1]+end_pos[1])//2] = rook
+            key ^= piece_key(piece, end_pos) ^ piece_key(rook, (7*self.current_player, 7*side)) ^ \
+                   piece_key(rook, (7*self.current_player, (start_pos[1]+end_pos[1])//2))
+            evaluation.add(piece, end_pos)
+            evaluation.remove(rook, (7*self.current_player, 7*side))
+            evaluation.add(rook, (7*self.current_player, (start_pos[1]+end_pos[1])//2))
         else:
             self.board[end_pos] = piece
+            key ^= piece_key(piece, end_pos)
+            evaluation.add(piece, end_pos)
         self.board[start_pos] = Empty()
         self.current_player = Color(1 - self.current_player)
 
+        undo = Undo((start_pos, end_pos), piece, can_castle, captured, captured_pos, rook_can_castle,
+                    self.en_passant_square, self.halfmove_clock, self.hash, None)
         if piece == PAWN and abs(start_pos[0] - end_pos[0]) == 2:
             self.en_passant_square = coord_to_board(((start_pos[0] + end_pos[0]) // 2, start_pos[1])).lower()
         else:
             self.en_passant_square = "-"
 
-        if piece == PAWN or destination != EMPTY:
+        if touches_castling:
+            key ^= CASTLING_KEYS[self.castling_rights()]
+        self.hash = key ^ self.en_passant_hash()
+
+        if piece == PAWN or captured != EMPTY:
             self.halfmove_clock = 0
+            undo = undo._replace(fen_counter=self.fen_counter)
             self.fen_counter = Counter()
         else:
             self.halfmove_clock += 1
-            self.fen_counter[self.to_fen()] += 1
+        self.fen_counter[self.hash] += 1
+        self.undo_stack.append(undo)
+
+    def push(self, move: tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]) -> None:
+        self.move(*move)
+
+    def pop(self) -> tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]:
+        undo = self.undo_stack.pop()
+        start_pos, end_pos = undo.move
+        self.history.pop()
+        self.move_num -= 1
+        self.current_player = Color(1 - self.current_player)
+
+        if undo.fen_counter is not None:
+            self.fen_counter = undo.fen_counter
+        else:
+            self.fen_counter[self.hash] -= 1
+            if not self.fen_counter[self.hash]:
+                del self.fen_counter[self.hash]
+
+        evaluation = self.evaluation
+        if undo.rook_can_castle is not None:
+            side = end_pos[1] > start_pos[1]
+            rook = self.board[7*self.current_player][(start_pos[1]+end_pos[1])//2]
+            evaluation.remove(rook, (7*self.current_player, (start_pos[1]+end_pos[1])//2))
+            evaluation.add(rook, (7*self.current_player, 7*side))
+            rook.can_castle = undo.rook_can_castle
+            self.board[7*self.current_player][(start_pos[1]+end_pos[1])//2] = Empty()
+            self.board[7*self.current_player][7*side] = rook
+        piece = undo.piece
+        piece.can_castle = undo.can_castle
+        # The piece on the end square differs from the mover after a promotion.
+        evaluation.remove(self.board[end_pos[:2]], end_pos[:2])
+        evaluation.add(piece, start_pos)
+        self.board[end_pos[:2]] = Empty()
+        self.board[start_pos] = piece
+        if undo.captured != EMPTY:
+            self.board[undo.captured_pos] = undo.captured
+            evaluation.add(undo.captured, undo.captured_pos)
+
+        self.en_passant_square = undo.en_passant_square
+        self.halfmove_clock = undo.halfmove_clock
+        self.hash = undo.hash
+        return undo.move
+
+    def bitboards(self) -> Bitboards:
+        # The bitboard backend is returned as is, other backends are snapshotted.
+        if self.backend == "bitboard":
+            return self.board
+        if self.backend == "compact":
+            return self.board.bitboards()
+        return Bitboards.from_board(self.board)
 
     def find_piece(self, piece_type: PieceType, color: Color = None) -> tuple[int, int]:
         if not color:
             color = self.current_player
+        if self.backend != "array":
+            return self.board.find(piece_type, color)
         for i in range(8):
             for j in range(8):
                 if self.board[i][j] == piece_type and self.board[i][j] == color:
@@ -181,6 +378,8 @@ class Board:
     def find_pieces(self, piece_type: PieceType, color: Color = None) -> list[tuple[int, int]]:
         if not color:
             color = self.current_player
+        if self.backend != "array":
+            return self.board.find_all(piece_type, color)
         res = []
         for i in range(8):
             for j in range(8):
@@ -1,25 +1,27 @@
 import argparse
 
 from piece_info import Color, WHITE
-from board import Board
+from board import Board, BACKENDS
 from evaluator import GameEvaluator
 from handler import Handler
 
 class Chess:
-    def __init__(self, fen: str = None, moves: list[str] = None, verbose: bool = False) -> None:
+    def __init__(self, fen: str = None, moves: list[str] = None, verbose: bool = False, backend: str = "array") -> None:
         self.args = self.parse_args()
         self.fen = self.args.fen if self.args.fen else fen
         self.verbose = self.args.verbose if self.args.verbose else verbose
+        self.backend = self.args.backend if self.args.backend else backend
         self.moves = moves
 
     def parse_args(self) -> argparse.Namespace:
         parser = argparse.ArgumentParser(description="Chess game.")
         parser.add_argument("-f", "--fen", type=str, help="FEN string to load.")
         parser.add_argument("-v", "--verbose", action="store_true", help="Prints additional info at each move.")
+        parser.add_argument("-b", "--backend", type=str, choices=BACKENDS, help="Board storage backend.")
         return parser.parse_args()
 
     def play(self) -> int:
-        board = Board(self.fen)
+        board = Board(self.fen, self.backend)
         evaluator = GameEvaluator(board)
         handler = Handler()
         game_state = evaluator.is_game_over()
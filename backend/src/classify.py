@@ -0,0 +1,106 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from itertools import islice
+from typing import TextIO
+
+from board import Board
+from evaluator import GameEvaluator
+
+DEFAULT_CHUNK_SIZE = 256
+# Chunks in flight per worker; bounds memory to about workers * this * chunk size lines.
+CHUNKS_PER_WORKER = 2
+REPORT_INTERVAL = 1.0
+
+def to_fen(line: str) -> str:
+    """FEN for a FEN or EPD line. EPD has no move counters, so they come from its hmvc and fmvn opcodes or default to 0 and 1."""
+    fields = line.split()
+    if len(fields) >= 6 and fields[4].isdigit() and fields[5].isdigit():
+        return " ".join(fields[:6])
+    operations = (operation.split(maxsplit=1) for operation in " ".join(fields[4:]).split(";"))
+    opcodes = {operation[0]: operation[1] for operation in operations if len(operation) == 2}
+    return " ".join(fields[:4] + [opcodes.get("hmvc", "0"), opcodes.get("fmvn", "1")])
+
+def classify(board: Board, line: str) -> dict[str, any]:
+    """Legal move count and game state of one position, loaded into board."""
+    fen = to_fen(line)
+    try:
+        board.load_fen(fen)
+    except Exception as e:
+        return {"fen": fen, "error": str(e) or "Invalid FEN string."}
+    evaluator = GameEvaluator(board)
+    moves = evaluator.all_valid_moves()
+    check = bool(evaluator.in_check())
+    if not moves:
+        state = "checkmate" if check else "stalemate"
+    elif evaluator.is_fifty_move_rule()["fifty_move_rule"]:
+        state = "fifty_move_rule"
+    else:
+        state = "ongoing"
+    return {"fen": fen, "legal_moves": len(moves), "in_check": check, "state": state}
+
+def classify_chunk(lines: list[tuple[int, str]], backend: str = "array") -> str:
+    """JSON lines for (line number, line) pairs, serialized in the worker to keep the parent's share small."""
+    board = Board(backend=backend)
+    return "".join(json.dumps({"line": number, **classify(board, line)}) + "\n" for number, line in lines)
+
+def chunks(lines: Iterable[str], size: int) -> Iterator[list[tuple[int, str]]]:
+    # Blank lines are skipped but still counted, so line numbers match the input file.
+    numbered = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+    while chunk := list(islice(numbered, size)):
+        yield chunk
+
+def classify_stream(lines: Iterable[str], output: TextIO, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    backend: str = "array", report: TextIO = None) -> int:
+    """Classifies every position in lines on a process pool, writing JSON lines to output in input order.
+
+    Only CHUNKS_PER_WORKER chunks per worker are read ahead of the output, so memory stays bounded
+    however long the input is. Throughput is written to report, if given, about every REPORT_INTERVAL
+    seconds. Returns the number of positions.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = last_report = time.perf_counter()
+    count = 0
+    pending = deque()
+
+    def write_oldest() -> None:
+        nonlocal count, last_report
+        size, task = pending.popleft()
+        output.write(task.get())
+        count += size
+        now = time.perf_counter()
+        if report is not None and now - last_report >= REPORT_INTERVAL:
+            report.write(f"{count} positions, {count / (now - start):.0f} positions/s\n")
+            last_report = now
+
+    with multiprocessing.get_context().Pool(workers) as pool:
+        for chunk in chunks(lines, chunk_size):
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                write_oldest()
+            pending.append((len(chunk), pool.apply_async(classify_chunk, (chunk, backend))))
+        while pending:
+            write_oldest()
+    if report is not None:
+        elapsed = time.perf_counter() - start
+        report.write(f"{count} positions in {elapsed:.3f}s ({count / elapsed if elapsed else 0:.0f} positions/s, {workers} workers)\n")
+    return count
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Count legal moves and classify the game state of every position in a FEN or EPD file.")
+    parser.add_argument("file", type=str, help="Input file with one FEN or EPD position per line.")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Output file for the JSON lines (default stdout).")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default one per core).")
+    parser.add_argument("-c", "--chunk", type=int, default=DEFAULT_CHUNK_SIZE, help="Positions per task sent to a worker.")
+    parser.add_argument("-b", "--backend", type=str, default="array", help="Board storage backend.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(args.file) as lines, (open(args.output, "w") if args.output else nullcontext(sys.stdout)) as output:
+        classify_stream(lines, output, args.workers, args.chunk, args.backend, sys.stderr)
@@ -0,0 +1,90 @@
+import numpy as np
+
+from bitboard import Bitboards
+from piece_info import PieceType, Color, PIECE_INDEX, TYPE_MASK, BLACK_BIT, CASTLE_BIT, EMPTY, EMPTY_CODE, encode_piece
+from pieces import ChessPiece, piece_from_code
+
+class CompactRow:
+    """View of one rank of a CompactBoard, so board[i][j] reads and writes like a NumPy row."""
+    def __init__(self, compact: "CompactBoard", rank: int) -> None:
+        self.compact = compact
+        self.rank = rank
+
+    def __getitem__(self, col: int) -> ChessPiece:
+        return piece_from_code(self.compact.squares[self.rank * 8 + col])
+
+    def __setitem__(self, col: int, piece: ChessPiece) -> None:
+        self.compact.set_piece(self.rank * 8 + col, piece)
+
+    def __len__(self) -> int:
+        return 8
+
+    def __iter__(self):
+        return (self[col] for col in range(8))
+
+    def __eq__(self, other) -> np.ndarray:
+        return np.array([piece == other_piece for piece, other_piece in zip(self, other)])
+
+    def __repr__(self) -> str:
+        return str(list(self))
+
+
+class CompactBoard:
+    """Piece placement stored as one byte per square, using the piece codes from piece_info.
+
+    A board is a 64 byte bytearray instead of 64 ChessPiece objects. Pieces read through indexing are
+    built on demand as views, while hot paths compare the integer codes directly.
+    """
+    __slots__ = ("squares",)
+
+    def __init__(self, squares: bytes = None) -> None:
+        self.squares = bytearray(squares) if squares is not None else bytearray(64)
+
+    def __getitem__(self, index: int | tuple[int, int]) -> ChessPiece | CompactRow:
+        if isinstance(index, tuple):
+            return piece_from_code(self.squares[index[0] * 8 + index[1]])
+        return CompactRow(self, index)
+
+    def __setitem__(self, index: int | tuple[int, int], value: ChessPiece | list[ChessPiece]) -> None:
+        if isinstance(index, tuple):
+            self.set_piece(index[0] * 8 + index[1], value)
+        else:
+            for col, piece in enumerate(value):
+                self.set_piece(index * 8 + col, piece)
+
+    def __len__(self) -> int:
+        return 8
+
+    def __iter__(self):
+        return (CompactRow(self, rank) for rank in range(8))
+
+    def copy(self) -> "CompactBoard":
+        return CompactBoard(self.squares)
+
+    def code_at(self, sq: int) -> int:
+        return self.squares[sq]
+
+    def set_piece(self, sq: int, piece: ChessPiece | PieceType) -> None:
+        # Evaluators write the bare EMPTY enum when probing moves.
+        self.squares[sq] = EMPTY_CODE if piece is EMPTY else piece.code
+
+    def find(self, piece_type: PieceType, color: Color) -> tuple[int, int]:
+        positions = self.find_all(piece_type, color)
+        return positions[0] if positions else None
+
+    def find_all(self, piece_type: PieceType, color: Color) -> list[tuple[int, int]]:
+        # Masks off the castling bit so kings and rooks match whatever their flag.
+        target = encode_piece(int(color), PIECE_INDEX[piece_type])
+        return [divmod(sq, 8) for sq, code in enumerate(self.squares) if code & (TYPE_MASK | BLACK_BIT) == target]
+
+    def bitboards(self) -> Bitboards:
+        res = Bitboards()
+        for sq, code in enumerate(self.squares):
+            if code:
+                bit = 1 << sq
+                color = (code & BLACK_BIT) >> 3
+                res.pieces[color][code & TYPE_MASK] |= bit
+                res.occupied[color] |= bit
+                if code & CASTLE_BIT:
+                    res.castling |= bit
+        return res
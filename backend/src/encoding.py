@@ -0,0 +1,96 @@
+import struct
+from typing import NamedTuple
+
+import numpy as np
+
+from piece_info import TYPE_MASK, BLACK_BIT
+
+# A position in 32 bytes: occupied squares as a bitmap (bit rank * 8 + col), then one 4-bit piece code
+# (piece_info codes without the castling bit) per occupied square in square order, low nibble first.
+POSITION = np.dtype([("occupancy", "<u8"), ("pieces", "u1", 16), ("halfmove", "<u2"), ("fullmove", "<u2"),
+                     ("side", "u1"), ("castling", "u1"), ("en_passant", "u1"), ("reserved", "u1")])
+POSITION_SIZE = POSITION.itemsize
+MAX_PIECES = 32
+# En passant byte when there is no en passant square.
+NO_EN_PASSANT = 0xFF
+_STRUCT = struct.Struct("<Q16sHHBBBx")
+_CODE_MASK = TYPE_MASK | BLACK_BIT
+
+class Position(NamedTuple):
+    """Fields of one or many encoded positions; for many, each field is an array with one entry per position."""
+    codes: list[int] | np.ndarray
+    side: int | np.ndarray
+    castling: int | np.ndarray
+    en_passant: int | np.ndarray
+    halfmove: int | np.ndarray
+    fullmove: int | np.ndarray
+
+def encode_position(codes: list[int], side: int, castling: int, en_passant: int = NO_EN_PASSANT,
+                    halfmove: int = 0, fullmove: int = 1) -> bytes:
+    """32 bytes for 64 piece codes, the side to move, Board.castling_rights flags and the en passant square index."""
+    occupancy = 0
+    nibbles = []
+    for sq, code in enumerate(codes):
+        if code:
+            occupancy |= 1 << sq
+            nibbles.append(code & _CODE_MASK)
+    if len(nibbles) > MAX_PIECES:
+        raise ValueError(f"Cannot encode more than {MAX_PIECES} pieces.")
+    nibbles.extend([0] * (MAX_PIECES - len(nibbles)))
+    pieces = bytes(nibbles[i] | nibbles[i + 1] << 4 for i in range(0, MAX_PIECES, 2))
+    return _STRUCT.pack(occupancy, pieces, halfmove, fullmove, side, castling, en_passant)
+
+def decode_position(data: bytes) -> Position:
+    if len(data) != POSITION_SIZE:
+        raise ValueError(f"Encoded position must be {POSITION_SIZE} bytes, not {len(data)}.")
+    occupancy, pieces, halfmove, fullmove, side, castling, en_passant = _STRUCT.unpack(data)
+    codes = [0] * 64
+    i = 0
+    while occupancy:
+        sq = (occupancy & -occupancy).bit_length() - 1
+        codes[sq] = pieces[i >> 1] >> (4 * (i & 1)) & 0x0F
+        occupancy &= occupancy - 1
+        i += 1
+    return Position(codes, side, castling, en_passant, halfmove, fullmove)
+
+def pack(codes: np.ndarray, side: np.ndarray = 0, castling: np.ndarray = 0, en_passant: np.ndarray = NO_EN_PASSANT,
+         halfmove: np.ndarray = 0, fullmove: np.ndarray = 1) -> np.ndarray:
+    """POSITION records for an (N, 64) array of piece codes, such as batch.encode_fens returns.
+
+    The other fields are arrays of N values or scalars shared by every position. The records can be
+    written with tofile and read back with np.fromfile(path, dtype=POSITION).
+    """
+    codes = np.asarray(codes).astype(np.uint8) & _CODE_MASK
+    occupied = codes != 0
+    if (occupied.sum(axis=1) > MAX_PIECES).any():
+        raise ValueError(f"Cannot encode more than {MAX_PIECES} pieces.")
+    res = np.zeros(len(codes), dtype=POSITION)
+    res["occupancy"] = np.packbits(occupied, axis=1, bitorder="little").view("<u8")[:, 0]
+    # Pieces go to consecutive nibbles in square order.
+    rows, _ = np.nonzero(occupied)
+    slots = np.cumsum(occupied, axis=1)[occupied] - 1
+    nibbles = np.zeros((len(codes), MAX_PIECES), dtype=np.uint8)
+    nibbles[rows, slots] = codes[occupied]
+    res["pieces"] = nibbles[:, 0::2] | nibbles[:, 1::2] << 4
+    res["side"] = side
+    res["castling"] = castling
+    res["en_passant"] = en_passant
+    res["halfmove"] = halfmove
+    res["fullmove"] = fullmove
+    return res
+
+def unpack(records: np.ndarray) -> Position:
+    """Fields of POSITION records as arrays, with the piece codes as an (N, 64) int8 array."""
+    records = np.asarray(records).view(POSITION).reshape(-1)
+    occupied = np.unpackbits(records["occupancy"].astype("<u8").view(np.uint8).reshape(-1, 8), axis=1,
+                             bitorder="little").astype(bool)
+    pieces = records["pieces"]
+    nibbles = np.empty((len(records), MAX_PIECES), dtype=np.uint8)
+    nibbles[:, 0::2] = pieces & 0x0F
+    nibbles[:, 1::2] = pieces >> 4
+    rows, _ = np.nonzero(occupied)
+    slots = np.cumsum(occupied, axis=1)[occupied] - 1
+    codes = np.zeros((len(records), 64), dtype=np.int8)
+    codes[occupied] = nibbles[rows, slots]
+    return Position(codes, records["side"].copy(), records["castling"].copy(), records["en_passant"].copy(),
+                    records["halfmove"].copy(), records["fullmove"].copy())
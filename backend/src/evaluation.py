@@ -0,0 +1,197 @@
+from piece_info import PIECE_INDEX, PIECE_VALUES, BLACK, EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from pieces import ChessPiece, PIECE_CLASS
+
+# Piece-square tables from white's point of view, written as seen from white's side of the board:
+# the first row is rank 8 and the first column is the A file.
+PAWN_TABLE = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+PAWN_ENDGAME_TABLE = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     80,  80,  80,  80,  80,  80,  80,  80,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     30,  30,  30,  30,  30,  30,  30,  30,
+     20,  20,  20,  20,  20,  20,  20,  20,
+     10,  10,  10,  10,  10,  10,  10,  10,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+KNIGHT_TABLE = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+BISHOP_TABLE = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+ROOK_TABLE = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+)
+QUEEN_TABLE = (
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+)
+KING_TABLE = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+)
+KING_ENDGAME_TABLE = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+
+MIDDLEGAME_TABLES = {PAWN: PAWN_TABLE, KNIGHT: KNIGHT_TABLE, BISHOP: BISHOP_TABLE, ROOK: ROOK_TABLE, QUEEN: QUEEN_TABLE, KING: KING_TABLE}
+ENDGAME_TABLES = {**MIDDLEGAME_TABLES, PAWN: PAWN_ENDGAME_TABLE, KING: KING_ENDGAME_TABLE}
+# Game phase contributed by each piece; 24 with all minor and major pieces on the board, 0 in a pawn ending.
+PHASE_WEIGHTS = {PAWN: 0, KNIGHT: 1, BISHOP: 1, ROOK: 2, QUEEN: 4, KING: 0}
+MAX_PHASE = 24
+
+def _table_index(color: int, sq: int) -> int:
+    # Board squares are rank * 8 + column with column 0 on the H file; tables start at A8 for white.
+    rank, col = divmod(sq, 8)
+    return (rank if color else 7 - rank) * 8 + 7 - col
+
+def _scores(tables: dict) -> list[list[list[int]]]:
+    # [color][piece index][square]: material plus table bonus, signed so white is positive.
+    res = [[[0] * 64 for _ in PIECE_VALUES] for _ in range(2)]
+    for piece_type, table in tables.items():
+        index = PIECE_INDEX[piece_type]
+        for color in range(2):
+            for sq in range(64):
+                res[color][index][sq] = (PIECE_VALUES[index] + table[_table_index(color, sq)]) * (-1)**color
+    return res
+
+MIDDLEGAME_SCORES = _scores(MIDDLEGAME_TABLES)
+ENDGAME_SCORES = _scores(ENDGAME_TABLES)
+PHASES: list[int] = [0] * len(PIECE_VALUES)
+for _piece_type, _weight in PHASE_WEIGHTS.items():
+    PHASES[PIECE_INDEX[_piece_type]] = _weight
+_CLASS_INDEX = {cls: PIECE_INDEX[piece_type] for piece_type, cls in PIECE_CLASS.items()}
+_BISHOP_INDEX = PIECE_INDEX[BISHOP]
+_KNIGHT_INDEX = PIECE_INDEX[KNIGHT]
+_MATING_INDICES = (PIECE_INDEX[PAWN], PIECE_INDEX[ROOK], PIECE_INDEX[QUEEN])
+
+class Evaluation:
+    """Material, piece-square and piece count totals, kept up to date by Board.move and Board.pop.
+
+    Scores are summed with white positive, separately for the middlegame and endgame tables, and
+    blended by phase only when score is called, so a leaf evaluation never walks the board.
+    """
+    __slots__ = ("middlegame", "endgame", "phase", "material", "counts", "bishop_squares")
+
+    def __init__(self) -> None:
+        self.middlegame = 0
+        self.endgame = 0
+        self.phase = 0
+        # Material per color and number of pieces per color and PIECE_INDEX.
+        self.material = [0, 0]
+        self.counts = [[0] * len(PIECE_VALUES) for _ in range(2)]
+        # Bishops per color on light (0) and dark (1) squares, for insufficient material.
+        self.bishop_squares = [[0, 0], [0, 0]]
+
+    @classmethod
+    def from_board(cls, board) -> "Evaluation":
+        res = cls()
+        for i in range(8):
+            row = board[i]
+            for j in range(8):
+                res.add(row[j], (i, j))
+        return res
+
+    def add(self, piece: ChessPiece, position: tuple[int, int]) -> None:
+        if piece is EMPTY:
+            return
+        index = _CLASS_INDEX[piece.__class__]
+        if not index:
+            return
+        color = 1 if piece.color is BLACK else 0
+        sq = position[0] * 8 + position[1]
+        self.middlegame += MIDDLEGAME_SCORES[color][index][sq]
+        self.endgame += ENDGAME_SCORES[color][index][sq]
+        self.phase += PHASES[index]
+        self.material[color] += PIECE_VALUES[index]
+        self.counts[color][index] += 1
+        if index == _BISHOP_INDEX:
+            self.bishop_squares[color][(position[0] + position[1]) & 1] += 1
+
+    def remove(self, piece: ChessPiece, position: tuple[int, int]) -> None:
+        if piece is EMPTY:
+            return
+        index = _CLASS_INDEX[piece.__class__]
+        if not index:
+            return
+        color = 1 if piece.color is BLACK else 0
+        sq = position[0] * 8 + position[1]
+        self.middlegame -= MIDDLEGAME_SCORES[color][index][sq]
+        self.endgame -= ENDGAME_SCORES[color][index][sq]
+        self.phase -= PHASES[index]
+        self.material[color] -= PIECE_VALUES[index]
+        self.counts[color][index] -= 1
+        if index == _BISHOP_INDEX:
+            self.bishop_squares[color][(position[0] + position[1]) & 1] -= 1
+
+    def count(self, piece_type, color) -> int:
+        return self.counts[int(color)][PIECE_INDEX[piece_type]]
+
+    def insufficient_material(self) -> bool:
+        """True if no sequence of moves can mate: a lone minor piece, or only bishops all on one square color."""
+        white, black = self.counts
+        for index in _MATING_INDICES:
+            if white[index] or black[index]:
+                return False
+        knights = white[_KNIGHT_INDEX] + black[_KNIGHT_INDEX]
+        light = self.bishop_squares[0][0] + self.bishop_squares[1][0]
+        dark = self.bishop_squares[0][1] + self.bishop_squares[1][1]
+        return (not knights and not (light and dark)) or (knights == 1 and not (light or dark))
+
+    def score(self, color) -> int:
+        """Tapered evaluation in centipawns from color's point of view."""
+        phase = min(self.phase, MAX_PHASE)
+        total = self.middlegame * phase + self.endgame * (MAX_PHASE - phase)
+        # Rounded toward zero so both sides see the same magnitude.
+        score = total // MAX_PHASE if total >= 0 else -(-total // MAX_PHASE)
+        return -score if int(color) else score
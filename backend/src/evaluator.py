@@ -1,10 +1,137 @@
+from collections.abc import Mapping
+from enum import Enum
+
 from board import Board
+from movegen import legal_moves, in_check
 from piece_info import Color, BLACK, EMPTY, KING, PAWN, ROOK, board_to_coord
 from pieces import ChessPiece, Pawn
 
+class Reason(Enum):
+    """Why a move check failed. Values are the reason templates, formatted only when a reason is read."""
+    VALID = ""
+    OUT_OF_BOUNDS = "Start position {start_pos} is out of bounds."
+    NO_PIECE = "No piece ({piece}) at start position {start_pos}."
+    NOT_CURRENT_PLAYER = "Piece ({piece}) at start position {start_pos} is not the current player's."
+    CANNOT_MOVE = "Piece ({piece}) at start position {start_pos} cannot move to end position {end_pos}."
+    CANNOT_REACH = "Piece ({piece}) at position {start_pos} cannot move to end position {end_pos}."
+    OWN_PIECE = "End position {end_pos} is occupied by piece ({target}) of the same color."
+    OBSTRUCTED = "Path to end position {end_pos} is obstructed by piece ({blocker} at position {square})."
+    INTO_CHECK = "Move from {start_pos} to {end_pos} puts the current player in check by {attackers}."
+    CASTLE_OCCUPIED = "King ({piece}) at position {start_pos} cannot castle to end position {end_pos} because it is occupied."
+    CASTLE_OBSTRUCTED = "King ({piece}) at position {start_pos} cannot castle to end position {end_pos} because the path is obstructed at {square}."
+    CASTLE_ROOK = "King ({piece}) at position {start_pos} cannot castle to end position {end_pos} because the rook at {square} cannot castle."
+    CASTLE_OUT_OF_CHECK = "Move from {start_pos} to {end_pos} castles out of check by {attackers}."
+    CASTLE_THROUGH_CHECK = "Move from {start_pos} to {end_pos} castles through check by {attackers}."
+    PAWN_BLOCKED = "Pawn ({piece}) at position {start_pos} cannot move to end position {end_pos} because it is occupied by a piece ({target})."
+    PAWN_OBSTRUCTED = "Pawn ({piece}) at position {start_pos} cannot move to end position {end_pos} because the path is obstructed at {square}."
+    PAWN_EMPTY_CAPTURE = "Pawn ({piece}) at position {start_pos} cannot capture at end position {end_pos} because it is empty ({target})."
+    PAWN_OWN_PIECE = "Pawn ({piece}) at position {start_pos} cannot move to end position {end_pos} because it is occupied by a piece of the same color ({target})."
+    PROMOTION_MISSING = "Move from {start_pos} to {end_pos} requires promotion piece. Promotion must be one of 'q', 'r', 'b', 'n'."
+    PROMOTION_INVALID = "Invalid promotion {promotion}. Promotion must be one of 'q', 'r', 'b', 'n'."
+    ILLEGAL = "Move from {start_pos} to {end_pos} is not a legal move for piece ({piece})."
+
+    def describe(self, args: dict[str, any]) -> str:
+        if "attackers" in args:
+            args = {**args, "attackers": [f"{piece}{pos}" for piece, pos in args["attackers"]]}
+        return self.value.format(**args)
+
+VALID = Reason.VALID
+GAME_INFO = "Move from {start_pos} to {end_pos}"
+PIECE_INFO = "{piece}({start_pos} -> {end_pos})"
+
+class Validity(Mapping):
+    """Read-only result of a move check with the old result dict's keys ("valid" or "capable", "info", "reason").
+
+    Only the reason code and the raw values are stored; "info" and "reason" are formatted when read.
+    Truthiness follows the check, so `if evaluator.is_valid(...)` works without indexing.
+    """
+    __slots__ = ("key", "code", "info", "args", "piece", "cause")
+
+    def __init__(self, key: str, code: Reason, info: str, args: dict[str, any],
+                 piece: ChessPiece = None, cause: "Validity" = None) -> None:
+        self.key = key
+        self.code = code
+        self.info = info
+        self.args = args
+        self.piece = piece
+        # Result of the piece evaluator the check was delegated to, which formats its own reason.
+        self.cause = cause
+
+    @property
+    def reason(self) -> str:
+        if self.cause is not None:
+            return self.cause.reason
+        return self.code.describe(self.args)
+
+    def __getitem__(self, key: str) -> any:
+        if key == self.key:
+            return self.code is VALID
+        if key == "info":
+            return self.info.format(**self.args)
+        if key == "reason":
+            return self.reason
+        if key == "piece" and self.piece is not None:
+            return self.piece
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from (self.key, "info", "reason")
+        if self.piece is not None:
+            yield "piece"
+
+    def __len__(self) -> int:
+        return 3 if self.piece is None else 4
+
+    def __bool__(self) -> bool:
+        return self.code is VALID
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class LegalMoves:
+    """Legal moves and check status of one position, each computed on first use.
+
+    GameEvaluator keeps the entry for the current position and starts a new one when Board.hash
+    changes, so validating a move, the game-over checks after it and the next turn's validation
+    share a single move generation.
+    """
+    __slots__ = ("board", "hash", "_moves", "_move_set", "_attackers")
+
+    def __init__(self, board: Board) -> None:
+        self.board = board
+        self.hash = board.hash
+        self._moves = None
+        self._move_set = None
+        self._attackers = None
+
+    @property
+    def moves(self) -> list[tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]]:
+        if self._moves is None:
+            self._moves = legal_moves(self.board)
+        return self._moves
+
+    @property
+    def move_set(self) -> set[tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]]:
+        if self._move_set is None:
+            self._move_set = set(self.moves)
+        return self._move_set
+
+    @property
+    def attackers(self) -> list[tuple[int, int]]:
+        if self._attackers is None:
+            self._attackers = in_check(self.board)
+        return self._attackers
+
 class GameEvaluator:
     def __init__(self, board: Board):
         self.board = board
+        self.legal: LegalMoves = None
+
+    def position(self) -> LegalMoves:
+        """Cached legal moves of the current position. Squares written directly need a Board.rehash() first."""
+        if self.legal is None or self.legal.hash != self.board.hash or self.legal.board is not self.board:
+            self.legal = LegalMoves(self.board)
+        return self.legal
 
     def set_piece_eval(self, piece: ChessPiece, position: tuple[int, int]):
         if piece == PAWN:
@@ -15,56 +142,54 @@ class GameEvaluator:
             self.piece_eval = PieceEvaluator(piece, position, self.board)
 
     def in_check(self) -> list[tuple[int, int]]:
-        attacker_pos = []
-        king_pos = self.board.find_piece(KING, self.board.current_player)
-        for i in range(8):
-            for j in range(8):
-                piece = self.board[i][j]
-                if piece == 1 - self.board.current_player:
-                    self.set_piece_eval(piece, (i, j))
-                    res = self.piece_eval.is_capable(king_pos)
-                    if res["capable"]:
-                        attacker_pos.append((i, j))
-        return attacker_pos
-
-
-    def is_valid(self, start_pos: tuple[int, int], end_pos: tuple[int, int] | tuple[int, int, str]) -> dict[str, any]:
-        res = {"valid": False, "info": f"Move from {start_pos} to {end_pos}", "reason": ""}
+        return self.position().attackers
+
+
+    def validity(self, start_pos: tuple[int, int], end_pos: tuple[int, int] | tuple[int, int, str]) -> Reason:
+        """Reason code for a move, VALID if it is legal. Nothing is formatted, so internal callers should prefer it."""
+        self.piece_eval = None
+        # The legal move set decides; the per-piece checks below only pick the reason for a rejected move.
+        if (start_pos, end_pos) in self.position().move_set:
+            return VALID
         if ChessPiece.out_of_bounds(start_pos):
-            res["reason"] = f"Start position {start_pos} is out of bounds."
-            return res
-        
-        piece: ChessPiece = self.board[start_pos]
-        res["piece"] = piece
+            return Reason.OUT_OF_BOUNDS
 
+        piece: ChessPiece = self.board[start_pos]
         if piece == EMPTY:
-            res["reason"] = f"No piece ({piece}) at start position {start_pos}."
-            return res
-        
+            return Reason.NO_PIECE
+
         if piece.color != self.board.current_player:
-            res["reason"] = f"Piece ({piece}) at start position {start_pos} is not the current player's."
-            return res
-        
+            return Reason.NOT_CURRENT_PLAYER
+
         if not piece.can_move(start_pos, end_pos):
-            res["reason"] = f"Piece ({piece}) at start position {start_pos} cannot move to end position {end_pos}."
-            return res
-        
+            return Reason.CANNOT_MOVE
+
         self.set_piece_eval(piece, start_pos)
-        validity = self.piece_eval.is_valid(end_pos)
-        if not validity["valid"]:
-            res["reason"] = validity["reason"]
-            return res
-        
-        res["valid"] = True
-        return res
+        code = self.piece_eval.validity(end_pos)
+        return Reason.ILLEGAL if code is VALID else code
+
+    def is_legal(self, start_pos: tuple[int, int], end_pos: tuple[int, int] | tuple[int, int, str]) -> bool:
+        return self.validity(start_pos, end_pos) is VALID
+
+    def is_valid(self, start_pos: tuple[int, int], end_pos: tuple[int, int] | tuple[int, int, str]) -> Validity:
+        code = self.validity(start_pos, end_pos)
+        args = {"start_pos": start_pos, "end_pos": end_pos}
+        if code is Reason.OUT_OF_BOUNDS:
+            return Validity("valid", code, GAME_INFO, args)
+
+        piece = self.board[start_pos]
+        if code is not VALID and self.piece_eval is not None:
+            return Validity("valid", code, GAME_INFO, args, piece, self.piece_eval.result("valid", code, end_pos))
+        return Validity("valid", code, GAME_INFO, {**args, "piece": piece}, piece)
     
     def is_game_over(self) -> dict[str, any]:
         checkmate = self.is_checkmate()
         stalemate = self.is_stalemate()
         fifty_move_rule = self.is_fifty_move_rule()
+        insufficient_material = self.is_insufficient_material()
         threefold_repetition = self.is_threefold_repetition()
-        return {"game_over": checkmate["checkmate"] or stalemate["stalemate"] or fifty_move_rule["fifty_move_rule"] or threefold_repetition["threefold_repetition"], 
-                "checkmate": checkmate, "stalemate": stalemate, "fifty_move_rule": fifty_move_rule, "threefold_repetition": threefold_repetition}
+        return {"game_over": checkmate["checkmate"] or stalemate["stalemate"] or fifty_move_rule["fifty_move_rule"] or insufficient_material["insufficient_material"] or threefold_repetition["threefold_repetition"], 
+                "checkmate": checkmate, "stalemate": stalemate, "fifty_move_rule": fifty_move_rule, "insufficient_material": insufficient_material, "threefold_repetition": threefold_repetition}
     
     def outcome(self, game_state: dict[str, int]) -> dict[str, int]:
         if game_state["checkmate"]["checkmate"]:
@@ -93,35 +218,21 @@ class GameEvaluator:
             res["reason"] = "No attacker found."
             return res
         
+        # Only legal moves are generated while in check, so every one of them answers the check.
+        moves = self.position().moves
+        running_moves = [end_pos for start_pos, end_pos in moves if start_pos == king_pos]
         capturing_moves = []
         blocking_moves = []
         if len(attacker_pos) == 1:
             attack_pos = attacker_pos[0]
             attacker = self.board[attack_pos]
-            for i in range(len(self.board)):
-                for j in range(len(self.board[i])):
-                    piece = self.board[i][j]
-                    if piece.color != self.board.current_player:
-                        continue
-                    self.set_piece_eval(piece, (i, j))
-                    validity = self.piece_eval.is_valid(attack_pos)
-                    if validity["valid"]:
-                        capturing_moves.append(((i, j), attack_pos))
-                    if piece == PAWN and self.board.en_passant_square != "-":
-                        validity = self.piece_eval.is_valid(board_to_coord(self.board.en_passant_square))
-                        if validity["valid"]:
-                            capturing_moves.append(((i, j), board_to_coord(self.board.en_passant_square)))
-            for square in attacker.line_of_sight(attack_pos, king_pos):
-                for i in range(len(self.board)):
-                    for j in range(len(self.board[i])):
-                        piece = self.board[i][j]
-                        if piece.color != self.board.current_player:
-                            continue
-                        self.set_piece_eval(piece, (i, j))
-                        if self.piece_eval.is_valid(square)["valid"]:
-                            blocking_moves.append(((i, j), square))
-        self.set_piece_eval(king, king_pos)
-        running_moves = [move for move in king.moves(king_pos) if self.piece_eval.is_valid(move)["valid"]]
+            en_passant_pos = board_to_coord(self.board.en_passant_square) if self.board.en_passant_square != "-" else None
+            blocking_squares = attacker.line_of_sight(attack_pos, king_pos)
+            for start_pos, end_pos in moves:
+                if end_pos[:2] == attack_pos or (end_pos == en_passant_pos and self.board[start_pos] == PAWN):
+                    capturing_moves.append((start_pos, end_pos))
+                elif start_pos != king_pos and end_pos[:2] in blocking_squares:
+                    blocking_moves.append((start_pos, end_pos))
         
         res["checkmate"] = not (capturing_moves or blocking_moves or running_moves)
         res["capturing_moves"] = capturing_moves
@@ -137,43 +248,41 @@ class GameEvaluator:
             res["reason"] = f"Attacker found at {attacker_pos}."
             return res
 
-        all_valid_moves = []
-        for i in range(len(self.board)):
-            for j in range(len(self.board[i])):
-                piece = self.board[i][j]
-                if piece.color != self.board.current_player:
-                    continue
-                self.set_piece_eval(piece, (i, j))
-                all_valid_moves.extend([((i, j), move) for move in piece.moves((i, j))  \
-                                        if self.piece_eval.is_valid(move)["valid"]])
+        all_valid_moves = self.position().moves
         res["stalemate"] = not all_valid_moves
         res["moves"] = all_valid_moves
         return res
     
     def is_fifty_move_rule(self):
         res = {"fifty_move_rule": False, "halfmove_clock": self.board.halfmove_clock}
-        if self.board.halfmove_clock >= 50:
+        # Fifty moves by each player, counted in half moves.
+        if self.board.halfmove_clock >= 100:
             res["fifty_move_rule"] = True
+            res["reason"] = "Draw by the fifty-move rule."
+        return res
+    
+    def is_insufficient_material(self):
+        """Read from the piece counts Board keeps up to date, so it never scans the board."""
+        res = {"insufficient_material": False}
+        if self.board.evaluation.insufficient_material():
+            res["insufficient_material"] = True
+            res["reason"] = "Draw by insufficient material."
         return res
     
     def is_threefold_repetition(self):
-        res = {"threefold_repetition": False, "fen": ""}
-        if self.board.fen_counter and self.board.fen_counter.most_common(1)[0][1] >= 3:
+        res = {"threefold_repetition": False, "fen": "", "hash": self.board.hash}
+        if self.board.fen_counter[self.board.hash] >= 3:
             res["threefold_repetition"] = True
-            res["fen"] = self.board.fen_counter.most_common(1)[0][0]
+            res["fen"] = self.board.to_fen()
+            res["reason"] = f"Draw by threefold repetition of {res['fen']}."
         return res
     
-    def all_valid_moves(self):
-        all_valid_moves = []
-        for i in range(len(self.board)):
-            for j in range(len(self.board[i])):
-                piece = self.board[i][j]
-                if piece.color != self.board.current_player:
-                    continue
-                self.set_piece_eval(piece, (i, j))
-                all_valid_moves.extend([((i, j), move) for move in piece.moves((i, j))  \
-                                        if self.piece_eval.is_valid(move)["valid"]])
-        return all_valid_moves
+    def all_valid_moves(self, captures_only: bool = False):
+        """Legal moves of the current position. The full list is the cached one, so copy it before changing it."""
+        if captures_only:
+            return legal_moves(self.board, captures_only)
+        return self.position().moves
+
 
 
 class PieceEvaluator:
@@ -181,32 +290,34 @@ class PieceEvaluator:
         self.piece = piece
         self.position = position
         self.board = board
+        # Values for the reason template of the last failed check, filled in only on failure.
+        self.context = {}
+
+    def result(self, key: str, code: Reason, end_pos: tuple[int, int] | tuple[int, int, str]) -> Validity:
+        return Validity(key, code, PIECE_INFO, {"piece": self.piece, "start_pos": self.position, "end_pos": end_pos, **self.context})
 
-    def set_game_eval(self):
-        self.game_eval = GameEvaluator(self.board)
+    def attackers(self) -> list[tuple[ChessPiece, tuple[int, int]]]:
+        attacker_pos = in_check(self.board)
+        return [(self.board[pos], pos) for pos in attacker_pos]
 
-    def is_capable(self, end_pos: tuple[int, int]) -> dict[str, any]:
-        res = {"info": f"{self.piece}({self.position} -> {end_pos})", "reason": ""}
+    def capability(self, end_pos: tuple[int, int]) -> Reason:
         if not self.piece.can_move(self.position, end_pos):
-            res["capable"] = False
-            res["reason"] = f"Piece ({self.piece}) at position {self.position} cannot move to end position {end_pos}."
-            return res
+            return Reason.CANNOT_REACH
 
-        if self.board[end_pos] != EMPTY and self.board[end_pos].color == self.piece.color:
-            res["capable"] = False
-            res["reason"] = f"End position {end_pos} is occupied by piece ({self.board[end_pos]}) of the same color."
-            return res
-        
-        moves = self.piece.line_of_sight(self.position, end_pos)
-        for move in moves:
+        target = self.board[end_pos]
+        if target != EMPTY and target.color == self.piece.color:
+            self.context = {"target": target}
+            return Reason.OWN_PIECE
+
+        for move in self.piece.line_of_sight(self.position, end_pos):
             if self.board[move] != EMPTY:
-                res["capable"] = False
-                res["reason"] = f"Path to end position {end_pos} is obstructed by piece ({self.board[move]} at position {move})."
-                return res
-            
-        res["capable"] = True
-        return res
-    
+                self.context = {"blocker": self.board[move], "square": move}
+                return Reason.OBSTRUCTED
+        return VALID
+
+    def is_capable(self, end_pos: tuple[int, int]) -> Validity:
+        return self.result("capable", self.capability(end_pos), end_pos)
+
     def try_move(self, end_pos: tuple[int, int]) -> ChessPiece:
         original_piece = self.board[end_pos]
         self.board.board[end_pos] = self.piece
@@ -214,171 +325,118 @@ class PieceEvaluator:
         if self.piece == PAWN and self.board.en_passant_square != "-" and end_pos == board_to_coord(self.board.en_passant_square):
             self.board.board[(self.position[0], end_pos[1])] = EMPTY
         return original_piece
-    
+
     def undo_move(self, original_piece: ChessPiece, end_pos: tuple[int, int]) -> None:
         self.board.board[self.position] = self.piece
         self.board.board[end_pos] = original_piece
         if self.piece == PAWN and self.board.en_passant_square != "-" and end_pos == board_to_coord(self.board.en_passant_square):
             self.board.board[(self.position[0], end_pos[1])] = Pawn(1 - self.piece.color)
-    
-    def is_valid(self, end_pos: tuple[int, int]) -> dict[str, any]:
-        res = {"valid": False, "info": f"{self.piece}({self.position} -> {end_pos})", "reason": ""}
-        capability = self.is_capable(end_pos)
-        if not capability["capable"]:
-            res["reason"] = capability["reason"]
-            return res
-        
-        self.set_game_eval()
+
+    def validity(self, end_pos: tuple[int, int]) -> Reason:
+        code = self.capability(end_pos)
+        if code is not VALID:
+            return code
+
         original_piece = self.try_move(end_pos)
-        attacker_pos = self.game_eval.in_check()
-        if attacker_pos:
-            self.undo_move(original_piece, end_pos)
-            res["reason"] = f"Move from {self.position} to {end_pos} puts the current player in check by {[f'{self.board[pos]}{pos}' for pos in attacker_pos]}."
-            return res
+        attackers = self.attackers()
         self.undo_move(original_piece, end_pos)
-        res["valid"] = True
-        return res
-    
+        if attackers:
+            self.context = {"attackers": attackers}
+            return Reason.INTO_CHECK
+        return VALID
+
+    def is_valid(self, end_pos: tuple[int, int]) -> Validity:
+        return self.result("valid", self.validity(end_pos), end_pos)
+
 class KingEvaluator(PieceEvaluator):
     def __init__(self, piece: ChessPiece, position: tuple[int, int], board: Board):
         super().__init__(piece, position, board)
 
-    def is_capable(self, end_pos: tuple[int, int]) -> dict[str, any]:
-        res = super().is_capable(end_pos)
-        if not res["capable"]:
-            return res
-        
+    def capability(self, end_pos: tuple[int, int]) -> Reason:
+        code = super().capability(end_pos)
+        if code is not VALID:
+            return code
+
         if abs(self.position[1] - end_pos[1]) == 2:
             if self.board[end_pos] != EMPTY:
-                res["capable"] = False
-                res["reason"] = f"King ({self.piece}) at position {self.position} cannot castle to end position {end_pos} because it is occupied."
-                return res
+                return Reason.CASTLE_OCCUPIED
             middle_pos = (self.position[0], (self.position[1] + end_pos[1]) // 2)
             if self.board[middle_pos] != EMPTY:
-                res["capable"] = False
-                res["reason"] = f"King ({self.piece}) at position {self.position} cannot castle to end position {end_pos} because the path is obstructed at {middle_pos}."
-                return res
-            if self.position[1] - end_pos[1] == 2:
-                rook_pos = (self.position[0], 0)
-                rook = self.board[rook_pos]
-                if rook != ROOK or not rook.can_castle:
-                    res["capable"] = False
-                    res["reason"] = f"King ({self.piece}) at position {self.position} cannot castle to end position {end_pos} because the rook at {rook_pos} cannot castle."
-                    return res
-            else:
-                rook_pos = (self.position[0], 7)
-                rook = self.board[rook_pos]
-                if rook != ROOK or not rook.can_castle:
-                    res["capable"] = False
-                    res["reason"] = f"King ({self.piece}) at position {self.position} cannot castle to end position {end_pos} because the rook at {rook_pos} cannot castle."
-                    return res
+                self.context = {"square": middle_pos}
+                return Reason.CASTLE_OBSTRUCTED
+            rook_pos = (self.position[0], 0 if self.position[1] - end_pos[1] == 2 else 7)
+            rook = self.board[rook_pos]
+            if rook != ROOK or not rook.can_castle:
+                self.context = {"square": rook_pos}
+                return Reason.CASTLE_ROOK
+            knight_pos = (self.position[0], 6)
+            if rook_pos[1] == 7 and self.board[knight_pos] != EMPTY:
+                self.context = {"square": knight_pos}
+                return Reason.CASTLE_OBSTRUCTED
+        return VALID
+
+    def validity(self, end_pos: tuple[int, int]) -> Reason:
+        code = super().validity(end_pos)
+        if code is not VALID:
+            return code
 
-        return res
-    
-    def is_valid(self, end_pos: tuple[int, int]) -> dict[str, any]:
-        res = {"info": f"{self.piece}({self.position} -> {end_pos})", "reason": ""}
-        capability = self.is_capable(end_pos)
-        if not capability["capable"]:
-            res["valid"] = False
-            res["reason"] = capability["reason"]
-            return res
-        
-        validity = super().is_valid(end_pos)
-        if not validity["valid"]:
-            res["valid"] = False
-            res["reason"] = validity["reason"]
-            return res
-        
         if abs(self.position[1] - end_pos[1]) == 2:
+            attackers = self.attackers()
+            if attackers:
+                self.context = {"attackers": attackers}
+                return Reason.CASTLE_OUT_OF_CHECK
             for move in [(self.position[0], (self.position[1] + end_pos[1]) // 2), end_pos]:
                 original_piece = self.try_move(move)
-                attacker_pos = self.game_eval.in_check()
-                if attacker_pos:
-                    self.undo_move(original_piece, move)
-                    res["valid"] = False
-                    res["reason"] = f"Move from {self.position} to {end_pos} castles through check by {[f'{self.board[pos]}{pos}' for pos in attacker_pos]}."
-                    return res
+                attackers = self.attackers()
                 self.undo_move(original_piece, move)
-
-        res["valid"] = True
-        return res
+                if attackers:
+                    self.context = {"attackers": attackers}
+                    return Reason.CASTLE_THROUGH_CHECK
+        return VALID
 
 class PawnEvaluator(PieceEvaluator):
     def __init__(self, piece: ChessPiece, position: tuple[int, int], board: Board):
         super().__init__(piece, position, board)
 
-    def is_capable(self, end_pos: tuple[int, int] | tuple[int, int, str]) -> dict[str, any]:
-        if len(end_pos) == 3:
-            end_pos = end_pos[:2]
-        res = super().is_capable(end_pos)
-        if not res["capable"]:
-            return res
-        
+    def capability(self, end_pos: tuple[int, int] | tuple[int, int, str]) -> Reason:
+        end_pos = end_pos[:2]
+        code = super().capability(end_pos)
+        if code is not VALID:
+            return code
+
+        target = self.board[end_pos]
         if self.position[1] == end_pos[1]:
-            if self.board[end_pos] != EMPTY:
-                res["capable"] = False
-                res["reason"] = f"Pawn ({self.piece}) at position {self.position} cannot move to end position {end_pos} because it is occupied by a piece ({self.board[end_pos]})."
-                return res
-            if abs(self.position[0] - end_pos[0]) == 2 and \
-               self.board[((self.position[0] + end_pos[0]) // 2, self.position[1])] != EMPTY:
-                res["capable"] = False
-                res["reason"] = f"Pawn ({self.piece}) at position {self.position} cannot move to end position {end_pos} because the path is obstructed at {((self.position[0] + end_pos[0]) // 2, self.position[1])}."
-                return res
-        
-        if abs(self.position[0] - end_pos[0]) == 1 and abs(self.position[1] - end_pos[1]) == 1:
-            if self.board[end_pos] == EMPTY and (self.board.en_passant_square == "-" or end_pos != board_to_coord(self.board.en_passant_square)):
-                res["capable"] = False
-                res["reason"] = f"Pawn ({self.piece}) at position {self.position} cannot capture at end position {end_pos} because it is empty ({self.board[end_pos]})."
-                return res
-            if self.board[end_pos].color == self.piece.color:
-                res["capable"] = False
-                res["reason"] = f"Pawn ({self.piece}) at position {self.position} cannot move to end position {end_pos} because it is occupied by a piece of the same color ({self.board[end_pos]})."
-                return res
-            
-        res["capable"] = True
-        return res
+            if target != EMPTY:
+                self.context = {"target": target}
+                return Reason.PAWN_BLOCKED
+            middle_pos = ((self.position[0] + end_pos[0]) // 2, self.position[1])
+            if abs(self.position[0] - end_pos[0]) == 2 and self.board[middle_pos] != EMPTY:
+                self.context = {"square": middle_pos}
+                return Reason.PAWN_OBSTRUCTED
 
-    def is_valid(self, end_pos: tuple[int, int] | tuple[int, int, str]) -> dict[str, any]:
-        if len(end_pos) == 3:
-            end_pos, promotion = end_pos[:2], end_pos[2]
-        else:
-            promotion = ""
-        res = {"info": f"{self.piece}({self.position} -> {end_pos})", "reason": ""}
-        capability = self.is_capable(end_pos)
-        if not capability["capable"]:
-            res["valid"] = False
-            res["reason"] = capability["reason"]
-            return res
-        
-        validity = super().is_valid(end_pos)
-        if not validity["valid"]:
-            res["valid"] = False
-            res["reason"] = validity["reason"]
-            return res
-        
         if abs(self.position[0] - end_pos[0]) == 1 and abs(self.position[1] - end_pos[1]) == 1:
-            if self.board[end_pos] == EMPTY and (self.board.en_passant_square == "-" or end_pos != board_to_coord(self.board.en_passant_square)):
-                res["valid"] = False
-                res["reason"] = f"Pawn ({self.piece}) at position {self.position} cannot capture at end position {end_pos} because it is empty ({self.board[end_pos]})."
-                return res
-            original_piece = self.try_move(end_pos)
-            attacker_pos = self.game_eval.in_check()
-            if attacker_pos:
-                self.undo_move(original_piece, end_pos)
-                res["valid"] = False
-                res["reason"] = f"Move from {self.position} to {end_pos} puts the current player in check by {[f'{self.board[pos]}{pos}' for pos in attacker_pos]}."
-                return res
-            self.undo_move(original_piece, end_pos)
-        
+            if target == EMPTY and (self.board.en_passant_square == "-" or end_pos != board_to_coord(self.board.en_passant_square)):
+                self.context = {"target": target}
+                return Reason.PAWN_EMPTY_CAPTURE
+            if target.color == self.piece.color:
+                self.context = {"target": target}
+                return Reason.PAWN_OWN_PIECE
+        return VALID
+
+    def validity(self, end_pos: tuple[int, int] | tuple[int, int, str]) -> Reason:
+        promotion = end_pos[2] if len(end_pos) == 3 else ""
+        code = super().validity(end_pos[:2])
+        if code is not VALID:
+            return code
+
         if end_pos[0] == 7*(1-self.piece.color):
             if promotion == "":
-                res["valid"] = False
-                res["reason"] = f"Move from {self.position} to {end_pos} requires promotion piece. Promotion must be one of 'q', 'r', 'b', 'n'."
-                return res
+                return Reason.PROMOTION_MISSING
             if promotion not in "qrbn":
-                res["valid"] = False
-                res["reason"] = f"Invalid promotion {promotion}. Promotion must be one of 'q', 'r', 'b', 'n'."
-                return res
+                self.context = {"promotion": promotion}
+                return Reason.PROMOTION_INVALID
+        return VALID
 
-        res["valid"] = True
-        return res
+    def result(self, key: str, code: Reason, end_pos: tuple[int, int] | tuple[int, int, str]) -> Validity:
+        # Reasons describe the destination square without the promotion piece.
+        return super().result(key, code, end_pos[:2])
@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import NamedTuple
+
+from board import Board
+from movegen import legal_moves
+from perft import move_to_str
+from server import DEFAULT_PORT, percentiles
+
+Move = tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]
+
+class LoadResult(NamedTuple):
+    requests: int
+    errors: int
+    games_finished: int
+    time: float
+    # Client-side latency of move requests in milliseconds, as server.percentiles returns it.
+    latency: dict[str, float]
+    # The server's own stats response at the end of the run.
+    server: dict
+
+def handler_move(move: Move) -> str:
+    """move in the format Handler.parse_move reads, with promotions written as e7e8=q."""
+    text = move_to_str(move)
+    return text[:4] + "=" + text[4] if len(text) == 5 else text
+
+class Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, **request) -> dict:
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+async def _player(connection: Connection, games: int, moves: int, active: int, rng: random.Random,
+                  samples: list[float], counts: dict[str, int]) -> None:
+    """Opens games on connection, then plays random legal moves in active of them at a time.
+
+    The rest stay open and idle for the whole run. Each game is mirrored on a local Board to pick
+    its moves, and a finished game is closed and replaced by a new one.
+    """
+    boards: dict[int, Board] = {}
+    for _ in range(games):
+        response = await connection.request(op="new")
+        counts["requests"] += 1
+        if not response["ok"]:
+            counts["errors"] += 1
+            continue
+        boards[response["game"]] = Board(backend="compact")
+    playing = list(boards)[:active]
+    for _ in range(moves):
+        for i, game in enumerate(playing):
+            board = boards[game]
+            move = rng.choice(legal_moves(board))
+            start = time.perf_counter()
+            response = await connection.request(op="move", game=game, move=handler_move(move))
+            samples.append(time.perf_counter() - start)
+            counts["requests"] += 1
+            if not response["ok"]:
+                counts["errors"] += 1
+                continue
+            board.move(*move)
+            if response["game_over"]:
+                counts["finished"] += 1
+                await connection.request(op="close", game=game)
+                response = await connection.request(op="new")
+                counts["requests"] += 2
+                del boards[game]
+                boards[response["game"]] = Board(backend="compact")
+                playing[i] = response["game"]
+
+async def run_load(host: str = "127.0.0.1", port: int = DEFAULT_PORT, connections: int = 10, games: int = 1000,
+                   moves: int = 20, active: int = 1, seed: int = None) -> LoadResult:
+    """Spreads games over connections and plays moves rounds of one move in active games per connection."""
+    rng = random.Random(seed)
+    samples: list[float] = []
+    counts = {"requests": 0, "errors": 0, "finished": 0}
+    clients = [Connection(*await asyncio.open_connection(host, port)) for _ in range(connections)]
+    start = time.perf_counter()
+    try:
+        per_connection = [games // connections + (i < games % connections) for i in range(connections)]
+        await asyncio.gather(*(_player(client, count, moves, active, random.Random(rng.random()), samples, counts)
+                               for client, count in zip(clients, per_connection)))
+        elapsed = time.perf_counter() - start
+        stats = await clients[0].request(op="stats")
+    finally:
+        for client in clients:
+            await client.close()
+    return LoadResult(counts["requests"], counts["errors"], counts["finished"], elapsed,
+                      percentiles(samples) if samples else {}, stats)
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark a running game server with many concurrent games.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Server address.")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help="Server port.")
+    parser.add_argument("-c", "--connections", type=int, default=10, help="Client connections.")
+    parser.add_argument("-g", "--games", type=int, default=1000, help="Games opened, spread over the connections.")
+    parser.add_argument("-m", "--moves", type=int, default=20, help="Moves played per active game.")
+    parser.add_argument("-a", "--active", type=int, default=1, help="Games per connection that play; the rest stay idle.")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Random seed for the moves.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = asyncio.run(run_load(args.host, args.port, args.connections, args.games, args.moves, args.active, args.seed))
+    print(f"{result.requests} requests ({result.errors} errors, {result.games_finished} games finished) in {result.time:.3f}s "
+          f"({result.requests / result.time if result.time else 0:.0f} requests/s)")
+    print(f"Client move latency (ms): {result.latency}")
+    print(f"Server: {result.server['games']} games open")
+    for operation, stats in result.server["latency"].items():
+        print(f"  {operation}: {stats}")
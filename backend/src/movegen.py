@@ -0,0 +1,159 @@
+from bitboard import Bitboards, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BETWEEN, POSITIONS, \
+                     rook_attacks, bishop_attacks, lsb, squares
+from board import Board, CASTLING_RIGHTS
+from piece_info import PIECE_INDEX, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, board_to_coord
+from pieces import PROMOTIONS
+
+_PAWN, _KNIGHT, _BISHOP, _ROOK, _QUEEN, _KING = (PIECE_INDEX[piece_type] for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING))
+ALL_SQUARES = (1 << 64) - 1
+# Pawn push offset, double push rank and promotion rank per color.
+PAWN_STEP = (8, -8)
+PAWN_START_RANK = (1, 6)
+PROMOTION_RANK = (7, 0)
+PROMOTION_TARGETS: list[list[tuple[int, int, str]]] = [[POSITIONS[sq] + (p,) for p in PROMOTIONS] for sq in range(64)]
+
+Move = tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]
+
+def checkers(bitboards: Bitboards, king_sq: int, them: int) -> int:
+    return bitboards.attackers_to(king_sq, them)
+
+def pins(bitboards: Bitboards, king_sq: int, us: int) -> dict[int, int]:
+    """Maps each of our pinned pieces' squares to the line it may still move along (up to and including the pinner)."""
+    them = 1 - us
+    theirs = bitboards.pieces[them]
+    occupied = bitboards.occupancy
+    # Enemy sliders that would see the king if only enemy pieces blocked.
+    snipers = (rook_attacks(king_sq, bitboards.occupied[them]) & (theirs[_ROOK] | theirs[_QUEEN])) | \
+              (bishop_attacks(king_sq, bitboards.occupied[them]) & (theirs[_BISHOP] | theirs[_QUEEN]))
+    res = {}
+    for sniper in squares(snipers):
+        between = BETWEEN[king_sq][sniper] & occupied
+        if between and not between & (between - 1) and between & bitboards.occupied[us]:
+            res[lsb(between)] = BETWEEN[king_sq][sniper] | (1 << sniper)
+    return res
+
+def _en_passant_is_legal(bitboards: Bitboards, king_sq: int, start: int, target: int, victim: int, us: int) -> bool:
+    # Replays the capture on the occupancy, which covers discovered checks along the rank as well as check evasions.
+    if king_sq < 0:
+        return True
+    theirs = bitboards.pieces[1 - us]
+    occupied = (bitboards.occupancy ^ (1 << start) ^ (1 << victim)) | (1 << target)
+    return not ((rook_attacks(king_sq, occupied) & (theirs[_ROOK] | theirs[_QUEEN])) or
+                (bishop_attacks(king_sq, occupied) & (theirs[_BISHOP] | theirs[_QUEEN])) or
+                (KNIGHT_ATTACKS[king_sq] & theirs[_KNIGHT]) or
+                (PAWN_ATTACKS[us][king_sq] & theirs[_PAWN] & ~(1 << victim)))
+
+def _add(moves: list[Move], start: int, target: int, promotion_rank: int) -> None:
+    if target >> 3 == promotion_rank:
+        moves.extend((POSITIONS[start], end_pos) for end_pos in PROMOTION_TARGETS[target])
+    else:
+        moves.append((POSITIONS[start], POSITIONS[target]))
+
+def legal_moves(board: Board, captures_only: bool = False) -> list[Move]:
+    """All legal moves for the side to move, in the ((start), (end)) format accepted by Board.move.
+
+    Checkers and pins are computed once from the king's square, so no move has to be made and
+    tested for check. With captures_only, only captures (en passant included) and promotions are returned.
+    """
+    bitboards = board.bitboards()
+    us = int(board.current_player)
+    them = 1 - us
+    ours, theirs = bitboards.pieces[us], bitboards.pieces[them]
+    own, enemy = bitboards.occupied[us], bitboards.occupied[them]
+    occupied = own | enemy
+    moves = []
+
+    king_sq = lsb(ours[_KING]) if ours[_KING] else -1
+    if king_sq >= 0:
+        checking = checkers(bitboards, king_sq, them)
+        pinned = pins(bitboards, king_sq, us)
+    else:
+        checking, pinned = 0, {}
+
+    if king_sq >= 0:
+        king_targets = KING_ATTACKS[king_sq] & ~own
+        if captures_only:
+            king_targets &= enemy
+        without_king = occupied ^ (1 << king_sq)
+        for target in squares(king_targets):
+            if not bitboards.attackers_to(target, them, without_king):
+                moves.append((POSITIONS[king_sq], POSITIONS[target]))
+
+    # In double check only the king can move.
+    if checking and checking & (checking - 1):
+        return moves
+    # Squares a non-king move has to land on: capture the checker or block its line.
+    check_mask = (checking | BETWEEN[king_sq][lsb(checking)]) if checking else ALL_SQUARES
+    targets = ~own & check_mask
+    if captures_only:
+        targets &= enemy
+
+    step, start_rank, promotion_rank = PAWN_STEP[us], PAWN_START_RANK[us], PROMOTION_RANK[us]
+    ep_sq, victim = -1, -1
+    if board.en_passant_square != "-":
+        rank, col = board_to_coord(board.en_passant_square)
+        ep_sq = rank * 8 + col
+        victim = ep_sq - step
+        if not theirs[_PAWN] & (1 << victim):
+            ep_sq = -1
+    for start in squares(ours[_PAWN]):
+        allowed = pinned.get(start, ALL_SQUARES) & check_mask
+        push = start + step
+        if 0 <= push < 64 and not occupied & (1 << push):
+            if (1 << push) & allowed and (not captures_only or push >> 3 == promotion_rank):
+                _add(moves, start, push, promotion_rank)
+            double = push + step
+            if not captures_only and start >> 3 == start_rank and not occupied & (1 << double) and (1 << double) & allowed:
+                moves.append((POSITIONS[start], POSITIONS[double]))
+        for target in squares(PAWN_ATTACKS[us][start] & enemy & allowed):
+            _add(moves, start, target, promotion_rank)
+        if ep_sq >= 0 and PAWN_ATTACKS[us][start] & (1 << ep_sq) and \
+           _en_passant_is_legal(bitboards, king_sq, start, ep_sq, victim, us):
+            moves.append((POSITIONS[start], POSITIONS[ep_sq]))
+
+    for start in squares(ours[_KNIGHT]):
+        # A pinned knight can never stay on the pin line.
+        if start in pinned:
+            continue
+        for target in squares(KNIGHT_ATTACKS[start] & targets):
+            moves.append((POSITIONS[start], POSITIONS[target]))
+
+    for index, attacks in ((_BISHOP, bishop_attacks), (_ROOK, rook_attacks), (_QUEEN, None)):
+        for start in squares(ours[index]):
+            if attacks:
+                reach = attacks(start, occupied)
+            else:
+                reach = rook_attacks(start, occupied) | bishop_attacks(start, occupied)
+            for target in squares(reach & targets & pinned.get(start, ALL_SQUARES)):
+                moves.append((POSITIONS[start], POSITIONS[target]))
+
+    if not checking and not captures_only and king_sq >= 0:
+        moves.extend(_castling_moves(bitboards, king_sq, us))
+    return moves
+
+def _castling_moves(bitboards: Bitboards, king_sq: int, us: int) -> list[Move]:
+    res = []
+    ours = bitboards.pieces[us]
+    occupied = bitboards.occupancy
+    for _, _, color, king_pos, rook_pos in CASTLING_RIGHTS:
+        if color != us or king_sq != king_pos[0] * 8 + king_pos[1]:
+            continue
+        rook_sq = rook_pos[0] * 8 + rook_pos[1]
+        if not (bitboards.castling & (1 << king_sq) and bitboards.castling & (1 << rook_sq) and ours[_ROOK] & (1 << rook_sq)):
+            continue
+        if BETWEEN[king_sq][rook_sq] & occupied:
+            continue
+        step = 1 if rook_sq > king_sq else -1
+        if bitboards.attackers_to(king_sq + step, 1 - us) or bitboards.attackers_to(king_sq + 2 * step, 1 - us):
+            continue
+        res.append((POSITIONS[king_sq], POSITIONS[king_sq + 2 * step]))
+    return res
+
+def in_check(board: Board) -> list[tuple[int, int]]:
+    """Positions of the pieces giving check to the side to move."""
+    bitboards = board.bitboards()
+    us = int(board.current_player)
+    king = bitboards.pieces[us][_KING]
+    if not king:
+        return []
+    return [POSITIONS[sq] for sq in squares(checkers(bitboards, lsb(king), 1 - us))]
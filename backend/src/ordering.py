@@ -0,0 +1,108 @@
+import random
+
+from bitboard import Bitboards, squares
+from board import Board
+from piece_info import PIECE_INDEX, PIECE_VALUES, PAWN, KNIGHT, BISHOP, ROOK, QUEEN
+from pieces import PROMOTIONS
+
+Move = tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]
+
+# Score bands, highest first: the caller's best move, promotions, captures, killers, then quiet moves by history.
+BEST_MOVE_SCORE = 1 << 30
+PROMOTION_SCORE = 1 << 28
+CAPTURE_SCORE = 1 << 27
+KILLER_SCORES = (1 << 26, (1 << 26) - 1)
+# History scores are halved once any reaches this, so they never reach the killer band.
+HISTORY_LIMIT = 1 << 20
+# Upper bound of the random history a seeded orderer starts with, below the depth-squared bonus of one cutoff at depth 4.
+HISTORY_NOISE = 16
+KILLERS_PER_PLY = 2
+_PAWN = PIECE_INDEX[PAWN]
+# Promotion pieces by value, so a queen promotion is tried before an underpromotion.
+PROMOTION_VALUES = {p: PIECE_VALUES[PIECE_INDEX[piece_type]] for p, piece_type in zip(PROMOTIONS, (QUEEN, ROOK, BISHOP, KNIGHT))}
+
+def piece_indices(bitboards: Bitboards) -> list[int]:
+    """PIECE_INDEX of the piece on each square (either color), 0 for empty squares."""
+    res = [0] * 64
+    for masks in bitboards.pieces:
+        for index in range(1, len(masks)):
+            for sq in squares(masks[index]):
+                res[sq] = index
+    return res
+
+class MoveOrderer:
+    """Ranks generated moves for alpha-beta: best move, promotions, MVV-LVA captures, killers, history.
+
+    Killers (quiet moves that caused a cutoff, per ply) and the butterfly history table (from square by
+    to square) are learned through add_cutoff and persist across searches until clear is called.
+    With a seed the history starts out as small random values, so otherwise equal quiet moves are
+    tried in a different order than by an unseeded orderer.
+    """
+    def __init__(self, max_ply: int = 128, seed: int = None) -> None:
+        self.max_ply = max_ply
+        self.seed = seed
+        self.clear()
+
+    def clear(self) -> None:
+        self.killers: list[list[Move]] = [[None] * KILLERS_PER_PLY for _ in range(self.max_ply + 1)]
+        if self.seed is None:
+            self.history: list[list[int]] = [[0] * 64 for _ in range(64)]
+        else:
+            rng = random.Random(self.seed)
+            self.history = [[rng.randrange(HISTORY_NOISE) for _ in range(64)] for _ in range(64)]
+
+    @staticmethod
+    def is_capture(bitboards: Bitboards, move: Move, us: int) -> bool:
+        start_pos, end_pos = move
+        if bitboards.occupied[1 - us] & (1 << (end_pos[0] * 8 + end_pos[1])):
+            return True
+        # A pawn changing file onto an empty square is an en passant capture.
+        return start_pos[1] != end_pos[1] and bool(bitboards.pieces[us][_PAWN] & (1 << (start_pos[0] * 8 + start_pos[1])))
+
+    def score(self, indices: list[int], enemy: int, move: Move, ply: int = 0) -> int:
+        """Ordering score of a move given piece_indices of the board and the opponent's occupancy mask."""
+        start_pos, end_pos = move
+        start, end = start_pos[0] * 8 + start_pos[1], end_pos[0] * 8 + end_pos[1]
+        attacker = indices[start]
+        if enemy & (1 << end):
+            capture = 10 * PIECE_VALUES[indices[end]] - PIECE_VALUES[attacker]
+        elif attacker == _PAWN and start_pos[1] != end_pos[1]:
+            capture = 9 * PIECE_VALUES[_PAWN]
+        else:
+            capture = None
+        # The promotion piece outweighs any capture made while promoting.
+        if len(end_pos) == 3:
+            return PROMOTION_SCORE + 100 * PROMOTION_VALUES[end_pos[2]] + (capture or 0)
+        if capture is not None:
+            return CAPTURE_SCORE + capture
+        killers = self.killers[ply] if ply <= self.max_ply else ()
+        for killer, killer_score in zip(killers, KILLER_SCORES):
+            if move == killer:
+                return killer_score
+        return self.history[start][end]
+
+    def order(self, board: Board, moves: list[Move], ply: int = 0, best_move: Move = None) -> list[Move]:
+        """moves sorted best first; best_move (e.g. a hash or PV move) goes ahead of everything if present."""
+        bitboards = board.bitboards()
+        indices = piece_indices(bitboards)
+        enemy = bitboards.occupied[1 - int(board.current_player)]
+        scores = {move: BEST_MOVE_SCORE if move == best_move else self.score(indices, enemy, move, ply) for move in moves}
+        return sorted(moves, key=scores.__getitem__, reverse=True)
+
+    def add_cutoff(self, board: Board, move: Move, ply: int, depth: int) -> None:
+        """Records a move that failed high. Only quiet moves become killers or gain history."""
+        us = int(board.current_player)
+        if len(move[1]) == 3 or self.is_capture(board.bitboards(), move, us):
+            return
+        if ply <= self.max_ply:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1:] = killers[:-1]
+                killers[0] = move
+        start_pos, end_pos = move
+        history = self.history[start_pos[0] * 8 + start_pos[1]]
+        history[end_pos[0] * 8 + end_pos[1]] += depth * depth
+        if history[end_pos[0] * 8 + end_pos[1]] >= HISTORY_LIMIT:
+            for row in self.history:
+                for i in range(64):
+                    row[i] //= 2
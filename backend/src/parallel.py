@@ -0,0 +1,111 @@
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+from board import Board
+from search import Search, SearchResult, Move
+from tablebase import Tablebases
+from transposition import TranspositionTable, DEFAULT_SIZE_MB, table_bytes
+
+class ParallelResult(NamedTuple):
+    move: Move
+    score: int
+    pv: list[Move]
+    depth: int
+    nodes: int
+    time: float
+    # Nodes searched and deepest completed iteration of each worker, in worker order.
+    worker_nodes: list[int]
+    worker_depths: list[int]
+
+# Per-process state of a pool worker, set up once by _init_worker.
+_memory: shared_memory.SharedMemory = None
+_table: TranspositionTable = None
+_stop = None
+_tablebases: Tablebases = None
+
+def _init_worker(name: str, size_mb: float, stop, tablebases: str = None) -> None:
+    global _memory, _table, _stop, _tablebases
+    _memory = shared_memory.SharedMemory(name=name)
+    _table = TranspositionTable(size_mb, _memory.buf)
+    _stop = stop
+    # Tables are mapped on first probe, so this costs nothing for searches that never reach them.
+    _tablebases = Tablebases(tablebases) if tablebases else None
+
+def _search_worker(board: Board, index: int, age: int, max_depth: int, node_limit: int,
+                   time_limit: float) -> SearchResult:
+    # Search.search advances the age, so every worker ends up on the same age however many tasks it ran.
+    _table.age = (age - 1) & 0xFF
+    # Worker 0 is a plain search; helpers start one ply deeper every other worker and order quiet moves differently.
+    engine = Search(board, max_depth, node_limit, time_limit, _table, start_depth=1 + index % 2,
+                    seed=index or None, stop=_stop, tablebases=_tablebases)
+    try:
+        return engine.search()
+    finally:
+        # The first worker to finish stops the rest; their deepest completed iterations are kept.
+        _stop.set()
+
+class ParallelSearch:
+    """Lazy SMP: every worker process searches the same root, sharing one transposition table.
+
+    The table lives in multiprocessing.shared_memory, so entries stored by one worker cut off or
+    reorder the search in the others. Workers differ only in their starting depth and quiet move
+    order, and the result is the deepest iteration any of them completed (the lowest worker on a tie).
+    The pool and table are kept across searches; call close, or use the object as a context manager.
+    tablebases is a directory of endgame tablebases for the workers to probe.
+    """
+    def __init__(self, workers: int = None, size_mb: float = DEFAULT_SIZE_MB, tablebases: str = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.size_mb = size_mb
+        self.memory = shared_memory.SharedMemory(create=True, size=table_bytes(size_mb))
+        try:
+            self.table = TranspositionTable(size_mb, self.memory.buf)
+            self.table.clear()
+            self.age = 0
+            context = multiprocessing.get_context()
+            self.stop = context.Event()
+            self.pool = context.Pool(self.workers, _init_worker, (self.memory.name, size_mb, self.stop, tablebases))
+        except BaseException:
+            # close() is never reached without a pool, so release the block here or it outlives the process.
+            self.table = None
+            self.memory.close()
+            self.memory.unlink()
+            raise
+
+    def __enter__(self) -> "ParallelSearch":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.pool is None:
+            return
+        self.pool.terminate()
+        self.pool.join()
+        self.pool = None
+        # Drop the parent's views of the buffer before releasing it.
+        self.table = None
+        self.memory.close()
+        self.memory.unlink()
+
+    def search(self, board: Board, max_depth: int = 64, node_limit: int = None,
+               time_limit: float = None) -> ParallelResult:
+        """node_limit and time_limit apply to each worker separately."""
+        start = time.perf_counter()
+        self.age = (self.age + 1) & 0xFF
+        self.stop.clear()
+        tasks = [self.pool.apply_async(_search_worker, (board, i, self.age, max_depth, node_limit, time_limit))
+                 for i in range(self.workers)]
+        results = [task.get() for task in tasks]
+        best = max(results, key=lambda result: result.depth)
+        nodes = [result.nodes for result in results]
+        return ParallelResult(best.move, best.score, best.pv, best.depth, sum(nodes), time.perf_counter() - start,
+                              nodes, [result.depth for result in results])
+
+def parallel_search(board: Board, workers: int = None, max_depth: int = 64, node_limit: int = None,
+                    time_limit: float = None, size_mb: float = DEFAULT_SIZE_MB, tablebases: str = None) -> ParallelResult:
+    with ParallelSearch(workers, size_mb, tablebases) as engine:
+        return engine.search(board, max_depth, node_limit, time_limit)
@@ -0,0 +1,114 @@
+import argparse
+import sys
+import time
+
+from board import Board
+from evaluator import GameEvaluator
+from piece_info import coord_to_board
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Published perft results (chessprogramming.org "Perft Results" and the TalkChess edge-case suite).
+PERFT_SUITE: list[tuple[str, str, dict[int, int]]] = [
+    ("start", START_FEN,
+     {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609, 6: 119060324}),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     {1: 48, 2: 2039, 3: 97862, 4: 4085603, 5: 193690690}),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624, 6: 11030083}),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     {1: 6, 2: 264, 3: 9467, 4: 422333, 5: 15833292}),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     {1: 44, 2: 1486, 3: 62379, 4: 2103487, 5: 89941194}),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     {1: 46, 2: 2079, 3: 89890, 4: 3894594, 5: 164075551}),
+    ("en_passant_pin", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1",
+     {1: 18, 2: 92, 3: 1670, 4: 10138, 6: 1134888}),
+    ("en_passant_check", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1",
+     {1: 15, 2: 126, 3: 1928, 4: 13931, 6: 1440467}),
+    ("castle_gives_check", "5k2/8/8/8/8/8/8/4K2R w K - 0 1",
+     {1: 15, 2: 66, 3: 1198, 4: 6399, 5: 120330, 6: 661072}),
+    ("promote_out_of_check", "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1",
+     {1: 11, 2: 133, 3: 1442, 4: 19174, 6: 3821001}),
+    ("underpromote_check", "8/P1k5/K7/8/8/8/8/8 w - - 0 1",
+     {1: 6, 2: 27, 3: 273, 4: 1329, 5: 18135, 6: 92683}),
+    ("self_stalemate", "K1k5/8/P7/8/8/8/8/8 w - - 0 1",
+     {1: 2, 2: 6, 3: 13, 4: 63, 5: 382, 6: 2217}),
+]
+
+def move_to_str(move: tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]) -> str:
+    start_pos, end_pos = move
+    promotion = end_pos[2] if len(end_pos) == 3 else ""
+    return (coord_to_board(start_pos) + coord_to_board(end_pos[:2])).lower() + promotion
+
+def perft(board: Board, depth: int) -> int:
+    if depth <= 0:
+        return 1
+    moves = GameEvaluator(board).all_valid_moves()
+    # Bulk count the last ply instead of making every leaf move.
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+def divide(board: Board, depth: int) -> dict[str, int]:
+    res = {}
+    for move in GameEvaluator(board).all_valid_moves():
+        board.push(move)
+        res[move_to_str(move)] = perft(board, depth - 1)
+        board.pop()
+    return res
+
+def run_divide(fen: str, depth: int, backend: str) -> int:
+    board = Board(fen, backend)
+    start = time.perf_counter()
+    counts = divide(board, depth)
+    elapsed = time.perf_counter() - start
+    for move, nodes in counts.items():
+        print(f"{move}: {nodes}")
+    total = sum(counts.values())
+    print(f"\nMoves: {len(counts)}")
+    print(f"Nodes: {total}")
+    print(f"Time: {elapsed:.3f}s ({total / elapsed if elapsed else 0:.0f} nodes/s)")
+    return total
+
+def run_suite(max_depth: int, backend: str) -> bool:
+    passed = True
+    total_nodes, total_time = 0, 0.0
+    for name, fen, expected in PERFT_SUITE:
+        for depth, expected_nodes in expected.items():
+            if depth > max_depth:
+                continue
+            board = Board(fen, backend)
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+            status = "OK" if nodes == expected_nodes else "FAIL"
+            passed = passed and nodes == expected_nodes
+            print(f"{status:4} {name} depth {depth}: {nodes} (expected {expected_nodes}) "
+                  f"in {elapsed:.3f}s ({nodes / elapsed if elapsed else 0:.0f} nodes/s)")
+    print(f"\nTotal: {total_nodes} nodes in {total_time:.3f}s ({total_nodes / total_time if total_time else 0:.0f} nodes/s)")
+    return passed
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Count leaf nodes of the move generation tree.")
+    parser.add_argument("-f", "--fen", type=str, default=START_FEN, help="FEN string to search from.")
+    parser.add_argument("-d", "--depth", type=int, default=3, help="Depth in plies (maximum depth with --suite).")
+    parser.add_argument("-s", "--suite", action="store_true", help="Run the standard perft positions instead of a single FEN.")
+    parser.add_argument("-b", "--backend", type=str, default="array", help="Board storage backend.")
+    args = parser.parse_args(argv)
+    if args.depth < 1:
+        parser.error("depth must be at least 1")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.suite:
+        sys.exit(0 if run_suite(args.depth, args.backend) else 1)
+    run_divide(args.fen, args.depth, args.backend)
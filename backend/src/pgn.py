@@ -0,0 +1,195 @@
+import argparse
+import bz2
+import gzip
+import re
+import time
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple, TextIO
+
+from board import Board
+from movegen import legal_moves
+from perft import START_FEN
+from piece_info import PieceType, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+
+Move = tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+SAN_PIECES: dict[str, PieceType] = {"N": KNIGHT, "B": BISHOP, "R": ROOK, "Q": QUEEN, "K": KING}
+# Piece letter, from file, from rank, capture, target square, promotion.
+SAN_PATTERN = re.compile(r"([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQnbrq]))?")
+# Comments, variation brackets, NAGs and everything else (move numbers, moves, results).
+TOKEN_PATTERN = re.compile(r"\{[^}]*\}?|;.*|[()]|\$\d+|[^\s(){};]+")
+TAG_PATTERN = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+MOVE_NUMBER_PATTERN = re.compile(r"\d+\.+")
+
+class Game(NamedTuple):
+    tags: dict[str, str]
+    # SAN moves of the main line, without move numbers, annotations or variations.
+    moves: list[str]
+    result: str
+
+    @property
+    def fen(self) -> str:
+        return self.tags.get("FEN", START_FEN)
+
+class GameSummary(NamedTuple):
+    tags: dict[str, str]
+    plies: int
+    result: str
+    fen: str
+    # First illegal or unreadable move, None if the whole game replayed.
+    error: str | None
+
+def open_pgn(path: str) -> TextIO:
+    """Opens a PGN file for streaming, decompressing gzip or bz2 files by their magic bytes."""
+    with open(path, "rb") as f:
+        magic = f.read(3)
+    if magic[:2] == b"\x1f\x8b":
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if magic == b"BZh":
+        return bz2.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+def read_games(lines: Iterable[str]) -> Iterator[Game]:
+    """Yields games from PGN text one at a time, holding only the current game in memory."""
+    tags: dict[str, str] = {}
+    moves: list[str] = []
+    result = "*"
+    in_movetext = False
+    in_comment = False
+    depth = 0
+    for line in lines:
+        if in_comment:
+            end = line.find("}")
+            if end < 0:
+                continue
+            line = line[end + 1:]
+            in_comment = False
+        if line.startswith("["):
+            # A tag pair after movetext starts the next game.
+            if in_movetext:
+                yield Game(tags, moves, result)
+                tags, moves, result, in_movetext, depth = {}, [], "*", False, 0
+            match = TAG_PATTERN.match(line)
+            if match:
+                tags[match.group(1)] = match.group(2).replace('\\"', '"').replace("\\\\", "\\")
+            continue
+        if line.startswith("%"):
+            continue
+        for token in TOKEN_PATTERN.findall(line):
+            if token[0] == "{":
+                in_comment = token[-1] != "}"
+            elif token[0] == ";" or token[0] == "$":
+                continue
+            elif token == "(":
+                depth += 1
+            elif token == ")":
+                depth = max(depth - 1, 0)
+            elif depth:
+                continue
+            elif token in RESULTS:
+                result = token
+                in_movetext = True
+            else:
+                # Move numbers may be glued to the move, as in "1.e4".
+                token = MOVE_NUMBER_PATTERN.sub("", token, count=1)
+                if token:
+                    moves.append(token)
+                in_movetext = True
+    if in_movetext or tags:
+        yield Game(tags, moves, result)
+
+def parse_san(board: Board, san: str, moves: list[Move] = None) -> Move:
+    """The legal move of board written as san. Raises ValueError if it is illegal, ambiguous or malformed."""
+    if moves is None:
+        moves = legal_moves(board)
+    text = san.rstrip("+#!?")
+    if text in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        king_pos = board.find_piece(KING, board.current_player)
+        target = (king_pos[0], king_pos[1] - 2 if len(text) == 3 else king_pos[1] + 2) if king_pos else None
+        for move in moves:
+            if move[0] == king_pos and move[1] == target:
+                return move
+        raise ValueError(f"Illegal move {san}.")
+    match = SAN_PATTERN.fullmatch(text)
+    if not match:
+        raise ValueError(f"Invalid move {san}.")
+    letter, from_file, from_rank, target, promotion = match.groups()
+    piece_type = SAN_PIECES[letter] if letter else PAWN
+    end = (int(target[1]) - 1, 7 - (ord(target[0]) - ord("a")))
+    promotion = promotion.lower() if promotion else None
+    candidates = []
+    for move in moves:
+        start_pos, end_pos = move
+        if end_pos[:2] != end or (end_pos[2] if len(end_pos) == 3 else None) != promotion:
+            continue
+        if from_file and start_pos[1] != 7 - (ord(from_file) - ord("a")):
+            continue
+        if from_rank and start_pos[0] != int(from_rank) - 1:
+            continue
+        if board[start_pos].type != piece_type:
+            continue
+        candidates.append(move)
+    if len(candidates) != 1:
+        raise ValueError(f"{'Ambiguous' if candidates else 'Illegal'} move {san}.")
+    return candidates[0]
+
+def start_board(game: Game, backend: str = "array") -> Board:
+    """Board at the start of game. Raises ValueError for a FEN tag that cannot be loaded."""
+    board = Board(backend=backend)
+    try:
+        board.load_fen(game.fen)
+    except (ValueError, KeyError, IndexError) as e:
+        raise ValueError(f"Invalid FEN {game.fen}: {e}") from e
+    return board
+
+def replay(game: Game, backend: str = "array") -> Iterator[tuple[str, Move, Board]]:
+    """Plays game through Board.move, yielding each SAN move, the move and the board after it.
+
+    The same Board is yielded every time; copy what is needed before advancing. Raises ValueError for
+    a bad FEN tag and at the first move that is not legal.
+    """
+    board = start_board(game, backend)
+    for san in game.moves:
+        move = parse_san(board, san)
+        board.move(*move)
+        yield san, move, board
+
+def summarize(game: Game, backend: str = "array") -> GameSummary:
+    plies = 0
+    board = None
+    error = None
+    try:
+        for _, _, board in replay(game, backend):
+            plies += 1
+    except ValueError as e:
+        error = f"Ply {plies + 1}: {e}"
+    fen = board.to_fen() if board is not None else game.fen
+    return GameSummary(game.tags, plies, game.result, fen, error)
+
+def summaries(path: str, backend: str = "array") -> Iterator[GameSummary]:
+    with open_pgn(path) as f:
+        for game in read_games(f):
+            yield summarize(game, backend)
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay every game of a PGN file (optionally gzip or bz2 compressed).")
+    parser.add_argument("file", type=str, help="PGN file.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Prints a summary line per game.")
+    parser.add_argument("-b", "--backend", type=str, default="array", help="Board storage backend.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    games = plies = errors = 0
+    for summary in summaries(args.file, args.backend):
+        games += 1
+        plies += summary.plies
+        errors += summary.error is not None
+        if args.verbose:
+            players = f"{summary.tags.get('White', '?')} - {summary.tags.get('Black', '?')}"
+            print(f"{games}: {players} {summary.result}, {summary.plies} plies{', ' + summary.error if summary.error else ''}")
+    elapsed = time.perf_counter() - start
+    print(f"{games} games, {plies} plies, {errors} with errors in {elapsed:.3f}s "
+          f"({games / elapsed if elapsed else 0:.1f} games/s, {plies / elapsed if elapsed else 0:.0f} plies/s)")
@@ -26,7 +26,8 @@ class Color(Enum):
     def __eq__(self, other) -> bool:
         match other:
             case Color():
-                return self.name == other.name
+                # Members are singletons, so identity is enough.
+                return self is other
             case int():
                 return self.value == other
             case bad:
@@ -35,7 +36,7 @@ class Color(Enum):
     def __ne__(self, other) -> bool:
         match other:
             case Color():
-                return self.name != other.name
+                return self is not other
             case int():
                 return self.value != other
             case bad:
@@ -62,6 +63,39 @@ class Color(Enum):
 NONE, BLACK, WHITE = Color.NONE, Color.BLACK, Color.WHITE
 EMPTY, PAWN, ROOK, BISHOP, QUEEN, KING, KNIGHT = PieceType.EMPTY, PieceType.PAWN, PieceType.ROOK, PieceType.BISHOP, PieceType.QUEEN, PieceType.KING, PieceType.KNIGHT
 
+# Stable integer index per piece type, used by the bitboard backend to pick a piece mask.
+PIECE_TYPES: tuple[PieceType, ...] = (EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING)
+PIECE_INDEX: dict[PieceType, int] = {piece_type: i for i, piece_type in enumerate(PIECE_TYPES)}
+# Centipawn values in PIECE_TYPES order; the king is never traded, so it is worth nothing.
+PIECE_VALUES: tuple[int, ...] = (0, 100, 320, 330, 500, 900, 0)
+
+# Compact piece codes: type index in the low bits, a color bit and a castling bit, 0 for an empty square.
+# These are plain ints, so comparisons skip ChessPiece.__eq__ and Color.__eq__ entirely.
+TYPE_MASK = 0x07
+BLACK_BIT = 0x08
+CASTLE_BIT = 0x10
+EMPTY_CODE = 0
+
+def encode_piece(color: int, type_index: int, can_castle: bool = False) -> int:
+    if not type_index:
+        return EMPTY_CODE
+    return type_index | (BLACK_BIT if color else 0) | (CASTLE_BIT if can_castle else 0)
+
+def code_type(code: int) -> int:
+    return code & TYPE_MASK
+
+def code_color(code: int) -> int:
+    # -1 for an empty square, matching Color.NONE.
+    if not code:
+        return -1
+    return (code & BLACK_BIT) >> 3
+
+def code_can_castle(code: int) -> bool:
+    return bool(code & CASTLE_BIT)
+
+def code_is(code: int, type_index: int, color: int) -> bool:
+    return code & (TYPE_MASK | BLACK_BIT) == type_index | (BLACK_BIT if color else 0)
+
 PIECE_STR: dict[PieceType, tuple[str, str]] = {
     EMPTY: (" ", " "),
     PAWN: ("♟", "♙"),
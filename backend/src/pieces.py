@@ -1,9 +1,83 @@
-from itertools import product
+from piece_info import Color, PieceType, PIECE_STR, PIECE_INDEX, PIECE_TYPES, CASTLE_BIT, TYPE_MASK, EMPTY, ROOK, BISHOP, \
+                       QUEEN, KNIGHT, PAWN, KING, NONE, WHITE, BLACK, encode_piece, code_color
 
-from piece_info import Color, PieceType, PIECE_STR, EMPTY, ROOK, BISHOP, \
-                       QUEEN, KNIGHT, PAWN, KING, NONE, WHITE, BLACK
+# Move tables, computed once at import so piece methods are lookups instead of per-call list building.
+SQUARES: list[tuple[int, int]] = [(rank, col) for rank in range(8) for col in range(8)]
+
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+KNIGHT_DELTAS = ((-1, -2), (-2, -1), (-1, 2), (-2, 1), (1, -2), (2, -1), (1, 2), (2, 1))
+KING_DELTAS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+PROMOTIONS = ["q", "r", "b", "n"]
+
+def _on_board(rank: int, col: int) -> bool:
+    return 0 <= rank <= 7 and 0 <= col <= 7
+
+def _steps(position: tuple[int, int], deltas: tuple[tuple[int, int], ...]) -> list[tuple[int, int]]:
+    return [(position[0] + i, position[1] + j) for (i, j) in deltas if _on_board(position[0] + i, position[1] + j)]
+
+def _ray(position: tuple[int, int], direction: tuple[int, int]) -> list[tuple[int, int]]:
+    res = []
+    rank, col = position[0] + direction[0], position[1] + direction[1]
+    while _on_board(rank, col):
+        res.append((rank, col))
+        rank, col = rank + direction[0], col + direction[1]
+    return res
+
+def _pawn_captures(position: tuple[int, int], color: int) -> list[tuple[int, int]] | list[tuple[int, int, str]]:
+    rank = position[0] + (-1)**color
+    if rank == 7*(1 - color):
+        return [(rank, position[1] + i, p) for p in PROMOTIONS for i in [-1, 1] if _on_board(rank, position[1] + i)]
+    return [(rank, position[1] + i) for i in [-1, 1] if _on_board(rank, position[1] + i)]
+
+def _pawn_moves(position: tuple[int, int], color: int) -> list[tuple[int, int]] | list[tuple[int, int, str]]:
+    rank = position[0] + (-1)**color
+    if rank == 7*(1 - color):
+        return [(rank, position[1], p) for p in PROMOTIONS] + _pawn_captures(position, color)
+    return [(rank, position[1])] + \
+           ([(position[0] + 2*(-1)**color, position[1])] if position[0] == 1 + 5*color else []) + \
+           _pawn_captures(position, color)
+
+def _between(position: tuple[int, int], directions: tuple[tuple[int, int], ...]) -> dict[tuple[int, int], list[tuple[int, int]]]:
+    return {ray[k]: ray[:k] for ray in (_ray(position, direction) for direction in directions) for k in range(len(ray))}
+
+# RAYS[position][direction]: squares from position outward to the edge of the board.
+RAYS: dict[tuple[int, int], dict[tuple[int, int], list[tuple[int, int]]]] = \
+    {position: {direction: _ray(position, direction) for direction in ROOK_DIRECTIONS + BISHOP_DIRECTIONS} for position in SQUARES}
+KNIGHT_MOVES: dict[tuple[int, int], list[tuple[int, int]]] = {position: _steps(position, KNIGHT_DELTAS) for position in SQUARES}
+KING_MOVES: dict[tuple[int, int], list[tuple[int, int]]] = {position: _steps(position, KING_DELTAS) for position in SQUARES}
+ROOK_MOVES: dict[tuple[int, int], list[tuple[int, int]]] = \
+    {position: [target for direction in ROOK_DIRECTIONS for target in RAYS[position][direction]] for position in SQUARES}
+BISHOP_MOVES: dict[tuple[int, int], list[tuple[int, int]]] = \
+    {position: [target for direction in BISHOP_DIRECTIONS for target in RAYS[position][direction]] for position in SQUARES}
+QUEEN_MOVES: dict[tuple[int, int], list[tuple[int, int]]] = {position: ROOK_MOVES[position] + BISHOP_MOVES[position] for position in SQUARES}
+# Indexed by color, then position.
+PAWN_MOVES: tuple[dict, dict] = tuple({position: _pawn_moves(position, color) for position in SQUARES} for color in range(2))
+PAWN_CAPTURES: tuple[dict, dict] = tuple({position: _pawn_captures(position, color) for position in SQUARES} for color in range(2))
+PAWN_PUSHES: tuple[dict, dict] = \
+    tuple({position: list(dict.fromkeys(move[:2] for move in PAWN_MOVES[color][position] if move[1] == position[1])) for position in SQUARES} for color in range(2))
+
+# Target sets for can_move.
+KNIGHT_TARGETS = {position: set(moves) for position, moves in KNIGHT_MOVES.items()}
+KING_TARGETS = {position: set(moves) for position, moves in KING_MOVES.items()}
+ROOK_TARGETS = {position: set(moves) for position, moves in ROOK_MOVES.items()}
+BISHOP_TARGETS = {position: set(moves) for position, moves in BISHOP_MOVES.items()}
+QUEEN_TARGETS = {position: set(moves) for position, moves in QUEEN_MOVES.items()}
+PAWN_TARGETS = tuple({position: {move[:2] for move in PAWN_MOVES[color][position] if _on_board(*move[:2])} for position in SQUARES} for color in range(2))
+
+# Squares strictly between two aligned squares: rook lines in ascending order, bishop lines outward from the start.
+ROOK_LINES: dict[tuple[int, int], dict[tuple[int, int], list[tuple[int, int]]]] = \
+    {position: {end: sorted(line) for end, line in _between(position, ROOK_DIRECTIONS).items()} for position in SQUARES}
+BISHOP_LINES: dict[tuple[int, int], dict[tuple[int, int], list[tuple[int, int]]]] = \
+    {position: _between(position, BISHOP_DIRECTIONS) for position in SQUARES}
+
+_NO_TARGETS = set()
+_NO_LINES = {}
 
 class ChessPiece:
+    # No per-instance __dict__; subclasses declare empty __slots__ to keep it that way.
+    __slots__ = ("color", "type", "can_castle")
+
     def __init__(self, color: Color, type: PieceType, can_castle: bool = None) -> None:
         self.color = color
         self.type = type
@@ -37,6 +111,10 @@ class ChessPiece:
             
     def __repr__(self) -> str:
         return PIECE_STR[self.type][self.color]
+
+    @property
+    def code(self) -> int:
+        return encode_piece(int(self.color), PIECE_INDEX[self.type], self.can_castle)
     
     @staticmethod
     def out_of_bounds(position: tuple[int, int]) -> bool:
@@ -52,129 +130,101 @@ class ChessPiece:
         return []
     
 class Empty(ChessPiece):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(NONE, EMPTY)
     
 class Rook(ChessPiece):
+    __slots__ = ()
+
     def __init__(self, color, can_castle=False) -> None:
         super().__init__(color, ROOK, can_castle)
         self.can_castle = can_castle
 
     def can_move(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> bool:
-        if self.out_of_bounds(start_pos) or self.out_of_bounds(end_pos):
-            return False
-        return (start_pos[0] == end_pos[0]) != (start_pos[1] == end_pos[1])
+        return end_pos[:2] in ROOK_TARGETS.get(start_pos, _NO_TARGETS)
     
     def moves(self, start_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        return [(start_pos[0], i) for i in range(8) if i != start_pos[1]] + \
-               [(i, start_pos[1]) for i in range(8) if i != start_pos[0]]
+        return list(ROOK_MOVES[start_pos])
     
     def line_of_sight(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        if not self.can_move(start_pos, end_pos):
-            return []
-        return [(start_pos[0], i) for i in range(min(start_pos[1], end_pos[1]) + 1, max(start_pos[1], end_pos[1]))] if start_pos[0] == end_pos[0] else \
-                [(i, start_pos[1]) for i in range(min(start_pos[0], end_pos[0]) + 1, max(start_pos[0], end_pos[0]))]
+        return list(ROOK_LINES.get(start_pos, _NO_LINES).get(end_pos[:2], []))
     
 class Bishop(ChessPiece):
+    __slots__ = ()
+
     def __init__(self, color) -> None:
         super().__init__(color, BISHOP)
 
     def can_move(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> bool:
-        if self.out_of_bounds(start_pos) or self.out_of_bounds(end_pos):
-            return False
-        return abs(start_pos[0] - end_pos[0]) == abs(start_pos[1] - end_pos[1]) and start_pos != end_pos
+        return end_pos[:2] in BISHOP_TARGETS.get(start_pos, _NO_TARGETS)
     
     def moves(self, start_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        # minor diagonal, major diagonal
-        return [(start_pos[0] + i, start_pos[1] + i) for i in range(0 - min(start_pos), 7 - max(start_pos) + 1) if i != 0] + \
-               [(start_pos[0] - i, start_pos[1] + i) for i in range(-min(7 - start_pos[0], start_pos[1]), min(start_pos[0], 7 - start_pos[1]) + 1) if i != 0]
+        return list(BISHOP_MOVES[start_pos])
     
     def line_of_sight(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        if not self.can_move(start_pos, end_pos):
-            return []
-        up = 1 if end_pos[0] > start_pos[0] else -1
-        right = 1 if end_pos[1] > start_pos[1] else -1
-        return [(start_pos[0] + i, start_pos[1] + j) for (i, j) in \
-                zip(range(up, end_pos[0] - start_pos[0], up), range(right, end_pos[1] - start_pos[1], right))]
+        return list(BISHOP_LINES.get(start_pos, _NO_LINES).get(end_pos[:2], []))
     
 class Queen(ChessPiece):
+    __slots__ = ()
+
     def __init__(self, color) -> None:
         super().__init__(color, QUEEN)
 
     def can_move(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> bool:
-        if self.out_of_bounds(start_pos) or self.out_of_bounds(end_pos):
-            return False
-        return Rook(self.color).can_move(start_pos, end_pos) or \
-             Bishop(self.color).can_move(start_pos, end_pos)
+        return end_pos[:2] in QUEEN_TARGETS.get(start_pos, _NO_TARGETS)
     
     def moves(self, start_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        return Rook(self.color).moves(start_pos) + \
-             Bishop(self.color).moves(start_pos)
+        return list(QUEEN_MOVES[start_pos])
     
     def line_of_sight(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> list[tuple[int, int]]:
         if not self.can_move(start_pos, end_pos):
             raise ValueError(f"Queen at {start_pos} cannot move to {end_pos}.")
-        return Bishop(self.color).line_of_sight(start_pos, end_pos) + \
-            Rook(self.color).line_of_sight(start_pos, end_pos)
+        return list(BISHOP_LINES[start_pos].get(end_pos[:2]) or ROOK_LINES[start_pos].get(end_pos[:2], []))
              
 
 class Knight(ChessPiece):
+    __slots__ = ()
+
     def __init__(self, color) -> None:
         super().__init__(color, KNIGHT)
 
     def can_move(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> bool:
-        if self.out_of_bounds(start_pos) or self.out_of_bounds(end_pos):
-            return False
-        return (abs(start_pos[0] - end_pos[0]) == 2 and abs(start_pos[1] - end_pos[1]) == 1) or \
-               (abs(start_pos[0] - end_pos[0]) == 1 and abs(start_pos[1] - end_pos[1]) == 2)
+        return end_pos[:2] in KNIGHT_TARGETS.get(start_pos, _NO_TARGETS)
     
     def moves(self, start_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        return [(start_pos[0] + i*k, start_pos[1] + j*(3-k)) for (i, j, k) in product([-1, 1], [-1, 1], [1, 2]) \
-                if not self.out_of_bounds((start_pos[0] + i*k, start_pos[1] + j*(3-k)))]
+        return list(KNIGHT_MOVES[start_pos])
 
 class Pawn(ChessPiece):
+    __slots__ = ()
+
     def __init__(self, color) -> None:
         super().__init__(color, PAWN)
 
     def can_move(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> bool:
-        if self.out_of_bounds(start_pos) or self.out_of_bounds(end_pos):
-            return False
-        
-        return (end_pos[0] - start_pos[0] == (-1)**self.color and end_pos[1] == start_pos[1]) or \
-               (end_pos[0] - start_pos[0] == 2*(-1)**self.color and end_pos[1] == start_pos[1] and start_pos[0] == 1 + 5*self.color) or \
-               (end_pos[0] - start_pos[0] == (-1)**self.color and abs(end_pos[1] - start_pos[1]) == 1)
+        return end_pos[:2] in PAWN_TARGETS[self.color].get(start_pos, _NO_TARGETS)
 
     def moves(self, start_pos: tuple[int, int]) -> list[tuple[int, int]] | list[tuple[int, int, str]]:
-        if start_pos[0] + (-1)**self.color == 7*(1 - self.color):
-            return [(start_pos[0] + (-1)**self.color, start_pos[1], p) for p in ["q", "r", "b", "n"]]
-        return [(start_pos[0] + (-1)**self.color, start_pos[1])] + \
-               ([(start_pos[0] + 2*(-1)**self.color, start_pos[1])] if start_pos[0] == 1 + 5*self.color  else []) + \
-               self.attack_options(start_pos)
+        return list(PAWN_MOVES[self.color][start_pos])
     
     def attack_options(self, start_pos: tuple[int, int]) -> list[tuple[int, int]] | list[tuple[int, int, str]]:
-        if start_pos[0] + (-1)**self.color == 7*(1 - self.color):
-            return [(start_pos[0] + (-1)**self.color, start_pos[1] + i, p) for p in ["q", "r", "b", "n"] for i in [-1, 1] \
-                if not self.out_of_bounds((start_pos[0] + (-1)**self.color, start_pos[1] + i))]
-        return [(start_pos[0] + (-1)**self.color, start_pos[1] + i) for i in [-1, 1] \
-                if not self.out_of_bounds((start_pos[0] + (-1)**self.color, start_pos[1] + i))]
+        return list(PAWN_CAPTURES[self.color][start_pos])
 
 class King(ChessPiece):
+    __slots__ = ()
+
     def __init__(self, color, can_castle=False) -> None:
         super().__init__(color, KING, can_castle)
         self.can_castle = can_castle
 
     def can_move(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> bool:
-        if self.out_of_bounds(start_pos) or self.out_of_bounds(end_pos):
-            return False
-        
         # moving one, castling
-        return abs(start_pos[0] - end_pos[0]) <= 1 and abs(start_pos[1] - end_pos[1]) <= 1 and not (start_pos[0] == end_pos[0] and start_pos[1] == end_pos[1]) or \
+        return end_pos[:2] in KING_TARGETS.get(start_pos, _NO_TARGETS) or \
                 start_pos == (7*self.color, 3) and self.can_castle and abs(start_pos[1] - end_pos[1]) == 2 and start_pos[0] == end_pos[0]
 
     def moves(self, start_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        return [(start_pos[0] + i, start_pos[1] + j) for i in [-1, 0, 1] for j in [-1, 0, 1] \
-                if not self.out_of_bounds((start_pos[0] + i, start_pos[1] + j)) and not (i == 0 and j == 0)] + \
-                self.castling_options(start_pos)
+        return KING_MOVES[start_pos] + self.castling_options(start_pos)
     
     def castling_options(self, start_pos: tuple[int, int]) -> list[tuple[int, int]]:
         if start_pos != (7*self.color, 3):
@@ -188,4 +238,26 @@ FEN_MAP: dict[str, ChessPiece] = {
     "q": Queen,
     "k": King,
     "n": Knight,
-}
\ No newline at end of file
+}
+
+PIECE_CLASS: dict[PieceType, type[ChessPiece]] = {
+    EMPTY: Empty,
+    PAWN: Pawn,
+    ROOK: Rook,
+    BISHOP: Bishop,
+    QUEEN: Queen,
+    KING: King,
+    KNIGHT: Knight,
+}
+
+_COLORS = (WHITE, BLACK)
+
+def piece_from_code(code: int) -> ChessPiece:
+    """Builds the ChessPiece view of a compact piece code from piece_info."""
+    if not code:
+        return Empty()
+    piece_type = PIECE_TYPES[code & TYPE_MASK]
+    piece = PIECE_CLASS[piece_type](_COLORS[code_color(code)])
+    if piece_type == ROOK or piece_type == KING:
+        piece.can_castle = bool(code & CASTLE_BIT)
+    return piece
\ No newline at end of file
@@ -0,0 +1,202 @@
+import argparse
+import os
+import random
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+
+from bitboard import squares
+from board import Board
+from movegen import legal_moves
+from perft import START_FEN, move_to_str
+from pgn import Game, open_pgn, parse_san, read_games, start_board
+from piece_info import WHITE, KING, ROOK, board_to_coord
+from polyglot_keys import RANDOM64
+
+Move = tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]
+
+# Book entries are 16 bytes, big-endian, sorted by key.
+ENTRY = np.dtype([("key", ">u8"), ("move", ">u2"), ("weight", ">u2"), ("learn", ">u4")])
+CASTLING_OFFSET = 768
+EN_PASSANT_OFFSET = 772
+TURN_OFFSET = 780
+# Promotion field of a book move, 0 for none.
+PROMOTIONS = ("", "n", "b", "r", "q")
+MAX_WEIGHT = 0xFFFF
+DEFAULT_MAX_PLY = 20
+# Points for the side that played a move: win, draw, loss. Unfinished games score nothing.
+RESULT_POINTS = {"1-0": (2, 0), "0-1": (0, 2), "1/2-1/2": (1, 1)}
+
+class BookEntry(NamedTuple):
+    move: Move
+    weight: int
+    learn: int
+
+def polyglot_key(board: Board) -> int:
+    """Polyglot Zobrist key of board, as used by Polyglot .bin opening books.
+
+    Unlike Board.hash, the en passant file only counts when a pawn of the side to move could capture.
+    """
+    key = 0
+    for color, masks in enumerate(board.bitboards().pieces):
+        # Piece kinds alternate black and white, from pawns (0 and 1) to kings (10 and 11).
+        for index in range(1, len(masks)):
+            offset = 64 * (2 * (index - 1) + 1 - color)
+            for sq in squares(masks[index]):
+                rank, col = divmod(sq, 8)
+                key ^= RANDOM64[offset + rank * 8 + 7 - col]
+    rights = board.castling_rights()
+    for flag in range(4):
+        if rights & (1 << flag):
+            key ^= RANDOM64[CASTLING_OFFSET + flag]
+    if board.can_capture_en_passant():
+        key ^= RANDOM64[EN_PASSANT_OFFSET + 7 - board_to_coord(board.en_passant_square)[1]]
+    if board.current_player == WHITE:
+        key ^= RANDOM64[TURN_OFFSET]
+    return key
+
+def encode_move(board: Board, move: Move) -> int:
+    """Book encoding of a move of board. Castling is written as the king taking its own rook."""
+    start_pos, end_pos = move
+    end = end_pos[:2]
+    if board[start_pos] == KING and abs(end[1] - start_pos[1]) == 2:
+        end = (end[0], 0 if end[1] < start_pos[1] else 7)
+    promotion = PROMOTIONS.index(end_pos[2]) if len(end_pos) == 3 else 0
+    return (7 - end[1]) | end[0] << 3 | (7 - start_pos[1]) << 6 | start_pos[0] << 9 | promotion << 12
+
+def decode_move(board: Board, code: int) -> Move:
+    start_pos = ((code >> 9) & 7, 7 - ((code >> 6) & 7))
+    end_pos = ((code >> 3) & 7, 7 - (code & 7))
+    piece, target = board[start_pos], board[end_pos]
+    if piece == KING and target == ROOK and target.color == piece.color:
+        end_pos = (end_pos[0], start_pos[1] + (-2 if end_pos[1] < start_pos[1] else 2))
+    promotion = (code >> 12) & 7
+    return start_pos, end_pos + (PROMOTIONS[promotion],) if promotion else end_pos
+
+class OpeningBook:
+    """Polyglot .bin book, memory-mapped and binary searched by key, so opening it reads nothing."""
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # np.memmap cannot map an empty file.
+        self.entries = np.memmap(path, dtype=ENTRY, mode="r") if os.path.getsize(path) else np.empty(0, dtype=ENTRY)
+        self.keys = self.entries["key"]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def find_all(self, board: Board) -> list[BookEntry]:
+        """Legal book moves of board, highest weight first."""
+        key = polyglot_key(board)
+        start, end = bisect_left(self.keys, key), bisect_right(self.keys, key)
+        if start == end:
+            return []
+        legal = set(legal_moves(board))
+        res = []
+        for entry in self.entries[start:end]:
+            move = decode_move(board, int(entry["move"]))
+            if move in legal:
+                res.append(BookEntry(move, int(entry["weight"]), int(entry["learn"])))
+        return sorted(res, key=lambda entry: entry.weight, reverse=True)
+
+    def best(self, board: Board) -> Move | None:
+        entries = self.find_all(board)
+        return entries[0].move if entries and entries[0].weight else None
+
+    def choose(self, board: Board, rng: random.Random = random) -> Move | None:
+        """A book move picked at random in proportion to its weight, or None if board is not in the book."""
+        entries = [entry for entry in self.find_all(board) if entry.weight]
+        if not entries:
+            return None
+        return rng.choices([entry.move for entry in entries], [entry.weight for entry in entries])[0]
+
+class BookBuilder:
+    """Collects the first max_ply moves of games into Polyglot book entries.
+
+    A move's weight is 2 points per win and 1 per draw for the side that played it, or the number of
+    games it was played in with by_results False. Moves seen in fewer than min_games games are left out.
+    """
+    def __init__(self, max_ply: int = DEFAULT_MAX_PLY, min_games: int = 1, by_results: bool = True) -> None:
+        self.max_ply = max_ply
+        self.min_games = min_games
+        self.by_results = by_results
+        # (key, move) -> [points, games]
+        self.moves: dict[tuple[int, int], list[int]] = {}
+        self.games = 0
+
+    def add_game(self, game: Game) -> None:
+        """Adds the moves of game up to max_ply or its first illegal move. Games with a bad FEN tag are skipped."""
+        points = RESULT_POINTS.get(game.result)
+        if self.by_results and points is None:
+            return
+        try:
+            board = start_board(game)
+        except ValueError:
+            return
+        self.games += 1
+        for san in game.moves[:self.max_ply]:
+            try:
+                move = parse_san(board, san)
+            except ValueError:
+                return
+            stats = self.moves.setdefault((polyglot_key(board), encode_move(board, move)), [0, 0])
+            stats[0] += points[int(board.current_player)] if points else 0
+            stats[1] += 1
+            board.move(*move)
+
+    def entries(self) -> np.ndarray:
+        """Book entries sorted by key, then by weight from highest."""
+        selected = [(key, move, stats[0] if self.by_results else stats[1])
+                    for (key, move), stats in self.moves.items() if stats[1] >= self.min_games]
+        res = np.zeros(len(selected), dtype=ENTRY)
+        if not selected:
+            return res
+        keys, moves, weights = (np.array(column, dtype=np.uint64) for column in zip(*selected))
+        # Weights are scaled down to fit 16 bits only when the largest one would not.
+        if weights.max() > MAX_WEIGHT:
+            weights = weights * MAX_WEIGHT // weights.max()
+        order = np.lexsort((-weights.astype(np.int64), keys))
+        res["key"], res["move"], res["weight"] = keys[order], moves[order], weights[order]
+        return res[res["weight"] > 0]
+
+    def write(self, path: str) -> int:
+        entries = self.entries()
+        entries.tofile(path)
+        return len(entries)
+
+def build_book(games: Iterable[Game], path: str, max_ply: int = DEFAULT_MAX_PLY, min_games: int = 1,
+               by_results: bool = True) -> int:
+    builder = BookBuilder(max_ply, min_games, by_results)
+    for game in games:
+        builder.add_game(game)
+    return builder.write(path)
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build or probe Polyglot opening books.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build a book from PGN files.")
+    build.add_argument("book", type=str, help="Output .bin book.")
+    build.add_argument("files", type=str, nargs="+", help="PGN files (optionally gzip or bz2 compressed).")
+    build.add_argument("-p", "--plies", type=int, default=DEFAULT_MAX_PLY, help="Moves per game to include, in plies.")
+    build.add_argument("-m", "--min-games", type=int, default=1, help="Games a move must appear in.")
+    build.add_argument("--frequency", action="store_true", help="Weight moves by how often they were played instead of by results.")
+    probe = subparsers.add_parser("probe", help="List the book moves of a position.")
+    probe.add_argument("book", type=str, help="Polyglot .bin book.")
+    probe.add_argument("-f", "--fen", type=str, default=START_FEN, help="FEN string to look up.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "build":
+        def games():
+            for path in args.files:
+                with open_pgn(path) as f:
+                    yield from read_games(f)
+        count = build_book(games(), args.book, args.plies, args.min_games, not args.frequency)
+        print(f"{count} entries written to {args.book}")
+    else:
+        board = Board(args.fen)
+        print(f"Key: {polyglot_key(board):016x}")
+        for entry in OpeningBook(args.book).find_all(board):
+            print(f"{move_to_str(entry.move)} weight {entry.weight}")
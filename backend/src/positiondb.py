@@ -0,0 +1,264 @@
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from typing import NamedTuple
+
+import numpy as np
+
+from board import Board
+from encoding import POSITION, NO_EN_PASSANT
+from perft import START_FEN
+from pgn import Game, open_pgn, read_games, replay, start_board
+
+Move = tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]
+
+# Result codes, indexed by code.
+RESULTS = ("*", "1-0", "0-1", "1/2-1/2")
+GAME = np.dtype([("position", "<u8"), ("tags", "<u8"), ("tags_length", "<u4"), ("plies", "<u2"),
+                 ("result", "u1"), ("reserved", "u1")])
+# Index records while building; the finished index keeps the keys and the rest in separate files so
+# that binary search runs over one contiguous uint64 array.
+INDEX = np.dtype([("key", "<u8"), ("game", "<u4"), ("ply", "<u2"), ("result", "u1"), ("reserved", "u1")])
+ENTRY = np.dtype([("game", "<u4"), ("ply", "<u2"), ("result", "u1"), ("reserved", "u1")])
+DEFAULT_RUN_SIZE = 1 << 20
+MERGE_BLOCK = 1 << 16
+# Bytes of an encoded position that identify it: placement, side to move, castling and en passant but not the clocks.
+_PLACEMENT = slice(0, 24)
+_STATE = slice(28, 31)
+_EN_PASSANT_BYTE = 30
+
+POSITIONS_FILE, GAMES_FILE, TAGS_FILE, KEYS_FILE, ENTRIES_FILE = "positions.bin", "games.bin", "tags.jsonl", "keys.bin", "entries.bin"
+
+class Occurrence(NamedTuple):
+    game: int
+    ply: int
+    result: str
+
+class GameInfo(NamedTuple):
+    tags: dict[str, str]
+    plies: int
+    result: str
+
+def position_key(board: Board) -> tuple[int, bytes]:
+    """Zobrist key and encoded position of board, ignoring an en passant square no pawn can capture on.
+
+    Board.hash already leaves such a square out; the encoding drops it too, so transpositions like
+    1. e4 e5 2. Nf3 and 1. Nf3 e5 2. e4 compare equal.
+    """
+    encoded = board.to_bytes()
+    if board.en_passant_square != "-" and not board.can_capture_en_passant():
+        encoded = encoded[:_EN_PASSANT_BYTE] + bytes([NO_EN_PASSANT]) + encoded[_EN_PASSANT_BYTE + 1:]
+    return board.hash, encoded
+
+def _same_position(a: bytes, b: bytes) -> bool:
+    return a[_PLACEMENT] == b[_PLACEMENT] and a[_STATE] == b[_STATE]
+
+def _memmap(path: str, dtype: np.dtype) -> np.ndarray:
+    # np.memmap cannot map an empty file.
+    if not os.path.getsize(path):
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+class DatabaseBuilder:
+    """Writes replayed games to a position database directory.
+
+    Every position of every game is appended to positions.bin as a 32 byte encoding record. Index
+    entries (Zobrist key, game, ply, result) are sorted in runs of run_size in memory, spilled to
+    disk and merged block by block when the builder is closed, so memory stays bounded by the run
+    size however many games are added.
+    """
+    def __init__(self, directory: str, run_size: int = DEFAULT_RUN_SIZE, backend: str = "array") -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.backend = backend
+        self.positions = open(self.path(POSITIONS_FILE), "wb")
+        self.games = open(self.path(GAMES_FILE), "wb")
+        self.tags = open(self.path(TAGS_FILE), "wb")
+        self.run = np.zeros(run_size, dtype=INDEX)
+        self.run_length = 0
+        self.runs: list[str] = []
+        self.game_count = 0
+        self.position_count = 0
+        self.tags_offset = 0
+
+    def __enter__(self) -> "DatabaseBuilder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def add_game(self, game: Game) -> str | None:
+        """Adds a parsed PGN game up to its first illegal move. Returns the error, if any.
+
+        A game whose FEN tag cannot be loaded is skipped.
+        """
+        try:
+            board = start_board(game, self.backend)
+        except ValueError as e:
+            return str(e)
+        boards = (board for _, _, board in replay(game, self.backend))
+        return self._add(board, boards, game.result, game.tags)
+
+    def add_moves(self, moves: list[Move], result: str = "*", tags: dict[str, str] = None, fen: str = START_FEN) -> None:
+        """Adds a game given as moves, played through Board.move without legality checks."""
+        board = Board(backend=self.backend)
+        board.load_fen(fen)
+        def boards():
+            for move in moves:
+                board.move(*move)
+                yield board
+        self._add(board, boards(), result, tags or {})
+
+    def _add(self, board: Board, boards, result: str, tags: dict[str, str]) -> str | None:
+        game = self.game_count
+        code = RESULTS.index(result) if result in RESULTS else 0
+        first = self.position_count
+        self._record(board, game, 0, code)
+        error = None
+        try:
+            for ply, board in enumerate(boards, 1):
+                self._record(board, game, ply, code)
+        except ValueError as e:
+            error = str(e)
+        encoded_tags = (json.dumps(tags) + "\n").encode()
+        record = np.array((first, self.tags_offset, len(encoded_tags) - 1, self.position_count - first - 1, code, 0), dtype=GAME)
+        self.games.write(record.tobytes())
+        self.tags.write(encoded_tags)
+        self.tags_offset += len(encoded_tags)
+        self.game_count += 1
+        return error
+
+    def _record(self, board: Board, game: int, ply: int, code: int) -> None:
+        key, encoded = position_key(board)
+        self.positions.write(encoded)
+        self.position_count += 1
+        self.run[self.run_length] = (key, game, ply, code, 0)
+        self.run_length += 1
+        if self.run_length == len(self.run):
+            self._spill()
+
+    def _spill(self) -> None:
+        run = np.sort(self.run[:self.run_length], order=["key", "game", "ply"])
+        path = self.path(f"run{len(self.runs)}.tmp")
+        run.tofile(path)
+        self.runs.append(path)
+        self.run_length = 0
+
+    def close(self) -> None:
+        if self.positions.closed:
+            return
+        if self.run_length or not self.runs:
+            self._spill()
+        for f in (self.positions, self.games, self.tags):
+            f.close()
+        with open(self.path(KEYS_FILE), "wb") as keys, open(self.path(ENTRIES_FILE), "wb") as entries:
+            for block in _merge(self.runs):
+                block["key"].tofile(keys)
+                entries.write(block[["game", "ply", "result", "reserved"]].astype(ENTRY).tobytes())
+        for path in self.runs:
+            os.remove(path)
+
+def _merge(paths: list[str], block_size: int = MERGE_BLOCK):
+    """Yields the sorted runs in paths as sorted blocks, reading block_size records of each run at a time."""
+    runs = [_memmap(path, INDEX) for path in paths]
+    offsets = [0] * len(runs)
+    pending = np.empty(0, dtype=INDEX)
+    while True:
+        blocks = [pending]
+        for i, run in enumerate(runs):
+            blocks.append(np.asarray(run[offsets[i]:offsets[i] + block_size]))
+            offsets[i] = min(offsets[i] + block_size, len(run))
+        merged = np.sort(np.concatenate(blocks), order=["key", "game", "ply"], kind="stable")
+        # Keys below the smallest last-read key of the unfinished runs cannot be preceded by anything unread.
+        # Entries equal to it stay pending: an unread entry with the same key may belong to an earlier game.
+        unfinished = [run[offsets[i] - 1]["key"] for i, run in enumerate(runs) if offsets[i] < len(run)]
+        if not unfinished:
+            if len(merged):
+                yield merged
+            return
+        cut = np.searchsorted(merged["key"], min(unfinished), side="left")
+        yield merged[:cut]
+        pending = merged[cut:]
+
+class PositionDatabase:
+    """Read-only view of a database written by DatabaseBuilder.
+
+    All files are memory-mapped, so opening does not read them. A lookup binary searches the sorted
+    keys and then checks each hit against its stored position, so Zobrist collisions are filtered out.
+    """
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.keys = _memmap(os.path.join(directory, KEYS_FILE), np.uint64)
+        self.entries = _memmap(os.path.join(directory, ENTRIES_FILE), ENTRY)
+        self.games = _memmap(os.path.join(directory, GAMES_FILE), GAME)
+        self.positions = _memmap(os.path.join(directory, POSITIONS_FILE), POSITION)
+        self.tags = _memmap(os.path.join(directory, TAGS_FILE), np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def position(self, game: int, ply: int) -> bytes:
+        """Encoded position at ply of game, as position_key returns it."""
+        return self.positions[int(self.games[game]["position"]) + ply].tobytes()
+
+    def lookup(self, board: Board) -> list[Occurrence]:
+        """Every game and ply at which the position of board occurred, in game order."""
+        key, encoded = position_key(board)
+        key = np.uint64(key)
+        start, end = np.searchsorted(self.keys, key, side="left"), np.searchsorted(self.keys, key, side="right")
+        res = []
+        for entry in self.entries[start:end]:
+            game, ply = int(entry["game"]), int(entry["ply"])
+            if _same_position(self.position(game, ply), encoded):
+                res.append(Occurrence(game, ply, RESULTS[entry["result"]]))
+        return res
+
+    def results(self, board: Board) -> Counter:
+        """Number of games with each result in which the position occurred, counting each game once."""
+        return Counter({occurrence.game: occurrence.result for occurrence in self.lookup(board)}.values())
+
+    def game(self, game: int) -> GameInfo:
+        record = self.games[game]
+        offset, length = int(record["tags"]), int(record["tags_length"])
+        tags = json.loads(self.tags[offset:offset + length].tobytes())
+        return GameInfo(tags, int(record["plies"]), RESULTS[record["result"]])
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build or query an on-disk database of the positions of PGN games.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Replay PGN files into a new database directory.")
+    build.add_argument("directory", type=str, help="Database directory.")
+    build.add_argument("files", type=str, nargs="+", help="PGN files (optionally gzip or bz2 compressed).")
+    build.add_argument("-r", "--run-size", type=int, default=DEFAULT_RUN_SIZE, help="Index entries sorted in memory at a time.")
+    query = subparsers.add_parser("query", help="List the games in which a position occurred.")
+    query.add_argument("directory", type=str, help="Database directory.")
+    query.add_argument("-f", "--fen", type=str, default=START_FEN, help="FEN string to look up.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    if args.command == "build":
+        errors = 0
+        with DatabaseBuilder(args.directory, args.run_size) as builder:
+            for path in args.files:
+                with open_pgn(path) as f:
+                    for game in read_games(f):
+                        errors += builder.add_game(game) is not None
+        elapsed = time.perf_counter() - start
+        print(f"{builder.game_count} games ({errors} with errors), {builder.position_count} positions in {elapsed:.3f}s")
+    else:
+        database = PositionDatabase(args.directory)
+        occurrences = database.lookup(Board(args.fen))
+        elapsed = time.perf_counter() - start
+        for occurrence in occurrences:
+            info = database.game(occurrence.game)
+            print(f"Game {occurrence.game} ply {occurrence.ply}: {info.tags.get('White', '?')} - {info.tags.get('Black', '?')} {info.result}")
+        results = database.results(Board(args.fen))
+        print(f"{len(occurrences)} occurrences in {len({o.game for o in occurrences})} games "
+              f"({', '.join(f'{result}: {count}' for result, count in results.items()) or 'none'}) in {elapsed * 1000:.3f} ms")
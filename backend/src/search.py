@@ -0,0 +1,274 @@
+import argparse
+import sys
+import time
+from typing import NamedTuple
+
+from board import Board
+from evaluator import GameEvaluator
+from perft import START_FEN, move_to_str
+from ordering import MoveOrderer, piece_indices
+from piece_info import PIECE_INDEX, PIECE_VALUES, PAWN
+from polyglot import OpeningBook
+from tablebase import Tablebases, ProbeResult
+from transposition import TranspositionTable, DEFAULT_SIZE_MB, EXACT, LOWER, UPPER
+
+Move = tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]
+
+INFINITY = 1_000_000
+# Mate scores are MATE_SCORE minus the ply of the mate, so shorter mates score higher.
+MATE_SCORE = 100_000
+MAX_PLY = 128
+# How often (in nodes) the clock is read when searching with a time limit.
+TIME_CHECK_INTERVAL = 1024
+# Quiescence skips captures that cannot bring the score within this margin of alpha, even unopposed.
+DELTA_MARGIN = 200
+_PAWN_VALUE = PIECE_VALUES[PIECE_INDEX[PAWN]]
+
+class SearchResult(NamedTuple):
+    move: Move
+    score: int
+    pv: list[Move]
+    depth: int
+    nodes: int
+    time: float
+
+class SearchAborted(Exception):
+    """Raised inside the tree when the node or time limit is hit; the last completed iteration is kept."""
+
+def is_mate_score(score: int) -> bool:
+    return abs(score) >= MATE_SCORE - MAX_PLY
+
+# Mate scores are stored relative to the stored node rather than the root, so they stay valid at any ply.
+def score_to_table(score: int, ply: int) -> int:
+    if is_mate_score(score):
+        return score + ply if score > 0 else score - ply
+    return score
+
+def score_from_table(score: int, ply: int) -> int:
+    if is_mate_score(score):
+        return score - ply if score > 0 else score + ply
+    return score
+
+def tablebase_score(result: ProbeResult, ply: int) -> int:
+    if result.wdl > 0:
+        return MATE_SCORE - ply - result.dtm
+    return -MATE_SCORE + ply + result.dtm if result.wdl < 0 else 0
+
+class Search:
+    """Negamax alpha-beta over Board.push/pop with iterative deepening and a quiescence search at the horizon.
+
+    Scores are centipawns from the side to move's point of view. Each iteration searches the previous
+    principal variation first, then the transposition table's best move, then the rest as ranked by
+    the MoveOrderer. A search cut short by its node or time limit returns the deepest completed iteration.
+
+    start_depth and seed (which seeds the orderer's history) vary the search between the workers of a
+    parallel search, and setting stop (anything with is_set, such as a multiprocessing.Event) aborts it.
+    With tablebases, positions below the root that they hold are scored exactly instead of searched.
+    report, if given, is called with the SearchResult of every completed iteration.
+    """
+    def __init__(self, board: Board, max_depth: int = 64, node_limit: int = None, time_limit: float = None,
+                 table: TranspositionTable = None, start_depth: int = 1, seed: int = None, stop=None,
+                 tablebases: Tablebases = None, report=None) -> None:
+        self.board = board
+        # Pass a table in to keep it (and its size) across searches.
+        self.table = table if table is not None else TranspositionTable()
+        self.orderer = MoveOrderer(MAX_PLY, seed)
+        self.evaluator = GameEvaluator(board)
+        self.max_depth = min(max_depth, MAX_PLY)
+        self.start_depth = max(1, min(start_depth, self.max_depth))
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.stop = stop
+        self.tablebases = tablebases
+        self.report = report
+        self.nodes = 0
+        self.deadline = None
+        self.pv: list[list[Move]] = [[] for _ in range(MAX_PLY + 1)]
+        self.root_pv: list[Move] = []
+        # True while the search is still descending along the previous iteration's principal variation.
+        self.follow_pv = False
+
+    def evaluate(self) -> int:
+        # Kept up to date by Board.move and Board.pop, so this never walks the board.
+        return self.board.evaluation.score(self.board.current_player)
+
+    def is_draw(self) -> bool:
+        # One earlier occurrence is enough inside the tree: the side to move could repeat it again.
+        return self.board.halfmove_clock >= 100 or self.board.fen_counter[self.board.hash] > 1
+
+    def check_limits(self) -> None:
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchAborted()
+        if self.nodes % TIME_CHECK_INTERVAL:
+            return
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchAborted()
+        if self.stop is not None and self.stop.is_set():
+            raise SearchAborted()
+
+    def order(self, moves: list[Move], ply: int, table_move: Move = None) -> list[Move]:
+        # Previous iteration's principal variation first, otherwise the table's best move.
+        if self.follow_pv and ply < len(self.root_pv) and self.root_pv[ply] in moves:
+            best = self.root_pv[ply]
+        else:
+            self.follow_pv = False
+            best = table_move
+        return self.orderer.order(self.board, moves, ply, best)
+
+    def quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        """Searches captures and promotions only, until the position is quiet enough to evaluate."""
+        self.nodes += 1
+        self.check_limits()
+        # Stand pat: the side to move is assumed to have a quiet move at least as good as the static score.
+        stand_pat = self.evaluate()
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        moves = self.evaluator.all_valid_moves(captures_only=True)
+        if not moves:
+            return stand_pat
+        indices = piece_indices(self.board.bitboards())
+        best = stand_pat
+        for move in self.orderer.order(self.board, moves, ply):
+            end_pos = move[1]
+            # An empty target square is an en passant capture.
+            victim = PIECE_VALUES[indices[end_pos[0] * 8 + end_pos[1]]] or _PAWN_VALUE
+            # Delta pruning; promotions are always searched.
+            if len(end_pos) == 2 and stand_pat + victim + DELTA_MARGIN <= alpha:
+                continue
+            self.board.push(move)
+            try:
+                score = -self.quiescence(-beta, -alpha, ply + 1)
+            finally:
+                self.board.pop()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.pv[ply] = []
+        if ply and self.is_draw():
+            return 0
+        if ply and self.tablebases is not None:
+            result = self.tablebases.probe(self.board)
+            if result is not None:
+                return tablebase_score(result, ply)
+        if depth <= 0 or ply >= MAX_PLY:
+            return self.quiescence(alpha, beta, ply)
+        self.nodes += 1
+        self.check_limits()
+
+        original_alpha = alpha
+        table_move = None
+        entry = self.table.probe(self.board.hash)
+        if entry is not None:
+            table_depth, bound, table_score, table_move = entry
+            table_score = score_from_table(table_score, ply)
+            if ply and table_depth >= depth and (bound == EXACT or (bound == LOWER and table_score >= beta) or
+                                                 (bound == UPPER and table_score <= alpha)):
+                return table_score
+
+        moves = self.evaluator.all_valid_moves()
+        if not moves:
+            return -MATE_SCORE + ply if self.evaluator.in_check() else 0
+
+        best, best_move = -INFINITY, None
+        for move in self.order(moves, ply, table_move):
+            self.board.push(move)
+            try:
+                score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self.board.pop()
+            self.follow_pv = False
+            if score > best:
+                best, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    self.pv[ply] = [move] + self.pv[ply + 1]
+                    if alpha >= beta:
+                        self.orderer.add_cutoff(self.board, move, ply, depth)
+                        break
+
+        bound = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        self.table.store(self.board.hash, depth, bound, score_to_table(best, ply), best_move)
+        return best
+
+    def search(self) -> SearchResult:
+        start = time.perf_counter()
+        self.nodes = 0
+        self.deadline = start + self.time_limit if self.time_limit is not None else None
+        self.root_pv = []
+        self.table.new_search()
+        moves = self.evaluator.all_valid_moves()
+        result = SearchResult(moves[0] if moves else None, 0, [], 0, 0, 0.0)
+        if not moves:
+            score = -MATE_SCORE if self.evaluator.in_check() else 0
+            return result._replace(score=score)
+
+        for depth in range(self.start_depth, self.max_depth + 1):
+            self.follow_pv = True
+            try:
+                score = self.negamax(depth, -INFINITY, INFINITY, 0)
+            except SearchAborted:
+                break
+            self.root_pv = list(self.pv[0])
+            result = SearchResult(self.root_pv[0], score, self.root_pv, depth, self.nodes, time.perf_counter() - start)
+            if self.report is not None:
+                self.report(result)
+            # A forced mate found at this depth will not get shorter by searching deeper.
+            if is_mate_score(score):
+                break
+        return result._replace(nodes=self.nodes, time=time.perf_counter() - start)
+
+def search(board: Board, max_depth: int = 64, node_limit: int = None, time_limit: float = None,
+           table: TranspositionTable = None, tablebases: Tablebases = None) -> SearchResult:
+    return Search(board, max_depth, node_limit, time_limit, table, tablebases=tablebases).search()
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search a position for the best move.")
+    parser.add_argument("-f", "--fen", type=str, default=START_FEN, help="FEN string to search from.")
+    parser.add_argument("-d", "--depth", type=int, default=4, help="Maximum depth in plies.")
+    parser.add_argument("-n", "--nodes", type=int, default=None, help="Node limit.")
+    parser.add_argument("-t", "--time", type=float, default=None, help="Time limit in seconds.")
+    parser.add_argument("-b", "--backend", type=str, default="array", help="Board storage backend.")
+    parser.add_argument("--hash", type=float, default=DEFAULT_SIZE_MB, help="Transposition table size in MB.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Worker processes sharing the table (Lazy SMP).")
+    parser.add_argument("--book", type=str, default=None, help="Polyglot opening book to play from before searching.")
+    parser.add_argument("--tablebases", type=str, default=None, help="Directory of endgame tablebases written by tablebase.py.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    board = Board(args.fen, args.backend)
+    if args.book:
+        book_move = OpeningBook(args.book).choose(board)
+        if book_move:
+            print(f"Book move: {move_to_str(book_move)}")
+            sys.exit(0)
+    if args.workers > 1:
+        # Imported here since parallel imports this module.
+        from parallel import ParallelSearch
+        with ParallelSearch(args.workers, args.hash, args.tablebases) as engine:
+            result = engine.search(board, args.depth, args.nodes, args.time)
+            stats = engine.table.stats()
+    else:
+        table = TranspositionTable(args.hash)
+        tablebases = Tablebases(args.tablebases) if args.tablebases else None
+        result = search(board, args.depth, args.nodes, args.time, table, tablebases)
+        stats = table.stats()
+    print(f"Best move: {move_to_str(result.move) if result.move else '-'}")
+    print(f"Score: {result.score}")
+    print(f"PV: {' '.join(move_to_str(move) for move in result.pv)}")
+    print(f"Depth: {result.depth}, nodes: {result.nodes}, time: {result.time:.3f}s ({result.nodes / result.time if result.time else 0:.0f} nodes/s)")
+    if args.workers > 1:
+        for i, (nodes, depth) in enumerate(zip(result.worker_nodes, result.worker_depths)):
+            print(f"Worker {i}: depth {depth}, nodes: {nodes} ({nodes / result.time if result.time else 0:.0f} nodes/s)")
+        # Probe counts are per process, so only occupancy is meaningful for a shared table.
+        print(f"Hash: {stats['size_mb']:.1f} MB, occupancy: {stats['occupancy']:.1%}")
+    else:
+        print(f"Hash: {stats['size_mb']:.1f} MB, hit rate: {stats['hit_rate']:.1%}, occupancy: {stats['occupancy']:.1%}")
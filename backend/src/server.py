@@ -0,0 +1,193 @@
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from board import Board, BACKENDS
+from evaluator import GameEvaluator
+from handler import Handler
+from perft import START_FEN
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_GAMES = 10_000
+# Latency samples kept per request type; percentiles describe the most recent ones.
+LATENCY_SAMPLES = 10_000
+OPERATIONS = ("new", "move", "state", "close", "stats")
+
+class Session:
+    __slots__ = ("board", "evaluator", "game_over", "result")
+
+    def __init__(self, board: Board) -> None:
+        self.board = board
+        self.evaluator = GameEvaluator(board)
+        self.game_over = False
+        self.result = None
+
+class LatencyStats:
+    """Recent request latencies per operation, in seconds."""
+    def __init__(self, size: int = LATENCY_SAMPLES) -> None:
+        self.samples = {operation: deque(maxlen=size) for operation in OPERATIONS}
+        self.counts = dict.fromkeys(OPERATIONS, 0)
+
+    def add(self, operation: str, seconds: float) -> None:
+        self.samples[operation].append(seconds)
+        self.counts[operation] += 1
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Request count and p50, p90, p99 and max latency in milliseconds per operation seen so far."""
+        res = {}
+        for operation, samples in self.samples.items():
+            if samples:
+                res[operation] = {"count": self.counts[operation], **percentiles(samples)}
+        return res
+
+def percentiles(samples, points: tuple[int, ...] = (50, 90, 99)) -> dict[str, float]:
+    ordered = sorted(samples)
+    res = {f"p{point}": round(ordered[min(len(ordered) - 1, len(ordered) * point // 100)] * 1000, 3) for point in points}
+    res["max"] = round(ordered[-1] * 1000, 3)
+    return res
+
+def game_over(evaluator: GameEvaluator) -> str | None:
+    """Reason the game of evaluator is over, or None. Run on the executor: it generates every legal move."""
+    game_state = evaluator.is_game_over()
+    return evaluator.outcome(game_state)["reason"] if game_state["game_over"] else None
+
+class GameServer:
+    """Hosts games over TCP, one JSON request and one JSON response per line.
+
+    Every request is an object with an "op" ("new", "move", "state", "close" or "stats") and an
+    optional "id" echoed back in the response. Games belong to the connection that created them and
+    are dropped when it closes, and at most max_games are open at once, so memory stays bounded by
+    max_games small boards however clients behave. Requests on a connection are answered in order.
+
+    Game-over checks generate every legal move, so they run on executor rather than on the event
+    loop; the loop keeps reading and answering other connections meanwhile.
+    """
+    def __init__(self, max_games: int = DEFAULT_MAX_GAMES, backend: str = "compact", executor: Executor = None) -> None:
+        self.max_games = max_games
+        self.backend = backend
+        self.executor = executor if executor is not None else ThreadPoolExecutor()
+        self.sessions: dict[int, Session] = {}
+        self.ids = itertools.count(1)
+        self.handler = Handler()
+        self.latency = LatencyStats()
+        self.server: asyncio.base_events.Server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.base_events.Server:
+        self.server = await asyncio.start_server(self.serve, host, port)
+        return self.server
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        owned: set[int] = set()
+        try:
+            while line := await reader.readline():
+                start = time.perf_counter()
+                try:
+                    request = json.loads(line)
+                    operation = request.get("op")
+                    response = await self.handle(request, owned)
+                except Exception as e:
+                    operation, request = None, {}
+                    response = {"ok": False, "error": str(e) or type(e).__name__}
+                if isinstance(request, dict) and "id" in request:
+                    response["id"] = request["id"]
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+                if operation in self.latency.samples:
+                    self.latency.add(operation, time.perf_counter() - start)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for game in owned:
+                self.sessions.pop(game, None)
+            writer.close()
+
+    async def handle(self, request: dict, owned: set[int]) -> dict:
+        operation = request.get("op")
+        if operation == "new":
+            return self.new_game(request.get("fen") or START_FEN, owned)
+        if operation == "stats":
+            return {"ok": True, "games": len(self.sessions), "latency": self.latency.summary()}
+        if operation not in OPERATIONS:
+            return {"ok": False, "error": f"Unknown operation {operation}."}
+        game = request.get("game")
+        if game not in owned:
+            return {"ok": False, "error": f"No game {game} on this connection."}
+        session = self.sessions[game]
+        if operation == "close":
+            owned.discard(game)
+            del self.sessions[game]
+            return {"ok": True}
+        if operation == "move":
+            return await self.move(session, str(request.get("move", "")))
+        return self.state(session)
+
+    def new_game(self, fen: str, owned: set[int]) -> dict:
+        if len(self.sessions) >= self.max_games:
+            return {"ok": False, "error": f"Server is full ({self.max_games} games)."}
+        # Board(fen) falls back to the start position on a bad FEN, so load it separately to report the error.
+        board = Board(backend=self.backend)
+        try:
+            board.load_fen(fen)
+        except (ValueError, KeyError, IndexError) as e:
+            return {"ok": False, "error": f"Invalid FEN {fen}: {e}"}
+        game = next(self.ids)
+        self.sessions[game] = Session(board)
+        owned.add(game)
+        return {"ok": True, "game": game, **self.state(self.sessions[game])}
+
+    async def move(self, session: Session, text: str) -> dict:
+        if session.game_over:
+            return {"ok": False, "error": "Game is over.", **self.state(session)}
+        parsed = self.handler.parse_move(text)
+        if not parsed["valid"]:
+            return {"ok": False, "error": parsed["reason"]}
+        # is_valid answers from the position's legal move set, so nothing else reaches Board.move.
+        validity = session.evaluator.is_valid(parsed["start_pos"], parsed["end_pos"])
+        if not validity["valid"]:
+            return {"ok": False, "error": validity.reason}
+        session.board.move(parsed["start_pos"], parsed["end_pos"])
+        # The connection waits for this before its next request, so nothing else touches the board meanwhile.
+        session.result = await asyncio.get_running_loop().run_in_executor(self.executor, game_over, session.evaluator)
+        session.game_over = session.result is not None
+        return {"ok": True, **self.state(session)}
+
+    @staticmethod
+    def state(session: Session) -> dict:
+        return {"fen": session.board.to_fen(), "game_over": session.game_over, "result": session.result}
+
+    def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Host chess games over TCP with one JSON request per line.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help="Port to listen on.")
+    parser.add_argument("-g", "--max-games", type=int, default=DEFAULT_MAX_GAMES, help="Games open at once.")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Executor threads for game-over checks.")
+    parser.add_argument("-b", "--backend", type=str, default="compact", choices=BACKENDS, help="Board storage backend.")
+    return parser.parse_args(argv)
+
+async def main(args: argparse.Namespace) -> None:
+    server = GameServer(args.max_games, args.backend, ThreadPoolExecutor(args.workers))
+    await server.start(args.host, args.port)
+    print(f"Serving on {args.host}:{server.port}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,470 @@
+import argparse
+import os
+import time
+from collections import defaultdict
+from typing import NamedTuple
+
+import numpy as np
+
+from bitboard import BETWEEN, squares
+from board import Board
+from perft import START_FEN
+from piece_info import PIECE_INDEX, PIECE_VALUES, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from pieces import KNIGHT_MOVES, KING_MOVES, ROOK_DIRECTIONS, BISHOP_DIRECTIONS, RAYS as PIECE_RAYS
+
+# Tables index every placement of their pieces, one square per piece in signature order, so their
+# size is 2 * 64 ** pieces: KBNvK has 33.5M entries, and five pieces would not fit in memory.
+MAX_PIECES = 4
+# Entries are one signed byte from the side to move's point of view: 0 for a draw, an odd number of
+# plies for a win (mate in 1 is 1), minus one more than an even number of plies for a loss (-1 when
+# checkmated, -3 when mated in 2 plies) and ILLEGAL for placements that cannot occur.
+ILLEGAL = -128
+EXTENSION = ".tb"
+# Positions decoded at a time while generating, which bounds the generator's temporary arrays.
+CHUNK_SIZE = 1 << 20
+_UNKNOWN = np.iinfo(np.int16).max
+_PAWN, _KNIGHT, _BISHOP, _ROOK, _QUEEN, _KING = (PIECE_INDEX[piece_type] for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING))
+_LETTERS = {_PAWN: "P", _KNIGHT: "N", _BISHOP: "B", _ROOK: "R", _QUEEN: "Q", _KING: "K"}
+_PROMOTIONS = (_QUEEN, _ROOK, _BISHOP, _KNIGHT)
+# Flips a square between the two sides' points of view.
+_MIRROR = 0b111000
+
+# A piece is (color, piece index), white 0 and black 1.
+Piece = tuple[int, int]
+
+class ProbeResult(NamedTuple):
+    # 1 if the side to move wins, 0 for a draw, -1 if it loses.
+    wdl: int
+    # Plies to mate with best play by both sides, 0 for draws and checkmated positions.
+    dtm: int
+
+def _square_table(moves: dict) -> np.ndarray:
+    res = np.full((64, 8), -1, dtype=np.int16)
+    for sq in range(64):
+        targets = [rank * 8 + col for rank, col in moves[divmod(sq, 8)]]
+        res[sq, :len(targets)] = targets
+    return res
+
+def _ray_table(directions: list[tuple[int, int]]) -> np.ndarray:
+    # (direction, square, distance - 1) -> square, nearest first and -1 past the edge.
+    res = np.full((len(directions), 64, 7), -1, dtype=np.int16)
+    for i, direction in enumerate(directions):
+        for sq in range(64):
+            ray = [rank * 8 + col for rank, col in PIECE_RAYS[divmod(sq, 8)][direction]]
+            res[i, sq, :len(ray)] = ray
+    return res
+
+def _attack_table(targets: np.ndarray) -> np.ndarray:
+    res = np.zeros((64, 64), dtype=bool)
+    for sq in range(64):
+        res[sq, targets[sq][targets[sq] >= 0]] = True
+    return res
+
+_LEAPS = {_KNIGHT: _square_table(KNIGHT_MOVES), _KING: _square_table(KING_MOVES)}
+_SLIDES = {_BISHOP: _ray_table(BISHOP_DIRECTIONS), _ROOK: _ray_table(ROOK_DIRECTIONS),
+           _QUEEN: _ray_table(ROOK_DIRECTIONS + BISHOP_DIRECTIONS)}
+# [piece index][from, to]: the piece attacks to from from on an empty board.
+_ATTACKS = {piece: _attack_table(table) for piece, table in _LEAPS.items()}
+_ATTACKS.update({piece: _attack_table(table.transpose(1, 0, 2).reshape(64, -1)) for piece, table in _SLIDES.items()})
+_PAWN_ATTACKS = tuple(np.array([[abs(to % 8 - sq % 8) == 1 and to // 8 == sq // 8 + forward for to in range(64)] for sq in range(64)])
+                      for forward in (1, -1))
+_BETWEEN = np.array(BETWEEN, dtype=np.uint64)
+
+def parse_signature(signature: str) -> tuple[Piece, ...]:
+    """Pieces of a material signature such as "KQvK" (or "KQK"), white first and strongest first."""
+    text = signature.upper()
+    if "V" not in text:
+        second_king = text.find("K", 1)
+        text = text[:second_king] + "V" + text[second_king:] if second_king > 0 else text
+    sides = text.split("V")
+    letters = {letter: piece for piece, letter in _LETTERS.items()}
+    if len(sides) != 2 or any(side.count("K") != 1 or any(letter not in letters for letter in side) for side in sides):
+        raise ValueError(f"Invalid material signature {signature}.")
+    pieces = tuple((color, letters[letter]) for color, side in enumerate(sides) for letter in side)
+    if len(pieces) > MAX_PIECES:
+        raise ValueError(f"Tablebases have at most {MAX_PIECES} pieces, not {len(pieces)}.")
+    return tuple(sorted(pieces, key=lambda piece: (piece[0], -piece[1])))
+
+def signature_name(pieces: tuple[Piece, ...]) -> str:
+    return "v".join("".join(_LETTERS[piece] for c, piece in sorted(pieces, key=lambda p: -p[1]) if c == color) for color in (0, 1))
+
+def canonical(pieces: tuple[Piece, ...]) -> tuple[tuple[Piece, ...], bool]:
+    """Sorted pieces with the stronger side as white, and whether the colors had to be swapped for that.
+
+    Only one table is generated for a signature and its color swap (KQvK also answers KvKQ), looked
+    up with the board mirrored top to bottom.
+    """
+    strength = [sorted(((PIECE_VALUES[piece], piece) for c, piece in pieces if c == color and piece != _KING), reverse=True)
+                for color in (0, 1)]
+    flipped = strength[0] < strength[1]
+    res = tuple(sorted(((color ^ flipped, piece) for color, piece in pieces), key=lambda piece: (piece[0], -piece[1])))
+    return res, flipped
+
+class _Solver:
+    """Retrograde analysis of one table, given the finished tables its captures and promotions lead to.
+
+    Placements are processed as NumPy arrays of indices, a piece's square being bits 6i to 6i + 5 of
+    the index and the side to move the bit above them. Legality follows GameEvaluator without
+    castling (which never applies to these tables) or en passant (which only matters when both
+    sides have pawns, and is then ignored).
+    """
+    def __init__(self, pieces: tuple[Piece, ...], table) -> None:
+        self.pieces = pieces
+        # Table values of canonical pieces, which must already be solved.
+        self.table = table
+        self.size = 64 ** len(pieces)
+        self.colors = np.array([color for color, _ in pieces] + [-1])
+        self.types = np.array([piece for _, piece in pieces] + [0])
+        self.kings = [pieces.index((color, _KING)) for color in (0, 1)]
+        self.values = np.full(2 * self.size, _UNKNOWN, dtype=np.int16)
+
+    def decode(self, index: np.ndarray) -> list[np.ndarray]:
+        return [((index >> (6 * i)) & 63).astype(np.int16) for i in range(len(self.pieces))]
+
+    def chunks(self):
+        for side in (0, 1):
+            for start in range(0, self.size, CHUNK_SIZE):
+                yield side, side * self.size + np.arange(start, min(start + CHUNK_SIZE, self.size), dtype=np.int64)
+
+    def occupant(self, sq: list[np.ndarray], target: np.ndarray) -> np.ndarray:
+        # Piece on target, or -1 (which indexes the -1 sentinels of colors and types).
+        res = np.full(len(target), -1, dtype=np.int16)
+        for i, piece_sq in enumerate(sq):
+            res[piece_sq == target] = i
+        return res
+
+    def attacked(self, sq: list[np.ndarray], target: np.ndarray, color: int) -> np.ndarray:
+        res = np.zeros(len(target), dtype=bool)
+        for i, (piece_color, piece) in enumerate(self.pieces):
+            if piece_color != color:
+                continue
+            if piece == _PAWN:
+                hits = _PAWN_ATTACKS[color][sq[i], target]
+            else:
+                hits = _ATTACKS[piece][sq[i], target]
+            if piece in _SLIDES:
+                between = _BETWEEN[sq[i], target]
+                for j, other in enumerate(sq):
+                    if j != i:
+                        hits &= (between >> other.astype(np.uint64)) & np.uint64(1) == 0
+            res |= hits
+        return res
+
+    def mark_illegal(self) -> np.ndarray:
+        """Marks impossible placements ILLEGAL and returns which positions have the side to move in check."""
+        in_check = np.zeros(2 * self.size, dtype=bool)
+        for side, index in self.chunks():
+            sq = self.decode(index)
+            legal = np.ones(len(index), dtype=bool)
+            for i in range(len(sq)):
+                for j in range(i):
+                    legal &= sq[i] != sq[j]
+                if self.pieces[i][1] == _PAWN:
+                    legal &= (sq[i] >= 8) & (sq[i] < 56)
+            # The side that just moved cannot have left its king attacked.
+            legal &= ~self.attacked(sq, sq[self.kings[1 - side]], side)
+            self.values[index[~legal]] = ILLEGAL
+            in_check[index] = self.attacked(sq, sq[self.kings[side]], 1 - side)
+        return in_check
+
+    def targets(self, sq: list[np.ndarray], i: int):
+        """(target, valid, occupant, is pawn push) for every pseudo-legal destination of piece i."""
+        color, piece = self.pieces[i]
+        if piece in _LEAPS:
+            for j in range(8):
+                target = _LEAPS[piece][sq[i], j]
+                yield target, target >= 0, self.occupant(sq, target), False
+        elif piece in _SLIDES:
+            rays = _SLIDES[piece]
+            for direction in range(len(rays)):
+                open_ray = np.ones(len(sq[i]), dtype=bool)
+                for distance in range(7):
+                    target = rays[direction, sq[i], distance]
+                    valid = open_ray & (target >= 0)
+                    occupant = self.occupant(sq, target)
+                    yield target, valid, occupant, False
+                    open_ray = valid & (occupant < 0)
+        else:
+            forward = 8 if color == 0 else -8
+            start_rank = 1 if color == 0 else 6
+            target = sq[i] + forward
+            occupant = self.occupant(sq, target)
+            yield target, np.ones(len(target), dtype=bool), occupant, True
+            double = target + forward
+            valid = (sq[i] >> 3 == start_rank) & (occupant < 0)
+            yield double, valid, self.occupant(sq, np.where(valid, double, -1)), True
+            for step in (-1, 1):
+                col = (sq[i] & 7) + step
+                valid = (col >= 0) & (col < 8)
+                capture = np.where(valid, target + step, -1)
+                occupant = self.occupant(sq, capture)
+                yield capture, valid & (occupant >= 0), occupant, False
+
+    def moves(self, index: np.ndarray, side: int):
+        """(valid, table values, child indices) for every pseudo-legal move out of index.
+
+        Quiet moves lead to this table, where the child's ILLEGAL mark rejects those leaving the king
+        in check; captures and promotions lead to smaller tables.
+        """
+        sq = self.decode(index)
+        rest = index - side * self.size
+        no_promotion = np.zeros(len(index), dtype=bool)
+        captured = [k for k, (color, piece) in enumerate(self.pieces) if color != side and piece != _KING]
+        for i, (color, piece) in enumerate(self.pieces):
+            if color != side:
+                continue
+            for target, valid, occupant, push in self.targets(sq, i):
+                if push:
+                    valid = valid & (occupant < 0)
+                else:
+                    valid = valid & (self.colors[occupant] != side) & (self.types[occupant] != _KING)
+                quiet = valid & (occupant < 0)
+                promotion = target >> 3 == (7 if side == 0 else 0) if piece == _PAWN else no_promotion
+                child = (1 - side) * self.size + rest + ((target.astype(np.int64) - sq[i]) << np.int64(6 * i))
+                yield quiet & ~promotion, self.values, child
+                for k in captured:
+                    capture = valid & ~promotion & (occupant == k)
+                    if capture.any():
+                        yield (capture, *self.child(sq, side, i, target, k, piece))
+                if not promotion.any():
+                    continue
+                for promoted in _PROMOTIONS:
+                    yield (quiet & promotion, *self.child(sq, side, i, target, None, promoted))
+                    for k in captured:
+                        capture = valid & promotion & (occupant == k)
+                        if capture.any():
+                            yield (capture, *self.child(sq, side, i, target, k, promoted))
+
+    def child(self, sq: list[np.ndarray], side: int, i: int, target: np.ndarray, captured: int | None,
+              promoted: int) -> tuple[np.ndarray, np.ndarray]:
+        """Values and indices of the smaller table reached when piece i moves to target."""
+        moved = [(color, piece if j != i else promoted, sq[j] if j != i else target)
+                 for j, (color, piece) in enumerate(self.pieces) if j != captured]
+        pieces, flipped = canonical(tuple((color, piece) for color, piece, _ in moved))
+        if flipped:
+            moved = [(color ^ 1, piece, piece_sq ^ _MIRROR) for color, piece, piece_sq in moved]
+        moved.sort(key=lambda piece: (piece[0], -piece[1]))
+        child = np.full(len(target), ((1 - side) ^ flipped) * 64 ** len(pieces), dtype=np.int64)
+        for j, (_, _, piece_sq) in enumerate(moved):
+            child += piece_sq.astype(np.int64) << np.int64(6 * j)
+        return self.table(pieces), child
+
+    def predecessors(self, index: np.ndarray, side: int) -> np.ndarray:
+        """Positions of this table with a quiet move (no capture or promotion) to index, side to move in index."""
+        mover = 1 - side
+        res = []
+        for start in range(0, len(index), CHUNK_SIZE):
+            chunk = index[start:start + CHUNK_SIZE]
+            sq = self.decode(chunk)
+            base = chunk + (mover - side) * self.size
+            def empty(origin):
+                return (origin >= 0) & (self.occupant(sq, origin) < 0)
+            for i, (color, piece) in enumerate(self.pieces):
+                if color != mover:
+                    continue
+                origins = []
+                if piece in _LEAPS:
+                    for j in range(8):
+                        origin = _LEAPS[piece][sq[i], j]
+                        origins.append((origin, empty(origin)))
+                elif piece in _SLIDES:
+                    rays = _SLIDES[piece]
+                    for direction in range(len(rays)):
+                        open_ray = np.ones(len(chunk), dtype=bool)
+                        for distance in range(7):
+                            origin = rays[direction, sq[i], distance]
+                            open_ray = open_ray & empty(origin)
+                            origins.append((origin, open_ray))
+                else:
+                    back = -8 if color == 0 else 8
+                    rank = sq[i] >> 3
+                    # Pushes back to the first rank are ruled out by the predecessor's ILLEGAL mark.
+                    single = sq[i] + back
+                    single_ok = empty(single)
+                    origins.append((single, single_ok))
+                    double = single + back
+                    double_ok = single_ok & (rank == (3 if color == 0 else 4))
+                    origins.append((double, double_ok & empty(np.where(double_ok, double, -1))))
+                for origin, ok in origins:
+                    pred = base[ok] + ((origin[ok].astype(np.int64) - sq[i][ok]) << np.int64(6 * i))
+                    res.append(pred[self.values[pred] != ILLEGAL])
+        return np.concatenate(res) if res else np.empty(0, dtype=np.int64)
+
+    def solve(self) -> np.ndarray:
+        in_check = self.mark_illegal()
+        size = 2 * self.size
+        # Per position: legal moves within this table not yet known to lose, all legal moves, the
+        # fastest win and slowest loss through captures and promotions, and whether one of them draws.
+        remaining = np.zeros(size, dtype=np.uint8)
+        total = np.zeros(size, dtype=np.uint8)
+        exit_win = np.zeros(size, dtype=np.int16)
+        exit_loss = np.zeros(size, dtype=np.int16)
+        exit_draw = np.zeros(size, dtype=bool)
+        for side, index in self.chunks():
+            index = index[self.values[index] != ILLEGAL]
+            chunk_remaining = np.zeros(len(index), dtype=np.uint8)
+            chunk_total = np.zeros(len(index), dtype=np.uint8)
+            win = np.zeros(len(index), dtype=np.int16)
+            loss = np.zeros(len(index), dtype=np.int16)
+            draw = np.zeros(len(index), dtype=bool)
+            for valid, values, child in self.moves(index, side):
+                value = np.where(valid, values[np.where(valid, child, 0)], ILLEGAL).astype(np.int16)
+                legal = value != ILLEGAL
+                chunk_total += legal
+                if values is self.values:
+                    chunk_remaining += legal
+                    continue
+                # The child's value is from the opponent's point of view.
+                wins = legal & (value < 0)
+                win = np.where(wins & ((win == 0) | (-value < win)), -value, win)
+                loss = np.where(legal & (value > 0), np.maximum(loss, value + 1), loss)
+                draw |= legal & (value == 0)
+            remaining[index], total[index] = chunk_remaining, chunk_total
+            exit_win[index], exit_loss[index], exit_draw[index] = win, loss, draw
+
+        legal = self.values != ILLEGAL
+        self.values[legal & (total == 0) & ~in_check] = 0
+        buckets = defaultdict(list)
+        buckets[0].append(np.flatnonzero(legal & (total == 0) & in_check))
+        winning = np.flatnonzero(exit_win)
+        _schedule(buckets, winning, exit_win[winning])
+        forced = np.flatnonzero(legal & (total > 0) & (remaining == 0) & (exit_win == 0) & ~exit_draw)
+        _schedule(buckets, forced, exit_loss[forced])
+        while buckets:
+            ply = min(buckets)
+            decided = _unique(np.concatenate(buckets.pop(ply)))
+            decided = decided[self.values[decided] == _UNKNOWN]
+            if not len(decided):
+                continue
+            self.values[decided] = ply if ply % 2 else -ply - 1
+            preds = np.concatenate([self.predecessors(decided[(decided >= self.size) == bool(side)], side) for side in (0, 1)])
+            if ply % 2 == 0:
+                # Every predecessor of a lost position wins by moving into it.
+                buckets[ply + 1].append(preds)
+                continue
+            np.subtract.at(remaining, preds, 1)
+            preds = _unique(preds)
+            lost = preds[(remaining[preds] == 0) & (self.values[preds] == _UNKNOWN) & (exit_win[preds] == 0) & ~exit_draw[preds]]
+            _schedule(buckets, lost, np.maximum(exit_loss[lost], ply + 1))
+        self.values[self.values == _UNKNOWN] = 0
+        if np.abs(self.values[self.values != ILLEGAL]).max(initial=0) > 127:
+            raise ValueError(f"Mates in {signature_name(self.pieces)} are too long to store.")
+        return self.values.astype(np.int8)
+
+def _unique(index: np.ndarray) -> np.ndarray:
+    # Sorting is several times faster than np.unique's hashing on these large index arrays.
+    index = np.sort(index)
+    keep = np.ones(len(index), dtype=bool)
+    keep[1:] = index[1:] != index[:-1]
+    return index[keep]
+
+def _schedule(buckets: defaultdict, index: np.ndarray, plies: np.ndarray) -> None:
+    # Groups positions decided at a later ply by that ply.
+    for ply in np.unique(plies):
+        buckets[int(ply)].append(index[plies == ply])
+
+def table_path(directory: str, pieces: tuple[Piece, ...]) -> str:
+    return os.path.join(directory, signature_name(pieces) + EXTENSION)
+
+def generate(signature: str, directory: str, report=None) -> str:
+    """Solves the table of signature and every smaller table it depends on, writing each to directory.
+
+    Tables already in directory are reused rather than generated again. Returns the table's path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tables = {}
+
+    def table(pieces: tuple[Piece, ...]) -> np.ndarray:
+        if pieces not in tables:
+            path = table_path(directory, pieces)
+            if not os.path.exists(path):
+                start = time.perf_counter()
+                _Solver(pieces, table).solve().tofile(path)
+                if report is not None:
+                    report.write(f"{signature_name(pieces)}: {time.perf_counter() - start:.3f}s\n")
+            tables[pieces] = np.memmap(path, dtype=np.int8, mode="r")
+        return tables[pieces]
+
+    pieces, _ = canonical(parse_signature(signature))
+    table(pieces)
+    return table_path(directory, pieces)
+
+class Tablebases:
+    """Tables written by generate, opened the first time a position with their material is probed.
+
+    Opening a directory reads nothing, so process pools can create one per worker cheaply; a table is
+    memory-mapped on first use and its pages are shared with every other process mapping it.
+    """
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        # Canonical pieces -> memory-mapped table, or None if there is no file for it.
+        self.tables: dict[tuple[Piece, ...], np.memmap | None] = {}
+
+    def table(self, pieces: tuple[Piece, ...]) -> np.memmap | None:
+        if pieces not in self.tables:
+            path = table_path(self.directory, pieces)
+            self.tables[pieces] = np.memmap(path, dtype=np.int8, mode="r") if os.path.exists(path) else None
+        return self.tables[pieces]
+
+    def index(self, board: Board) -> tuple[tuple[Piece, ...], int] | None:
+        """Canonical pieces and table index of board, or None if no table can hold it."""
+        counts = board.evaluation.counts
+        if sum(counts[0]) + sum(counts[1]) > MAX_PIECES or board.castling_rights() or board.can_capture_en_passant():
+            return None
+        masks = board.bitboards().pieces
+        pieces = tuple((color, piece) for color in (0, 1) for piece in range(_KING, 0, -1) for _ in range(counts[color][piece]))
+        pieces, flipped = canonical(pieces)
+        placed = {}
+        index = 0
+        for i, (color, piece) in enumerate(pieces):
+            key = (color ^ flipped, piece)
+            if key not in placed:
+                placed[key] = squares(masks[key[0]][piece])
+            sq = placed[key].pop()
+            index |= (sq ^ _MIRROR if flipped else sq) << 6 * i
+        side = int(board.current_player) ^ flipped
+        return pieces, side * 64 ** len(pieces) + index
+
+    def probe(self, board: Board) -> ProbeResult | None:
+        """Result of board with best play, or None if it has castling rights, a capturable en passant
+        square, too many pieces or no table. The fifty-move rule is not taken into account."""
+        located = self.index(board)
+        if located is None:
+            return None
+        table = self.table(located[0])
+        if table is None:
+            return None
+        value = int(table[located[1]])
+        if value == ILLEGAL:
+            return None
+        if value > 0:
+            return ProbeResult(1, value)
+        return ProbeResult(-1, -value - 1) if value < 0 else ProbeResult(0, 0)
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate or probe endgame tablebases.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("generate", help="Solve the tables of material signatures.")
+    build.add_argument("directory", type=str, help="Tablebase directory.")
+    build.add_argument("signatures", type=str, nargs="+", help="Material signatures such as KQvK or KBNvK.")
+    probe = subparsers.add_parser("probe", help="Look up a position.")
+    probe.add_argument("directory", type=str, help="Tablebase directory.")
+    probe.add_argument("-f", "--fen", type=str, default=START_FEN, help="FEN string to look up.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    import sys
+    args = parse_args()
+    if args.command == "generate":
+        for signature in args.signatures:
+            start = time.perf_counter()
+            path = generate(signature, args.directory, sys.stderr)
+            print(f"{path} in {time.perf_counter() - start:.3f}s")
+    else:
+        result = Tablebases(args.directory).probe(Board(args.fen))
+        if result is None:
+            print("Not in the tablebases.")
+        elif result.wdl:
+            print(f"{'Win' if result.wdl > 0 else 'Loss'}, mate in {result.dtm} plies")
+        else:
+            print("Draw")
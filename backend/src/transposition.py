@@ -0,0 +1,121 @@
+import numpy as np
+
+from pieces import PROMOTIONS
+
+Move = tuple[tuple[int, int], tuple[int, int] | tuple[int, int, str]]
+
+# Bound types; 0 marks an empty slot.
+EMPTY_SLOT, EXACT, LOWER, UPPER = 0, 1, 2, 3
+
+ENTRY = np.dtype([("key", np.uint64), ("score", np.int32), ("move", np.uint16),
+                  ("depth", np.int8), ("bound", np.uint8), ("age", np.uint8)])
+# Each bucket holds a depth-preferred slot followed by an always-replace slot.
+BUCKET_SLOTS = 2
+DEFAULT_SIZE_MB = 16
+
+def encode_move(move: Move) -> int:
+    """Packs a move into 16 bits: start square, end square and promotion piece (0 for none). 0 means no move."""
+    if move is None:
+        return 0
+    start_pos, end_pos = move
+    promotion = PROMOTIONS.index(end_pos[2]) + 1 if len(end_pos) == 3 else 0
+    return (start_pos[0] * 8 + start_pos[1]) | (end_pos[0] * 8 + end_pos[1]) << 6 | promotion << 12
+
+def decode_move(code: int) -> Move:
+    if not code:
+        return None
+    start, end, promotion = code & 0x3F, (code >> 6) & 0x3F, code >> 12
+    end_pos = divmod(end, 8) + (PROMOTIONS[promotion - 1],) if promotion else divmod(end, 8)
+    return divmod(start, 8), end_pos
+
+def bucket_count(size_mb: float) -> int:
+    return max(1, int(size_mb * 1024 * 1024) // (ENTRY.itemsize * BUCKET_SLOTS))
+
+def table_bytes(size_mb: float) -> int:
+    """Bytes used by the entries of a table of size_mb."""
+    return bucket_count(size_mb) * BUCKET_SLOTS * ENTRY.itemsize
+
+class TranspositionTable:
+    """Fixed-size table of search results keyed on Board.hash, preallocated as a NumPy structured array.
+
+    The table never grows: size_mb is rounded down to whole buckets. Within a bucket a store
+    replaces the first slot only if it is at least as deep or left over from an earlier search, and
+    otherwise goes to the second slot, which is always replaced.
+
+    Pass buffer (at least table_bytes(size_mb) bytes, e.g. a multiprocessing.shared_memory block) to
+    keep the entries there instead, so several processes can share one table. Stores are not locked:
+    concurrent writers can mix fields from two entries, which costs at most a misleading bound at one
+    node, and table moves are only played if they are in the generated move list.
+    """
+    def __init__(self, size_mb: float = DEFAULT_SIZE_MB, buffer=None) -> None:
+        self.buckets = bucket_count(size_mb)
+        if buffer is None:
+            self.entries = np.zeros(self.buckets * BUCKET_SLOTS, dtype=ENTRY)
+        else:
+            self.entries = np.ndarray(self.buckets * BUCKET_SLOTS, dtype=ENTRY, buffer=buffer)
+        # Field views, so probes and stores index plain arrays instead of building np.void records.
+        self.keys = self.entries["key"]
+        self.scores = self.entries["score"]
+        self.moves = self.entries["move"]
+        self.depths = self.entries["depth"]
+        self.bounds = self.entries["bound"]
+        self.ages = self.entries["age"]
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self.entries.nbytes
+
+    def clear(self) -> None:
+        self.entries.fill(0)
+        self.age = 0
+        self.probes = self.hits = self.stores = 0
+
+    def new_search(self) -> None:
+        # Entries from earlier searches stay probeable but lose their claim on the depth-preferred slot.
+        self.age = (self.age + 1) & 0xFF
+
+    def slot(self, key: int) -> int:
+        return (key % self.buckets) * BUCKET_SLOTS
+
+    def probe(self, key: int) -> tuple[int, int, int, Move] | None:
+        """(depth, bound, score, best move) stored for key, or None."""
+        self.probes += 1
+        index = self.slot(key)
+        for i in range(index, index + BUCKET_SLOTS):
+            if self.bounds[i] and self.keys[i] == key:
+                self.hits += 1
+                return int(self.depths[i]), int(self.bounds[i]), int(self.scores[i]), decode_move(int(self.moves[i]))
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: Move) -> None:
+        self.stores += 1
+        index = self.slot(key)
+        if self.bounds[index] and self.keys[index] != key and \
+           self.ages[index] == self.age and self.depths[index] > depth:
+            index += 1
+        if not move and self.bounds[index] and self.keys[index] == key:
+            # Keep the best move from an earlier search of the same position.
+            move = decode_move(int(self.moves[index]))
+        self.keys[index] = key
+        self.depths[index] = depth
+        self.bounds[index] = bound
+        self.scores[index] = score
+        self.moves[index] = encode_move(move)
+        self.ages[index] = self.age
+
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def occupancy(self) -> float:
+        return np.count_nonzero(self.bounds) / len(self.entries)
+
+    def stats(self) -> dict[str, any]:
+        return {"size_mb": self.size_bytes / (1024 * 1024), "entries": len(self.entries), "probes": self.probes,
+                "hits": self.hits, "hit_rate": self.hit_rate(), "stores": self.stores, "occupancy": self.occupancy()}
@@ -0,0 +1,195 @@
+import argparse
+import sys
+import threading
+from typing import TextIO
+
+from board import Board, BACKENDS
+from movegen import legal_moves
+from perft import START_FEN, move_to_str
+from piece_info import WHITE
+from polyglot import OpeningBook
+from search import Search, SearchResult, MATE_SCORE, MAX_PLY, is_mate_score
+from tablebase import Tablebases
+from transposition import TranspositionTable, DEFAULT_SIZE_MB
+
+NAME = "chess backend"
+# Share of the remaining clock spent on a move when the GUI does not say how many moves are left.
+DEFAULT_MOVES_TO_GO = 30
+# Kept back from every time budget for the GUI and the last iteration to wind down.
+MOVE_OVERHEAD_MS = 50
+MIN_MOVE_TIME_MS = 10
+
+def time_for_move(remaining_ms: int, increment_ms: int = 0, moves_to_go: int = None) -> float:
+    """Seconds to spend on a move with remaining_ms left on the clock."""
+    budget = remaining_ms / (moves_to_go or DEFAULT_MOVES_TO_GO) + increment_ms * 3 / 4
+    budget = min(budget, remaining_ms - MOVE_OVERHEAD_MS)
+    return max(budget, MIN_MOVE_TIME_MS) / 1000
+
+def format_score(score: int) -> str:
+    if is_mate_score(score):
+        plies = MATE_SCORE - abs(score)
+        return f"mate {(plies + 1) // 2 if score > 0 else -(plies // 2)}"
+    return f"cp {score}"
+
+class UciEngine:
+    """Universal Chess Interface front end to Search.
+
+    Commands are handled on the calling thread while searches run on a worker thread, so stop and
+    isready are answered at once however long a search takes. The worker prints bestmove when its
+    search ends; go infinite holds it back until stop, as the protocol requires.
+    """
+    def __init__(self, output: TextIO = sys.stdout, backend: str = "array") -> None:
+        self.output = output
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.board = Board(START_FEN, backend)
+        self.size_mb = DEFAULT_SIZE_MB
+        self.table: TranspositionTable = None
+        self.tablebases: Tablebases = None
+        self.book: OpeningBook = None
+        self.stop = threading.Event()
+        self.worker: threading.Thread = None
+
+    def send(self, line: str) -> None:
+        # The worker and the command loop both write, so whole lines go out under the lock.
+        with self.lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, lines: TextIO = sys.stdin) -> None:
+        for line in lines:
+            if not self.handle(line):
+                break
+        self.stop_search()
+
+    def handle(self, line: str) -> bool:
+        """Handles one command. Returns False on quit."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {NAME}")
+            self.send(f"option name Hash type spin default {DEFAULT_SIZE_MB} min 1 max 4096")
+            self.send("option name TablebasePath type string default <empty>")
+            self.send("option name BookFile type string default <empty>")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "ucinewgame":
+            self.stop_search()
+            self.table = None
+        elif command == "position":
+            self.stop_search()
+            self.set_position(args)
+        elif command == "go":
+            self.stop_search()
+            self.go(args)
+        elif command == "stop":
+            self.stop_search()
+        elif command == "quit":
+            return False
+        else:
+            self.send(f"info string Unknown command {command}")
+        return True
+
+    def set_option(self, args: list[str]) -> None:
+        text = " ".join(args)
+        name, _, value = text.partition(" value ")
+        name = name.removeprefix("name ").strip().lower()
+        value = value.strip()
+        # Values are typed by the user in the GUI, so a bad one is reported rather than ending the engine.
+        try:
+            if name == "hash":
+                size_mb = float(value)
+                if not size_mb > 0:
+                    raise ValueError("Hash must be a positive number of megabytes.")
+                self.stop_search()
+                self.size_mb = size_mb
+                self.table = None
+            elif name == "tablebasepath":
+                self.tablebases = Tablebases(value) if value and value != "<empty>" else None
+            elif name == "bookfile":
+                self.book = OpeningBook(value) if value and value != "<empty>" else None
+            else:
+                self.send(f"info string Unknown option {name}")
+        except (ValueError, OSError) as e:
+            self.send(f"info string Invalid value {value} for option {name}: {e}")
+
+    def set_position(self, args: list[str]) -> None:
+        if "moves" in args:
+            split = args.index("moves")
+            args, moves = args[:split], args[split + 1:]
+        else:
+            moves = []
+        fen = START_FEN if not args or args[0] == "startpos" else " ".join(args[1:])
+        # Board(fen) prints a load error and falls back to the start position, so load the FEN separately.
+        board = Board(backend=self.backend)
+        try:
+            board.load_fen(fen)
+        except (ValueError, KeyError, IndexError) as e:
+            self.send(f"info string Invalid position {fen}: {e}")
+            return
+        for text in moves:
+            move = next((move for move in legal_moves(board) if move_to_str(move) == text.lower()), None)
+            if move is None:
+                self.send(f"info string Illegal move {text}")
+                break
+            board.move(*move)
+        self.board = board
+
+    def go(self, args: list[str]) -> None:
+        params = {}
+        for name, value in zip(args, args[1:] + [""]):
+            if value.lstrip("-").isdigit():
+                params[name] = int(value)
+        infinite = "infinite" in args
+        time_limit = None
+        if "movetime" in params:
+            time_limit = params["movetime"] / 1000
+        elif not infinite:
+            side = "w" if self.board.current_player == WHITE else "b"
+            if f"{side}time" in params:
+                time_limit = time_for_move(params[f"{side}time"], params.get(f"{side}inc", 0), params.get("movestogo"))
+        if self.book is not None and not infinite:
+            move = self.book.choose(self.board)
+            if move is not None:
+                self.send(f"bestmove {move_to_str(move)}")
+                return
+        if self.table is None:
+            self.table = TranspositionTable(self.size_mb)
+        self.stop.clear()
+        search = Search(self.board, params.get("depth", MAX_PLY), params.get("nodes"), time_limit, self.table,
+                        stop=self.stop, tablebases=self.tablebases, report=self.report)
+        self.worker = threading.Thread(target=self.search, args=(search, infinite), daemon=True)
+        self.worker.start()
+
+    def search(self, search: Search, infinite: bool) -> None:
+        result = search.search()
+        if infinite:
+            self.stop.wait()
+        self.send(f"bestmove {move_to_str(result.move) if result.move else '0000'}")
+
+    def report(self, result: SearchResult) -> None:
+        nps = int(result.nodes / result.time) if result.time else 0
+        self.send(f"info depth {result.depth} score {format_score(result.score)} nodes {result.nodes} nps {nps} "
+                  f"time {int(result.time * 1000)} pv {' '.join(move_to_str(move) for move in result.pv)}")
+
+    def stop_search(self) -> None:
+        """Stops the running search, if any, and waits for its bestmove."""
+        if self.worker is None:
+            return
+        self.stop.set()
+        self.worker.join()
+        self.worker = None
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the engine over the Universal Chess Interface on stdin and stdout.")
+    parser.add_argument("-b", "--backend", type=str, default="array", choices=BACKENDS, help="Board storage backend.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    UciEngine(backend=args.backend).run()
@@ -0,0 +1,43 @@
+import random
+
+from piece_info import PIECE_INDEX, PIECE_TYPES, EMPTY, BLACK, board_to_coord
+from pieces import ChessPiece
+
+# Fixed seed so keys (and anything persisted with them) are stable across runs.
+_random = random.Random(0x2B992DDFA23249D6)
+
+# PIECE_KEYS[color][piece type index][square], square = rank * 8 + column.
+PIECE_KEYS: list[list[list[int]]] = [[[_random.getrandbits(64) for _ in range(64)] for _ in PIECE_TYPES] for _ in range(2)]
+SIDE_KEY: int = _random.getrandbits(64)
+_CASTLING_FLAG_KEYS = [_random.getrandbits(64) for _ in range(4)]
+# Indexed by the KQkq castling rights bitmask.
+CASTLING_KEYS: list[int] = [0] * 16
+for _rights in range(16):
+    for _flag in range(4):
+        if _rights & (1 << _flag):
+            CASTLING_KEYS[_rights] ^= _CASTLING_FLAG_KEYS[_flag]
+EN_PASSANT_KEYS: list[int] = [_random.getrandbits(64) for _ in range(8)]
+
+def piece_key(piece: ChessPiece, position: tuple[int, int]) -> int:
+    if piece is EMPTY or piece.type == EMPTY:
+        return 0
+    return PIECE_KEYS[int(piece.color)][PIECE_INDEX[piece.type]][position[0] * 8 + position[1]]
+
+def en_passant_key(en_passant_square: str) -> int:
+    if en_passant_square == "-":
+        return 0
+    return EN_PASSANT_KEYS[board_to_coord(en_passant_square)[1]]
+
+def hash_board(board) -> int:
+    """Computes the key of a Board from scratch; Board.move keeps it up to date incrementally.
+
+    The en passant file only counts when a pawn of the side to move could capture on it, so positions
+    that differ only by an unusable en passant square share a key and count as repetitions.
+    """
+    key = 0
+    for i in range(8):
+        for j in range(8):
+            key ^= piece_key(board[i][j], (i, j))
+    if board.current_player == BLACK:
+        key ^= SIDE_KEY
+    return key ^ CASTLING_KEYS[board.castling_rights()] ^ board.en_passant_hash()
@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from batch import encode_fens, encode_compact, evaluate, evaluate_fens
+from board import Board
+from movegen import legal_moves
+from perft import START_FEN
+from piece_info import PIECE_INDEX, KING, ROOK, BLACK_BIT
+
+def random_fens(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    fens = []
+    for _ in range(count):
+        board = Board()
+        for _ in range(rng.randrange(1, 100)):
+            moves = legal_moves(board)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        fens.append(board.to_fen())
+    return fens
+
+class TestBatch(unittest.TestCase):
+    def test_encode_fens(self):
+        # Act
+        codes, sides = encode_fens([START_FEN, "4k3/8/8/8/8/8/8/R3K3 b Q - 0 1"])
+
+        # Assert
+        self.assertEqual(codes.shape, (2, 64))
+        self.assertEqual(codes.dtype, np.int8)
+        self.assertEqual(list(sides), [0, 1])
+        self.assertEqual(codes[0, 3], PIECE_INDEX[KING])
+        self.assertEqual(codes[0, 59], PIECE_INDEX[KING] | BLACK_BIT)
+        self.assertEqual(codes[1, 7], PIECE_INDEX[ROOK])
+        self.assertEqual(np.count_nonzero(codes[1]), 3)
+
+    def test_invalid_fen(self):
+        # Assert
+        with self.assertRaises(ValueError):
+            encode_fens(["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1"])
+        with self.assertRaises(ValueError):
+            encode_fens(["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKXNR w KQkq - 0 1"])
+        with self.assertRaises(ValueError):
+            encode_fens(["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR"])
+
+    def test_matches_incremental_evaluation(self):
+        # Arrange
+        fens = random_fens(40)
+        boards = [Board(fen) for fen in fens]
+
+        # Act
+        scores = evaluate_fens(fens, chunk_size=7)
+
+        # Assert
+        self.assertEqual(list(scores), [board.evaluation.score(board.current_player) for board in boards])
+
+    def test_compact_positions(self):
+        # Arrange
+        fens = random_fens(10, 1)
+        codes, _ = encode_fens(fens)
+
+        # Act
+        compact = encode_compact([Board(fen, "compact").board for fen in fens])
+
+        # Assert
+        np.testing.assert_array_equal(compact, codes)
+        self.assertEqual(list(evaluate(compact)), [Board(fen).evaluation.score(0) for fen in fens])
+
+if __name__ == '__main__':
+    unittest.main()
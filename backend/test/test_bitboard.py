@@ -0,0 +1,134 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from piece_info import WHITE, BLACK, KING, PAWN, QUEEN, ROOK
+from pieces import Empty, Rook, King, Knight, Pawn, Queen
+from board import Board
+from bitboard import Bitboards, KNIGHT_ATTACKS, square, squares, rook_attacks, bishop_attacks
+from evaluator import GameEvaluator
+
+class TestBitboard(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.board = Board(backend="bitboard")
+
+    def test_bitboards_set_and_get(self):
+        # Arrange
+        bitboards = Bitboards()
+
+        # Act
+        bitboards[(3, 4)] = Knight(BLACK)
+        bitboards[0][3] = King(WHITE, True)
+
+        # Assert
+        self.assertEqual(bitboards[3][4], Knight(BLACK))
+        self.assertEqual(bitboards[(0, 3)], King(WHITE, True))
+        self.assertEqual(bitboards[(4, 4)], Empty())
+        self.assertEqual(bitboards.pieces_of(KING, WHITE), 1 << square((0, 3)))
+        self.assertEqual(bitboards.occupancy, (1 << square((3, 4))) | (1 << square((0, 3))))
+
+    def test_bitboards_overwrite(self):
+        # Arrange
+        bitboards = Bitboards()
+        bitboards[(0, 0)] = Rook(WHITE, True)
+
+        # Act
+        bitboards[(0, 0)] = Queen(BLACK)
+
+        # Assert
+        self.assertEqual(bitboards[(0, 0)], Queen(BLACK))
+        self.assertEqual(bitboards.pieces_of(ROOK, WHITE), 0)
+        self.assertEqual(bitboards.occupied[0], 0)
+        self.assertEqual(bitboards.castling, 0)
+
+    def test_attack_tables(self):
+        # Assert
+        self.assertEqual(sorted(squares(KNIGHT_ATTACKS[square((0, 0))])), [square((1, 2)), square((2, 1))])
+        self.assertEqual(len(squares(rook_attacks(square((0, 0)), 0))), 14)
+        self.assertEqual(squares(rook_attacks(square((0, 0)), 1 << square((0, 1)))), [square(p) for p in [(0, 1), (1, 0), (2, 0), (3, 0), (4, 0), (5, 0), (6, 0), (7, 0)]])
+        self.assertEqual(len(squares(bishop_attacks(square((3, 3)), 0))), 13)
+
+    def test_attackers_to(self):
+        # Arrange
+        self.board.load_fen("r1bqkbnr/pppppppp/8/8/3nP3/8/PPPPKPPP/RNBQ1BNR w kq - 3 3")
+
+        # Act
+        attackers = self.board.board.attackers_to(square(self.board.find_piece(KING)), BLACK)
+
+        # Assert
+        self.assertEqual(squares(attackers), [square((3, 4))])
+
+    def test_load_fen_to_fen(self):
+        # Arrange
+        fen = "2rqk2r/1pb1p1pp/2p1Pn2/2Pp1p2/pPnP4/2N2NP1/P1b2PBP/R1BQK1R1 b Qk b3 0 1"
+
+        # Act
+        self.board.load_fen(fen)
+
+        # Assert
+        self.assertEqual(self.board.to_fen(), fen)
+        self.assertEqual(self.board.to_fen(), Board(fen).to_fen())
+
+    def test_find_pieces(self):
+        # Act
+        pos = self.board.find_piece(KING, BLACK)
+        pawns = self.board.find_pieces(PAWN, WHITE)
+
+        # Assert
+        self.assertEqual(pos, (7, 3))
+        self.assertEqual(pawns, [(1, i) for i in range(8)])
+
+    def test_move_castling(self):
+        # Arrange
+        self.board.load_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+
+        # Act
+        self.board.move((0, 3), (0, 1))
+
+        # Assert
+        self.assertEqual(self.board[0][1], King(WHITE))
+        self.assertEqual(self.board[0][2], Rook(WHITE))
+        self.assertEqual(self.board[0][0], Empty())
+        self.assertEqual(self.board.to_fen(), "r3k2r/8/8/8/8/8/8/R4RK1 b kq - 1 2")
+
+    def test_move_en_passant(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1")
+
+        # Act
+        self.board.move((1, 3), (3, 3))
+        self.board.move((3, 4), (2, 3))
+
+        # Assert
+        self.assertEqual(self.board[3][3], Empty())
+        self.assertEqual(self.board[2][3], Pawn(BLACK))
+
+    def test_move_promotion(self):
+        # Arrange
+        self.board.load_fen("4k3/P7/8/8/8/8/8/4K3 w - - 0 1")
+
+        # Act
+        self.board.move((6, 7), (7, 7, "q"))
+
+        # Assert
+        self.assertEqual(self.board[7][7], Queen(WHITE))
+        self.assertEqual(self.board.find_piece(QUEEN, WHITE), (7, 7))
+
+    def test_evaluator_matches_array_backend(self):
+        # Arrange
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        self.board.load_fen(fen)
+
+        # Act
+        res = GameEvaluator(self.board).all_valid_moves()
+
+        # Assert
+        self.assertEqual(res, GameEvaluator(Board(fen)).all_valid_moves())
+
+    def test_unknown_backend(self):
+        # Assert
+        with self.assertRaises(ValueError):
+            Board(backend="unknown")
@@ -8,6 +8,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'
 from piece_info import WHITE, BLACK, KING, PAWN, coord_to_board
 from pieces import Empty, Rook, Bishop, Queen, King, Knight, Pawn
 from board import Board
+from zobrist import hash_board
 
 class TestBoard(unittest.TestCase):
     def __init__(self, *args, **kwargs):
@@ -272,3 +273,133 @@ class TestBoard(unittest.TestCase):
 
         # Assert
         self.assertTrue(pos, [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (1, 6), (1, 7)])
+
+    def test_hash_incremental(self):
+        # Arrange
+        self.board.load_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+
+        # Act
+        self.board.move((4, 3), (6, 2))
+        self.board.move((6, 0), (5, 0))
+        self.board.move((0, 3), (0, 5))
+        self.board.move((6, 6), (4, 6))
+        self.board.move((4, 4), (5, 5))
+
+        # Assert
+        self.assertEqual(self.board.hash, hash_board(self.board))
+        self.assertEqual(self.board.hash, Board(self.board.to_fen()).hash)
+
+    def test_hash_transposition(self):
+        # Arrange
+        other = Board()
+
+        # Act
+        self.board.move((0, 1), (2, 2))
+        self.board.move((7, 1), (5, 2))
+        self.board.move((0, 6), (2, 5))
+        other.move((0, 6), (2, 5))
+        other.move((7, 1), (5, 2))
+        other.move((0, 1), (2, 2))
+
+        # Assert
+        self.assertEqual(self.board.hash, other.hash)
+        self.assertNotEqual(self.board.hash, Board().hash)
+
+    def test_hash_en_passant_only_when_capturable(self):
+        # Arrange
+        other = Board()
+        capturable = Board("4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1")
+
+        # Act
+        for move in [((1, 3), (3, 3)), ((6, 3), (4, 3)), ((0, 1), (2, 2))]:
+            self.board.move(*move)
+        for move in [((0, 1), (2, 2)), ((6, 3), (4, 3)), ((1, 3), (3, 3))]:
+            other.move(*move)
+        capturable.move((1, 3), (3, 3))
+
+        # Assert
+        self.assertEqual(other.en_passant_square, "e3")
+        self.assertEqual(self.board.hash, other.hash)
+        self.assertEqual(other.hash, hash_board(other))
+        self.assertEqual(capturable.hash, hash_board(capturable))
+        self.assertNotEqual(capturable.hash, Board("4k3/8/8/8/3pP3/8/8/4K3 b - - 0 1").hash)
+
+    def test_hash_side_to_move(self):
+        # Assert
+        self.assertNotEqual(Board("4k3/8/8/8/8/8/8/4K3 w - - 0 1").hash, Board("4k3/8/8/8/8/8/8/4K3 b - - 0 1").hash)
+        self.assertNotEqual(Board("4k3/8/8/8/8/8/8/R3K3 w Q - 0 1").hash, Board("4k3/8/8/8/8/8/8/R3K3 w - - 0 1").hash)
+
+    def test_fen_counter_reset(self):
+        # Act
+        self.board.move((0, 1), (2, 2))
+        self.board.move((6, 3), (4, 3))
+
+        # Assert
+        self.assertEqual(self.board.fen_counter, {self.board.hash: 1})
+
+    def test_push_pop_castling(self):
+        # Arrange
+        fen = "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1"
+        self.board.load_fen(fen)
+        key = self.board.hash
+
+        # Act
+        self.board.push(((0, 3), (0, 5)))
+        self.board.push(((7, 3), (7, 1)))
+        self.board.pop()
+        move = self.board.pop()
+
+        # Assert
+        self.assertEqual(move, ((0, 3), (0, 5)))
+        self.assertEqual(self.board.to_fen(), fen)
+        self.assertEqual(self.board.hash, key)
+        self.assertEqual(self.board.history, [])
+        self.assertEqual(self.board.fen_counter, {key: 1})
+
+    def test_push_pop_en_passant(self):
+        # Arrange
+        fen = "4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1"
+        self.board.load_fen(fen)
+
+        # Act
+        self.board.push(((1, 3), (3, 3)))
+        after_push = self.board.to_fen()
+        self.board.push(((3, 4), (2, 3)))
+        self.board.pop()
+
+        # Assert
+        self.assertEqual(self.board.to_fen(), after_push)
+        self.assertEqual(self.board[3][3], Pawn(WHITE))
+        self.board.pop()
+        self.assertEqual(self.board.to_fen(), fen)
+
+    def test_push_pop_promotion_capture(self):
+        # Arrange
+        fen = "1r2k3/P7/8/8/8/8/8/4K3 w - - 3 10"
+        self.board.load_fen(fen)
+
+        # Act
+        self.board.push(((6, 7), (7, 6, "n")))
+        promoted = self.board[7][6]
+        self.board.pop()
+
+        # Assert
+        self.assertEqual(promoted, Knight(WHITE))
+        self.assertEqual(self.board.to_fen(), fen)
+        self.assertEqual(self.board[7][6], Rook(BLACK))
+
+    def test_push_pop_bitboard_backend(self):
+        # Arrange
+        board = Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", backend="bitboard")
+        fen = board.to_fen()
+        moves = [((0, 3), (0, 1)), ((7, 3), (7, 5)), ((4, 3), (6, 2)), ((3, 6), (2, 6))]
+
+        # Act
+        for move in moves:
+            board.push(move)
+        for _ in moves:
+            board.pop()
+
+        # Assert
+        self.assertEqual(board.to_fen(), fen)
+        self.assertEqual(board.hash, hash_board(board))
\ No newline at end of file
@@ -0,0 +1,48 @@
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from classify import classify, classify_stream, to_fen
+from perft import START_FEN
+
+class TestClassify(unittest.TestCase):
+    def test_to_fen(self):
+        # Assert
+        self.assertEqual(to_fen(START_FEN + "\n"), START_FEN)
+        self.assertEqual(to_fen("4k3/8/8/8/8/8/8/4K3 w - - bm Kd2; hmvc 7; fmvn 30;"), "4k3/8/8/8/8/8/8/4K3 w - - 7 30")
+        self.assertEqual(to_fen("4k3/8/8/8/8/8/8/4K3 b - -"), "4k3/8/8/8/8/8/8/4K3 b - - 0 1")
+
+    def test_classify(self):
+        # Arrange
+        board = Board()
+
+        # Assert
+        self.assertEqual(classify(board, START_FEN)["legal_moves"], 20)
+        self.assertEqual(classify(board, "k7/1Q6/1K6/8/8/8/8/8 b - - 0 1")["state"], "checkmate")
+        self.assertEqual(classify(board, "k7/2Q5/1K6/8/8/8/8/8 b - - 0 1")["state"], "stalemate")
+        self.assertEqual(classify(board, "4k3/8/8/8/8/8/8/4K2R w K - 99 80")["state"], "ongoing")
+        self.assertEqual(classify(board, "4k3/8/8/8/8/8/8/4K2R w K - 100 80")["state"], "fifty_move_rule")
+        self.assertTrue(classify(board, "4k3/8/8/8/8/8/4r3/4K3 w - - 0 1")["in_check"])
+        self.assertIn("error", classify(board, "not a fen"))
+
+    def test_stream_keeps_order(self):
+        # Arrange
+        fens = [START_FEN, "k7/1Q6/1K6/8/8/8/8/8 b - - 0 1", "", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"] * 5
+        output = io.StringIO()
+
+        # Act
+        count = classify_stream((fen + "\n" for fen in fens), output, workers=2, chunk_size=2)
+
+        # Assert
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(count, 15)
+        self.assertEqual([record["line"] for record in records], [i + 1 for i, fen in enumerate(fens) if fen])
+        self.assertEqual([record["legal_moves"] for record in records], [20, 0, 48] * 5)
+
+if __name__ == '__main__':
+    unittest.main()
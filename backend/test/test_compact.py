@@ -0,0 +1,107 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from piece_info import WHITE, BLACK, KING, PAWN, ROOK, PIECE_INDEX, encode_piece, code_type, code_color, code_can_castle, code_is
+from pieces import Empty, Rook, King, Knight, Pawn, Queen, piece_from_code
+from board import Board
+from compact import CompactBoard
+from evaluator import GameEvaluator
+
+class TestCompact(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.board = Board(backend="compact")
+
+    def test_piece_codes(self):
+        # Act
+        code = encode_piece(1, PIECE_INDEX[ROOK], True)
+
+        # Assert
+        self.assertEqual(encode_piece(0, 0), 0)
+        self.assertEqual(code_type(code), PIECE_INDEX[ROOK])
+        self.assertEqual(code_color(code), 1)
+        self.assertEqual(code_color(0), -1)
+        self.assertTrue(code_can_castle(code))
+        self.assertTrue(code_is(code, PIECE_INDEX[ROOK], 1))
+        self.assertFalse(code_is(code, PIECE_INDEX[ROOK], 0))
+
+    def test_piece_code_round_trip(self):
+        # Arrange
+        pieces = [Empty(), Pawn(WHITE), Knight(BLACK), Queen(WHITE), Rook(BLACK, True), Rook(WHITE), King(BLACK, True)]
+
+        # Assert
+        for piece in pieces:
+            self.assertEqual(piece_from_code(piece.code), piece)
+            self.assertEqual(piece_from_code(piece.code).can_castle, piece.can_castle)
+
+    def test_pieces_have_no_dict(self):
+        # Assert
+        self.assertFalse(hasattr(King(WHITE), "__dict__"))
+        self.assertFalse(hasattr(Empty(), "__dict__"))
+
+    def test_compact_set_and_get(self):
+        # Arrange
+        compact = CompactBoard()
+
+        # Act
+        compact[(3, 4)] = Knight(BLACK)
+        compact[0][3] = King(WHITE, True)
+        compact[(0, 0)] = Rook(WHITE, True)
+        compact[(0, 0)] = Empty()
+
+        # Assert
+        self.assertEqual(len(compact.squares), 64)
+        self.assertEqual(compact[3][4], Knight(BLACK))
+        self.assertEqual(compact[(0, 3)], King(WHITE, True))
+        self.assertEqual(compact[(0, 0)], Empty())
+        self.assertEqual(compact.find(KING, WHITE), (0, 3))
+        self.assertEqual(compact.bitboards().castling, 1 << 3)
+
+    def test_load_fen_to_fen(self):
+        # Arrange
+        fen = "2rqk2r/1pb1p1pp/2p1Pn2/2Pp1p2/pPnP4/2N2NP1/P1b2PBP/R1BQK1R1 b Qk b3 0 1"
+
+        # Act
+        self.board.load_fen(fen)
+
+        # Assert
+        self.assertEqual(self.board.to_fen(), fen)
+        self.assertEqual(self.board.hash, Board(fen).hash)
+
+    def test_find_pieces(self):
+        # Assert
+        self.assertEqual(self.board.find_piece(KING, BLACK), (7, 3))
+        self.assertEqual(self.board.find_pieces(PAWN, WHITE), [(1, i) for i in range(8)])
+        self.assertEqual(self.board.find_pieces(ROOK, BLACK), [(7, 0), (7, 7)])
+
+    def test_push_pop(self):
+        # Arrange
+        fen = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+        self.board.load_fen(fen)
+
+        # Act
+        self.board.push(((3, 5), (4, 5)))
+        self.board.push(((1, 6), (0, 7, "q")))
+        self.board.move((0, 4), (0, 7))
+        self.board.pop()
+        self.board.pop()
+        self.board.pop()
+
+        # Assert
+        self.assertEqual(self.board.to_fen(), fen)
+        self.assertEqual(self.board.hash, Board(fen).hash)
+
+    def test_evaluator_matches_array_backend(self):
+        # Arrange
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        self.board.load_fen(fen)
+
+        # Act
+        res = GameEvaluator(self.board).all_valid_moves()
+
+        # Assert
+        self.assertEqual(res, GameEvaluator(Board(fen)).all_valid_moves())
+        self.assertTrue(GameEvaluator(self.board).is_valid((0, 3), (0, 1)))
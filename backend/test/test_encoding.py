@@ -0,0 +1,97 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from batch import encode_fens
+from board import Board, BACKENDS
+from encoding import POSITION, POSITION_SIZE, NO_EN_PASSANT, encode_position, decode_position, pack, unpack
+from movegen import legal_moves
+
+def random_boards(count: int, seed: int = 0) -> list[Board]:
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board()
+        for _ in range(rng.randrange(1, 100)):
+            moves = legal_moves(board)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        boards.append(board)
+    return boards
+
+class TestEncoding(unittest.TestCase):
+    def test_size(self):
+        # Assert
+        self.assertEqual(POSITION_SIZE, 32)
+        self.assertEqual(len(Board().to_bytes()), 32)
+
+    def test_round_trip(self):
+        # Arrange
+        fens = ["r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w Kq - 0 1",
+                "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+                "8/8/8/8/8/8/8/4K2k b - - 87 140"] + [board.to_fen() for board in random_boards(10)]
+
+        for backend in BACKENDS:
+            for fen in fens:
+                # Act
+                board = Board.from_bytes(Board(fen, backend).to_bytes(), backend)
+
+                # Assert
+                self.assertEqual(board.to_fen(), fen)
+                self.assertEqual(board.hash, Board(fen).hash)
+                self.assertEqual(board.backend, backend)
+
+    def test_decode_errors(self):
+        # Assert
+        with self.assertRaises(ValueError):
+            decode_position(b"\x00" * 31)
+        with self.assertRaises(ValueError):
+            encode_position([1] * 33 + [0] * 31, 0, 0)
+
+    def test_pack_matches_single(self):
+        # Arrange
+        boards = random_boards(20, 1)
+        codes, sides = encode_fens([board.to_fen() for board in boards])
+        halfmove = np.array([board.halfmove_clock for board in boards])
+
+        # Act
+        records = pack(codes, sides, 0, NO_EN_PASSANT, halfmove, 1)
+
+        # Assert
+        self.assertEqual(records.dtype, POSITION)
+        for record, board in zip(records, boards):
+            expected = decode_position(board.to_bytes())
+            position = decode_position(record.tobytes())
+            self.assertEqual(position.codes, expected.codes)
+            self.assertEqual(position.side, expected.side)
+            self.assertEqual(position.halfmove, expected.halfmove)
+
+    def test_unpack(self):
+        # Arrange
+        boards = random_boards(20, 2)
+        data = b"".join(board.to_bytes() for board in boards)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "positions.bin")
+            with open(path, "wb") as f:
+                f.write(data)
+
+            # Act
+            positions = unpack(np.fromfile(path, dtype=POSITION))
+
+        # Assert
+        codes, sides = encode_fens([board.to_fen() for board in boards])
+        np.testing.assert_array_equal(positions.codes, codes)
+        np.testing.assert_array_equal(positions.side, sides)
+        self.assertEqual(list(positions.castling), [board.castling_rights() for board in boards])
+        self.assertEqual(pack(*positions).tobytes(), data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board, BACKENDS
+from evaluation import Evaluation, MAX_PHASE
+from movegen import legal_moves
+from piece_info import WHITE, BLACK, PAWN, QUEEN, KNIGHT
+
+FENS = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1",
+    "8/8/3p4/KPp4r/1R2Pp1k/8/6P1/8 w - c6 0 1",
+)
+
+def totals(evaluation: Evaluation) -> tuple:
+    return evaluation.middlegame, evaluation.endgame, evaluation.phase, evaluation.material, evaluation.counts, evaluation.bishop_squares
+
+class TestEvaluation(unittest.TestCase):
+    def test_start_position(self):
+        # Arrange
+        board = Board()
+
+        # Act
+        evaluation = board.evaluation
+
+        # Assert
+        self.assertEqual(evaluation.score(WHITE), 0)
+        self.assertEqual(evaluation.score(BLACK), 0)
+        self.assertEqual(evaluation.phase, MAX_PHASE)
+        self.assertEqual(evaluation.count(PAWN, WHITE), 8)
+        self.assertEqual(evaluation.count(QUEEN, BLACK), 1)
+        self.assertEqual(evaluation.material[0], evaluation.material[1])
+
+    def test_score_is_symmetric(self):
+        # Arrange
+        white = Board("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1").evaluation
+        black = Board("4k3/4p3/8/8/8/8/8/4K3 b - - 0 1").evaluation
+
+        # Assert
+        self.assertGreater(white.score(WHITE), 0)
+        self.assertEqual(white.score(WHITE), -white.score(BLACK))
+        self.assertEqual(white.score(WHITE), black.score(BLACK))
+        self.assertEqual(white.phase, 0)
+
+    def test_bishop_squares(self):
+        # Arrange
+        board = Board("4k3/1P6/8/8/8/8/8/2B1KB2 w - - 0 1")
+
+        # Act
+        board.push(((6, 6), (7, 6, 'b')))
+        promoted = [row[:] for row in board.evaluation.bishop_squares]
+        board.pop()
+
+        # Assert
+        self.assertEqual(Board().evaluation.bishop_squares, [[1, 1], [1, 1]])
+        self.assertEqual(board.evaluation.bishop_squares, [[1, 1], [0, 0]])
+        self.assertEqual(promoted, [[1, 2], [0, 0]])
+        self.assertFalse(board.evaluation.insufficient_material())
+
+    def test_promotion_updates_counts(self):
+        # Arrange
+        board = Board(FENS[1])
+
+        # Act
+        board.push(((1, 1), (0, 0, 'n')))
+
+        # Assert
+        self.assertEqual(board.evaluation.count(PAWN, BLACK), 2)
+        self.assertEqual(board.evaluation.count(KNIGHT, BLACK), 3)
+        self.assertEqual(board.evaluation.count(KNIGHT, WHITE), 1)
+        self.assertEqual(totals(board.evaluation), totals(Evaluation.from_board(board.board)))
+
+    def test_incremental_matches_full(self):
+        for backend in BACKENDS:
+            for fen in FENS:
+                # Arrange
+                rng = random.Random(fen)
+                board = Board(fen, backend)
+                initial = totals(Evaluation.from_board(board.board))
+                depth = 0
+
+                # Act
+                for _ in range(40):
+                    moves = legal_moves(board)
+                    if not moves:
+                        break
+                    board.push(rng.choice(moves))
+                    depth += 1
+
+                    # Assert
+                    self.assertEqual(totals(board.evaluation), totals(Evaluation.from_board(board.board)), (backend, fen))
+                for _ in range(depth):
+                    board.pop()
+                self.assertEqual(totals(board.evaluation), initial, (backend, fen))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'
 from piece_info import WHITE, BLACK, KING, PAWN, coord_to_board
 from pieces import Empty, Rook, Bishop, Queen, King, Knight, Pawn
 from board import Board
-from evaluator import GameEvaluator, PieceEvaluator
+from evaluator import GameEvaluator, PieceEvaluator, Reason, VALID
 
 class TestBoard(unittest.TestCase):
     def __init__(self, *args, **kwargs):
@@ -143,4 +143,190 @@ class TestBoard(unittest.TestCase):
         res = self.evaluator.all_valid_moves()
 
         # Assert
-        self.assertEqual(len(res), 20)
\ No newline at end of file
+        self.assertEqual(len(res), 20)
+
+    def test_legal_moves_cached_per_position(self):
+        # Arrange
+        self.board.load_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+
+        # Act
+        moves = self.evaluator.all_valid_moves()
+        valid = self.evaluator.is_valid((1, 3), (3, 3))
+        game_state = self.evaluator.is_game_over()
+        cached = self.evaluator.position()
+        self.board.move((1, 3), (3, 3))
+        after = self.evaluator.all_valid_moves()
+        moved_pawn = self.evaluator.is_valid((1, 3), (3, 3))
+
+        # Assert
+        self.assertTrue(valid)
+        self.assertIs(game_state["stalemate"]["moves"], moves)
+        self.assertIs(cached.moves, moves)
+        self.assertIsNot(self.evaluator.position(), cached)
+        self.assertEqual(len(after), 20)
+        self.assertEqual(moved_pawn.code, Reason.NO_PIECE)
+
+    def test_is_valid_rejects_moves_outside_legal_set(self):
+        # Arrange
+        self.board.load_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+
+        # Act
+        res = self.evaluator.is_valid((1, 3), (3, 3, 'q'))
+
+        # Assert
+        self.assertFalse(res)
+        self.assertEqual(res.code, Reason.ILLEGAL)
+        self.assertEqual(res["reason"], "Move from (1, 3) to (3, 3) is not a legal move for piece (♟).")
+        self.assertFalse(self.evaluator.is_legal((1, 3), (3, 3, 'q')))
+        self.assertTrue(self.evaluator.is_valid((1, 3), (3, 3)))
+
+    def test_legal_moves_cache_follows_undo(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/8/8/3r4/4K3 w - - 0 1")
+        self.evaluator.all_valid_moves()
+
+        # Act
+        self.board.move((0, 3), (1, 4))
+        captured = self.evaluator.is_stalemate()
+        self.board.pop()
+        res = self.evaluator.is_valid((0, 3), (0, 4))
+
+        # Assert
+        self.assertFalse(captured["stalemate"])
+        self.assertIn(((7, 3), (6, 3)), captured["moves"])
+        self.assertEqual(res.code, Reason.INTO_CHECK)
+        self.assertEqual(self.evaluator.in_check(), [])
+
+    def test_is_valid_castling_out_of_check(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/8/8/4r3/R3K2R w KQ - 0 1")
+
+        # Act
+        res = self.evaluator.is_valid((0, 3), (0, 1))
+
+        # Assert
+        self.assertEqual(res["valid"], False)
+
+    def test_is_valid_castling_queenside_obstructed(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/8/8/8/RN2K2R w KQ - 0 1")
+
+        # Act
+        res = self.evaluator.is_valid((0, 3), (0, 5))
+
+        # Assert
+        self.assertEqual(res["valid"], False)
+        self.assertEqual(self.evaluator.is_valid((0, 3), (0, 1))["valid"], True)
+
+    def test_is_valid_result(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/8/8/4r3/R3K2R w KQ - 0 1")
+
+        # Act
+        res = self.evaluator.is_valid((0, 3), (0, 1))
+        res2 = self.evaluator.is_valid((0, 3), (0, 2))
+
+        # Assert
+        self.assertFalse(res)
+        self.assertEqual(res.code, Reason.CASTLE_OUT_OF_CHECK)
+        self.assertEqual(res["reason"], "Move from (0, 3) to (0, 1) castles out of check by ['♖(1, 3)'].")
+        self.assertEqual(res["info"], "Move from (0, 3) to (0, 1)")
+        self.assertEqual(set(res), {"valid", "info", "reason", "piece"})
+        self.assertTrue(res2)
+        self.assertEqual(dict(res2), {"valid": True, "info": "Move from (0, 3) to (0, 2)", "reason": "", "piece": King(WHITE, True)})
+
+    def test_validity_codes(self):
+        # Arrange
+        self.board.load_fen("4k3/P7/8/8/8/8/8/RN2K2R w KQ - 0 1")
+
+        # Assert
+        self.assertEqual(self.evaluator.validity((8, 0), (7, 0)), Reason.OUT_OF_BOUNDS)
+        self.assertEqual(self.evaluator.validity((4, 4), (5, 4)), Reason.NO_PIECE)
+        self.assertEqual(self.evaluator.validity((0, 7), (1, 6)), Reason.CANNOT_MOVE)
+        self.assertEqual(self.evaluator.validity((0, 7), (0, 5)), Reason.OBSTRUCTED)
+        self.assertEqual(self.evaluator.validity((0, 3), (0, 5)), Reason.CASTLE_OBSTRUCTED)
+        self.assertEqual(self.evaluator.validity((6, 7), (7, 7)), Reason.PROMOTION_MISSING)
+        self.assertEqual(self.evaluator.validity((6, 7), (7, 7, "q")), VALID)
+        self.assertTrue(self.evaluator.is_legal((0, 3), (0, 1)))
+
+    def test_is_valid_reason_into_check(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/8/8/3r4/4K3 w - - 0 1")
+
+        # Act
+        res = self.evaluator.is_valid((0, 3), (0, 4))
+
+        # Assert
+        self.assertEqual(res["valid"], False)
+        self.assertEqual(res["reason"], "Move from (0, 3) to (0, 4) puts the current player in check by ['♖(1, 4)'].")
+
+    def test_is_fifty_move_rule(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/8/8/8/4K2R w K - 99 80")
+        before = self.evaluator.is_fifty_move_rule()
+
+        # Act
+        self.board.move((0, 0), (0, 1))
+        res = self.evaluator.is_fifty_move_rule()
+        game_state = self.evaluator.is_game_over()
+
+        # Assert
+        self.assertFalse(before["fifty_move_rule"])
+        self.assertEqual(before["halfmove_clock"], 99)
+        self.assertEqual(res, {"fifty_move_rule": True, "halfmove_clock": 100, "reason": "Draw by the fifty-move rule."})
+        self.assertTrue(game_state["game_over"])
+        self.assertEqual(self.evaluator.outcome(game_state), {"point": 0.5, "reason": "Draw by the fifty-move rule."})
+
+    def test_is_insufficient_material(self):
+        # Arrange
+        fens = {
+            "8/8/4k3/8/8/3K4/8/8 w - - 0 1": True,
+            "8/8/4k3/8/8/3K4/8/5N2 w - - 0 1": True,
+            "8/8/4k3/8/8/3K4/8/5B2 b - - 0 1": True,
+            "8/3b4/4k3/8/8/3K4/8/5B2 w - - 0 1": True,
+            "8/2b5/4k3/8/8/3K4/8/5B2 w - - 0 1": False,
+            "8/3n4/4k3/8/8/3K4/8/5N2 w - - 0 1": False,
+            "8/8/4k3/8/8/3K4/8/4NN2 w - - 0 1": False,
+            "8/3n4/4k3/8/8/3K4/8/5B2 w - - 0 1": False,
+            "8/8/4k3/8/8/3K4/4P3/8 w - - 0 1": False,
+        }
+
+        for fen, expected in fens.items():
+            # Act
+            self.board.load_fen(fen)
+            res = self.evaluator.is_insufficient_material()
+
+            # Assert
+            self.assertEqual(res["insufficient_material"], expected, fen)
+
+    def test_is_game_over_insufficient_material(self):
+        # Arrange
+        self.board.load_fen("8/8/4k3/8/8/3K4/3r4/8 w - - 0 1")
+        before = self.evaluator.is_game_over()
+
+        # Act
+        self.board.move((2, 4), (1, 4))
+        game_state = self.evaluator.is_game_over()
+
+        # Assert
+        self.assertFalse(before["game_over"])
+        self.assertFalse(before["insufficient_material"]["insufficient_material"])
+        self.assertTrue(game_state["game_over"])
+        self.assertEqual(self.evaluator.outcome(game_state), {"point": 0.5, "reason": "Draw by insufficient material."})
+
+    def test_is_threefold_repetition(self):
+        # Arrange
+        moves = [((0, 1), (2, 2)), ((7, 1), (5, 2)), ((2, 2), (0, 1)), ((5, 2), (7, 1))]
+
+        # Act
+        for move in moves:
+            self.board.move(*move)
+        res = self.evaluator.is_threefold_repetition()
+        for move in moves:
+            self.board.move(*move)
+        res2 = self.evaluator.is_threefold_repetition()
+
+        # Assert
+        self.assertEqual(res["threefold_repetition"], False)
+        self.assertEqual(res2["threefold_repetition"], True)
+        self.assertEqual(res2["hash"], Board().hash)
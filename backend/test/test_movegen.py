@@ -0,0 +1,123 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from bitboard import square
+from movegen import legal_moves, in_check, pins
+
+class TestMovegen(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.board = Board()
+
+    def test_start_position(self):
+        # Act
+        moves = legal_moves(self.board)
+
+        # Assert
+        self.assertEqual(len(moves), 20)
+        self.assertIn(((1, 3), (3, 3)), moves)
+        self.assertIn(((0, 1), (2, 0)), moves)
+
+    def test_pinned_pieces(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/1b6/8/3N4/r2RK3 w - - 0 1")
+
+        # Act
+        pinned = pins(self.board.bitboards(), square((0, 3)), 0)
+        moves = legal_moves(self.board)
+
+        # Assert
+        self.assertEqual(set(pinned), {square((1, 4)), square((0, 4))})
+        self.assertFalse([move for move in moves if move[0] == (1, 4)])
+        self.assertEqual(set(move[1] for move in moves if move[0] == (0, 4)), {(0, 5), (0, 6), (0, 7)})
+
+    def test_double_check_only_king_moves(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/8/5n2/8/r3K2Q w - - 0 1")
+
+        # Act
+        moves = legal_moves(self.board)
+
+        # Assert
+        self.assertEqual(len(in_check(self.board)), 2)
+        self.assertTrue(moves)
+        self.assertTrue(all(move[0] == (0, 3) for move in moves))
+
+    def test_single_check_evasions(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/8/8/1R6/r3K3 w - - 0 1")
+
+        # Act
+        moves = legal_moves(self.board)
+
+        # Assert
+        self.assertEqual(in_check(self.board), [(0, 7)])
+        self.assertIn(((1, 6), (0, 6)), moves)
+        self.assertNotIn(((1, 6), (2, 6)), moves)
+        self.assertNotIn(((0, 3), (0, 4)), moves)
+
+    def test_en_passant_discovered_check(self):
+        # Arrange
+        self.board.load_fen("8/8/8/K1pP3r/8/8/8/4k3 w - c6 0 1")
+
+        # Act
+        moves = legal_moves(self.board)
+
+        # Assert
+        self.assertNotIn(((4, 4), (5, 5)), moves)
+        self.assertIn(((4, 4), (5, 4)), moves)
+
+    def test_en_passant_evasion(self):
+        # Arrange
+        self.board.load_fen("8/8/8/2pP4/1K6/8/8/4k3 w - c6 0 1")
+
+        # Act
+        moves = legal_moves(self.board)
+
+        # Assert
+        self.assertIn(((4, 4), (5, 5)), moves)
+        self.assertNotIn(((4, 4), (5, 4)), moves)
+
+    def test_castling_through_check(self):
+        # Arrange
+        self.board.load_fen("4k3/8/8/8/8/8/6r1/R3K2R w KQ - 0 1")
+
+        # Act
+        moves = legal_moves(self.board)
+
+        # Assert
+        self.assertIn(((0, 3), (0, 5)), moves)
+        self.assertNotIn(((0, 3), (0, 1)), moves)
+
+    def test_captures_only(self):
+        # Arrange
+        self.board.load_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+
+        # Act
+        captures = legal_moves(self.board, captures_only=True)
+
+        # Assert
+        self.assertEqual(len(captures), 8)
+        self.assertTrue(all(self.board[end_pos[:2]] != self.board.current_player for _, end_pos in captures))
+
+    def test_promotions(self):
+        # Arrange
+        self.board.load_fen("1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1")
+
+        # Act
+        captures = legal_moves(self.board, captures_only=True)
+
+        # Assert
+        self.assertEqual(sorted(captures), sorted([((6, 7), (7, 7, p)) for p in "qrbn"] + [((6, 7), (7, 6, p)) for p in "qrbn"]))
+
+    def test_bitboard_backend(self):
+        # Arrange
+        fen = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+
+        # Assert
+        self.assertEqual(sorted(legal_moves(Board(fen, "bitboard"))), sorted(legal_moves(Board(fen))))
+        self.assertEqual(len(legal_moves(Board(fen))), 6)
@@ -0,0 +1,100 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from movegen import legal_moves
+from ordering import MoveOrderer, HISTORY_LIMIT, KILLER_SCORES, piece_indices
+from piece_info import PIECE_INDEX, KING, PAWN
+
+class TestOrdering(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.orderer = MoveOrderer()
+
+    def test_piece_indices(self):
+        # Act
+        indices = piece_indices(Board().bitboards())
+
+        # Assert
+        self.assertEqual(indices[3], PIECE_INDEX[KING])
+        self.assertEqual(indices[59], PIECE_INDEX[KING])
+        self.assertEqual(indices[8:16], [PIECE_INDEX[PAWN]] * 8)
+        self.assertEqual(indices[16:48], [0] * 32)
+
+    def test_mvv_lva(self):
+        # Arrange
+        board = Board("4k3/8/8/2q1r3/1P6/3N4/8/7K w - - 0 1")
+
+        # Act
+        moves = self.orderer.order(board, legal_moves(board))
+
+        # Assert
+        self.assertEqual(moves[:3], [((3, 6), (4, 5)), ((2, 4), (4, 5)), ((2, 4), (4, 3))])
+
+    def test_promotions_first(self):
+        # Arrange
+        board = Board("1n2k3/P7/8/8/8/3q4/4P3/4K3 w - - 0 1")
+
+        # Act
+        moves = self.orderer.order(board, legal_moves(board))
+
+        # Assert
+        self.assertEqual(moves[0], ((6, 7), (7, 6, "q")))
+        self.assertEqual(moves[1], ((6, 7), (7, 7, "q")))
+        self.assertEqual(moves[7], ((6, 7), (7, 7, "n")))
+        self.assertEqual(moves[8], ((1, 3), (2, 4)))
+
+    def test_best_move_first(self):
+        # Arrange
+        board = Board("4k3/8/8/2q1r3/1P6/3N4/8/7K w - - 0 1")
+
+        # Act
+        moves = self.orderer.order(board, legal_moves(board), 0, ((0, 0), (1, 0)))
+
+        # Assert
+        self.assertEqual(moves[0], ((0, 0), (1, 0)))
+        self.assertEqual(sorted(moves), sorted(legal_moves(board)))
+
+    def test_killers_and_history(self):
+        # Arrange
+        board = Board()
+        quiet, killer = ((0, 1), (2, 2)), ((1, 0), (3, 0))
+
+        # Act
+        self.orderer.add_cutoff(board, quiet, 2, 3)
+        self.orderer.add_cutoff(board, killer, 2, 1)
+        self.orderer.add_cutoff(board, killer, 3, 1)
+        moves = self.orderer.order(board, legal_moves(board), 2)
+
+        # Assert
+        self.assertEqual(self.orderer.killers[2], [killer, quiet])
+        self.assertEqual(self.orderer.killers[3], [killer, None])
+        self.assertEqual(self.orderer.history[1][18], 9)
+        self.assertEqual(moves[:2], [killer, quiet])
+        self.assertEqual(self.orderer.order(board, legal_moves(board), 4)[0], quiet)
+
+    def test_captures_are_not_killers(self):
+        # Arrange
+        board = Board("4k3/8/8/2q1r3/1P6/3N4/8/7K w - - 0 1")
+
+        # Act
+        self.orderer.add_cutoff(board, ((2, 4), (4, 3)), 0, 4)
+
+        # Assert
+        self.assertEqual(self.orderer.killers[0], [None, None])
+        self.assertEqual(sum(map(sum, self.orderer.history)), 0)
+
+    def test_history_is_bounded(self):
+        # Arrange
+        board = Board()
+
+        # Act
+        for _ in range(20):
+            self.orderer.add_cutoff(board, ((0, 1), (2, 2)), 5, 64)
+
+        # Assert
+        self.assertLess(self.orderer.history[1][18], HISTORY_LIMIT)
+        self.assertLess(self.orderer.history[1][18], KILLER_SCORES[1])
@@ -0,0 +1,112 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from movegen import legal_moves
+from ordering import MoveOrderer
+from parallel import ParallelSearch, parallel_search
+from search import MATE_SCORE, Search, is_mate_score
+from tablebase import generate
+from transposition import EXACT, TranspositionTable, table_bytes
+
+class TestParallel(unittest.TestCase):
+    def test_shared_buffer(self):
+        # Arrange
+        buffer = bytearray(table_bytes(0.01))
+        writer = TranspositionTable(0.01, buffer)
+        reader = TranspositionTable(0.01, buffer)
+
+        # Act
+        writer.store(12345, 3, EXACT, 17, ((1, 3), (3, 3)))
+
+        # Assert
+        self.assertEqual(reader.probe(12345), (3, EXACT, 17, ((1, 3), (3, 3))))
+
+    def test_seeded_orderer(self):
+        # Arrange
+        board = Board()
+        moves = legal_moves(board)
+
+        # Act
+        plain = MoveOrderer().order(board, moves)
+        seeded = MoveOrderer(seed=1).order(board, moves)
+
+        # Assert
+        self.assertNotEqual(plain, seeded)
+        self.assertEqual(sorted(plain), sorted(seeded))
+
+    def test_stop(self):
+        # Arrange
+        stop = threading.Event()
+        stop.set()
+
+        # Act
+        res = Search(Board(), 8, stop=stop).search()
+
+        # Assert
+        self.assertLess(res.depth, 8)
+        self.assertIsNotNone(res.move)
+
+    def test_parallel_search(self):
+        # Arrange
+        board = Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+
+        # Act
+        res = parallel_search(board, 2, 2, size_mb=1)
+
+        # Assert
+        self.assertEqual(res.depth, 2)
+        self.assertIn(res.move, legal_moves(board))
+        self.assertEqual(res.pv[0], res.move)
+        self.assertEqual(len(res.worker_nodes), 2)
+        self.assertEqual(res.nodes, sum(res.worker_nodes))
+        self.assertTrue(all(res.worker_nodes))
+
+    def test_reused_pool(self):
+        # Arrange
+        board = Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+
+        # Act
+        with ParallelSearch(2, 1) as engine:
+            first = engine.search(board, 3)
+            second = engine.search(board, 3)
+
+        # Assert
+        self.assertEqual(first.score, MATE_SCORE - 1)
+        self.assertEqual(second.move, first.move)
+        self.assertLess(second.nodes, first.nodes)
+
+    @unittest.skipUnless(os.path.isdir("/dev/shm"), "shared memory blocks are not listed as files")
+    def test_failed_pool_releases_memory(self):
+        # Arrange
+        before = set(os.listdir("/dev/shm"))
+
+        # Act
+        with self.assertRaises(ValueError):
+            ParallelSearch(-1, 1)
+
+        # Assert
+        self.assertEqual(set(os.listdir("/dev/shm")) - before, set())
+
+    def test_parallel_search_tablebases(self):
+        # Arrange
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        generate("KQvK", directory)
+        board = Board("8/8/8/4k3/8/8/8/KQ6 w - - 0 1")
+
+        # Act
+        res = parallel_search(board, 1, 1, size_mb=1, tablebases=directory)
+
+        # Assert
+        self.assertTrue(is_mate_score(res.score))
+        self.assertGreater(res.score, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from perft import PERFT_SUITE, START_FEN, divide, move_to_str, parse_args, perft
+
+class TestPerft(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.suite = {name: (fen, expected) for name, fen, expected in PERFT_SUITE}
+
+    def assert_perft(self, name: str, depth: int, backend: str = "array"):
+        fen, expected = self.suite[name]
+        self.assertEqual(perft(Board(fen, backend), depth), expected[depth], f"{name} depth {depth}")
+
+    def test_move_to_str(self):
+        # Assert
+        self.assertEqual(move_to_str(((1, 3), (3, 3))), "e2e4")
+        self.assertEqual(move_to_str(((6, 7), (7, 6, "q"))), "a7b8q")
+
+    def test_perft_start(self):
+        # Assert
+        self.assertEqual(perft(Board(START_FEN), 0), 1)
+        self.assertEqual(perft(Board(START_FEN), -1), 1)
+        self.assert_perft("start", 1)
+        self.assert_perft("start", 2)
+        self.assert_perft("start", 3)
+
+    def test_parse_args_rejects_negative_depth(self):
+        # Act
+        with contextlib.redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+            parse_args(["-d", "-1"])
+
+        # Assert
+        self.assertIn("depth must be at least 1", stderr.getvalue())
+        self.assertEqual(parse_args(["-d", "2"]).depth, 2)
+
+    def test_divide_sums_to_perft(self):
+        # Arrange
+        board = Board(START_FEN)
+
+        # Act
+        counts = divide(board, 2)
+
+        # Assert
+        self.assertEqual(len(counts), 20)
+        self.assertEqual(counts["e2e4"], 20)
+        self.assertEqual(sum(counts.values()), 400)
+        self.assertEqual(board.to_fen(), START_FEN)
+
+    def test_perft_kiwipete(self):
+        # Assert
+        self.assert_perft("kiwipete", 1)
+        self.assert_perft("kiwipete", 2)
+
+    def test_perft_promotions(self):
+        # Assert
+        self.assert_perft("position4", 3)
+        self.assert_perft("position5", 2)
+        self.assert_perft("promote_out_of_check", 3)
+
+    def test_perft_en_passant(self):
+        # Assert
+        self.assert_perft("en_passant_pin", 3)
+        self.assert_perft("en_passant_check", 3)
+
+    def test_perft_bitboard_backend(self):
+        # Assert
+        self.assert_perft("castle_gives_check", 3, "bitboard")
+        self.assert_perft("kiwipete", 2, "bitboard")
@@ -0,0 +1,122 @@
+import gzip
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from pgn import open_pgn, parse_san, read_games, replay, summarize
+
+PGN = """[Event "Test"]
+[White "Morphy, Paul"]
+[Black "Duke Karl / Count Isouard"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 {This is a weak move
+already.} 4. dxe5 Bxf3 5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 c6 9. Bg5 b5
+10. Nxb5 cxb5 11. Bxb5+ Nbd7 12. O-O-O Rd8 13. Rxd7 Rxd7 14. Rd1 Qe6 15. Bxd7+
+Nxd7 16. Qb8+ Nxb8 17. Rd8# 1-0
+
+[Event "Second"]
+[SetUp "1"]
+[FEN "4k3/1P6/8/8/8/8/8/4K2R w K - 0 1"]
+
+1. b8=Q+ (1. O-O $2 Kd7) 1... Kd7 2.O-O ; castles
+*
+"""
+
+BAD_FEN = """[FEN "x7/8/8/8/8/8/8/8 w - - 0 1"]
+
+1. e4 *
+
+[FEN "8/8/8 w"]
+
+1. e4 *
+
+[Event "Next"]
+
+1. e4 e5 *
+"""
+
+class TestPgn(unittest.TestCase):
+    def test_read_games(self):
+        # Act
+        games = list(read_games(io.StringIO(PGN)))
+
+        # Assert
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games[0].tags["White"], "Morphy, Paul")
+        self.assertEqual(games[0].result, "1-0")
+        self.assertEqual(len(games[0].moves), 33)
+        self.assertEqual(games[0].moves[-1], "Rd8#")
+        self.assertEqual(games[1].moves, ["b8=Q+", "Kd7", "O-O"])
+        self.assertEqual(games[1].fen, "4k3/1P6/8/8/8/8/8/4K2R w K - 0 1")
+
+    def test_replay(self):
+        # Arrange
+        games = list(read_games(io.StringIO(PGN)))
+
+        # Act
+        first = summarize(games[0])
+        second = [move for _, move, _ in replay(games[1])]
+
+        # Assert
+        self.assertIsNone(first.error)
+        self.assertEqual(first.plies, 33)
+        self.assertEqual(first.fen.split()[0], "1n1Rkb1r/p4ppp/4q3/4p1B1/4P3/8/PPP2PPP/2K5")
+        self.assertEqual(second, [((6, 6), (7, 6, 'q')), ((7, 3), (6, 4)), ((0, 3), (0, 1))])
+
+    def test_parse_san(self):
+        # Arrange
+        board = Board("4k3/8/8/8/8/8/4K3/R6R w - - 0 1")
+
+        # Assert
+        self.assertEqual(parse_san(board, "Rad1"), ((0, 7), (0, 4)))
+        self.assertEqual(parse_san(Board("4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1"), "O-O-O"), ((0, 3), (0, 5)))
+        with self.assertRaises(ValueError):
+            parse_san(board, "Rd1")
+        with self.assertRaises(ValueError):
+            parse_san(board, "Nf3")
+        with self.assertRaises(ValueError):
+            parse_san(board, "hello")
+
+    def test_illegal_move(self):
+        # Arrange
+        game = next(read_games(io.StringIO("1. e4 e5 2. Ke3 *")))
+
+        # Act
+        summary = summarize(game)
+
+        # Assert
+        self.assertEqual(summary.plies, 2)
+        self.assertIn("Ke3", summary.error)
+
+    def test_bad_fen_tag(self):
+        # Act
+        summaries = [summarize(game) for game in read_games(io.StringIO(BAD_FEN))]
+
+        # Assert
+        self.assertEqual(len(summaries), 3)
+        self.assertIn("Invalid FEN x7/8/8/8/8/8/8/8 w - - 0 1", summaries[0].error)
+        self.assertIn("Invalid FEN 8/8/8 w", summaries[1].error)
+        self.assertEqual((summaries[2].plies, summaries[2].error), (2, None))
+
+    def test_open_compressed(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.pgn.gz")
+            with gzip.open(path, "wt") as f:
+                f.write(PGN)
+
+            # Act
+            with open_pgn(path) as f:
+                games = list(read_games(f))
+
+        # Assert
+        self.assertEqual(len(games), 2)
+
+if __name__ == '__main__':
+    unittest.main()
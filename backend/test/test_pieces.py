@@ -5,7 +5,7 @@ import unittest
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 from piece_info import EMPTY, PAWN, ROOK, BISHOP, QUEEN, KING, KNIGHT, NONE, WHITE, BLACK, board_to_coord, coord_to_board
-from pieces import ChessPiece, Empty, Rook, Knight, Bishop, Queen, King, Pawn
+from pieces import ChessPiece, Empty, Rook, Knight, Bishop, Queen, King, Pawn, KNIGHT_MOVES, ROOK_LINES, BISHOP_LINES, PAWN_PUSHES
 
 class TestPieces(unittest.TestCase):
     def __init__(self, *args, **kwargs):
@@ -352,6 +352,7 @@ class TestPieces(unittest.TestCase):
         self.assertEqual(set(piece2.moves((6, 1))), set([(5, 1), (4, 1), (5, 0), (5, 2)]))
         self.assertEqual(set(piece2.moves((5, 0))), set([(4, 0), (4, 1)]))
         self.assertEqual(set(piece2.moves((5, 1))), set([(4, 0), (4, 1), (4, 2)]))
+        self.assertEqual(set(piece.moves((6, 1))), set([(7, 1, p) for p in "qrbn"] + [(7, 0, p) for p in "qrbn"] + [(7, 2, p) for p in "qrbn"]))
 
     def test_pawn_piece_line_of_sight(self):
         # Arrange
@@ -455,4 +456,24 @@ class TestPieces(unittest.TestCase):
         self.assertEqual(piece.castling_options((0, 3)), [(0, 1), (0, 5)])
         self.assertEqual(piece.castling_options((7, 3)), [])
         self.assertEqual(piece2.castling_options((7, 3)), [(7, 1), (7, 5)])
-        self.assertEqual(piece2.castling_options((0, 3)), [])
\ No newline at end of file
+        self.assertEqual(piece2.castling_options((0, 3)), [])
+
+    def test_move_tables(self):
+        # Assert
+        self.assertEqual(set(KNIGHT_MOVES[(0, 0)]), set([(1, 2), (2, 1)]))
+        self.assertEqual(ROOK_LINES[(0, 7)][(0, 4)], [(0, 5), (0, 6)])
+        self.assertEqual(BISHOP_LINES[(3, 4)][(0, 1)], [(2, 3), (1, 2)])
+        self.assertEqual(PAWN_PUSHES[WHITE][(1, 4)], [(2, 4), (3, 4)])
+        self.assertEqual(PAWN_PUSHES[BLACK][(1, 4)], [(0, 4)])
+
+    def test_moves_do_not_share_tables(self):
+        # Arrange
+        piece = Knight(WHITE)
+
+        # Act
+        piece.moves((0, 0)).append((7, 7))
+        Queen(WHITE).moves((4, 4)).clear()
+
+        # Assert
+        self.assertEqual(set(piece.moves((0, 0))), set([(1, 2), (2, 1)]))
+        self.assertEqual(len(Queen(WHITE).moves((4, 4))), 27)
\ No newline at end of file
@@ -0,0 +1,113 @@
+import io
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from pgn import read_games
+from polyglot import BookBuilder, OpeningBook, polyglot_key, encode_move, decode_move
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 1-0
+
+[Result "1-0"]
+
+1. e4 c5 1-0
+
+[Result "0-1"]
+
+1. d4 d5 0-1
+
+[Result "1/2-1/2"]
+
+1. e4 e5 1/2-1/2
+"""
+
+class TestPolyglot(unittest.TestCase):
+    def test_keys(self):
+        # Published keys from the Polyglot book format specification.
+        # Assert
+        self.assertEqual(polyglot_key(Board()), 0x463b96181691fc9c)
+        self.assertEqual(polyglot_key(Board("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1")), 0x823c9b50fd114196)
+        self.assertEqual(polyglot_key(Board("rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 2")), 0x0756b94461c50fb0)
+        self.assertEqual(polyglot_key(Board("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3")), 0x22a48b5a8e47ff78)
+        self.assertEqual(polyglot_key(Board("rnbq1bnr/ppp1pkpp/8/3pPp2/8/8/PPPPKPPP/RNBQ1BNR w - - 0 4")), 0x00fdd303c946bdd9)
+        for backend in ("bitboard", "compact"):
+            self.assertEqual(polyglot_key(Board(backend=backend)), 0x463b96181691fc9c)
+
+    def test_castling_moves(self):
+        # Arrange
+        board = Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+
+        # Act
+        kingside = encode_move(board, ((0, 3), (0, 1)))
+        queenside = encode_move(board, ((0, 3), (0, 5)))
+
+        # Assert
+        self.assertEqual(kingside, 263)
+        self.assertEqual(queenside, 256)
+        self.assertEqual(decode_move(board, kingside), ((0, 3), (0, 1)))
+        self.assertEqual(decode_move(board, queenside), ((0, 3), (0, 5)))
+        promotion = ((6, 0), (7, 0, 'q'))
+        self.assertEqual(decode_move(Board("8/7P/8/8/8/8/8/k6K w - - 0 1"), encode_move(board, promotion)), promotion)
+
+    def test_build_and_probe(self):
+        # Arrange
+        builder = BookBuilder(max_ply=2)
+        for game in read_games(io.StringIO(PGN)):
+            builder.add_game(game)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.bin")
+
+            # Act
+            count = builder.write(path)
+            book = OpeningBook(path)
+            entries = book.find_all(Board())
+            after_e4 = Board()
+            after_e4.push(((1, 3), (3, 3)))
+            replies = book.find_all(after_e4)
+            choice = book.choose(Board(), random.Random(0))
+            size = os.path.getsize(path)
+            del book
+
+        # Assert
+        self.assertEqual(size, count * 16)
+        self.assertEqual([(entry.move, entry.weight) for entry in entries], [(((1, 3), (3, 3)), 5)])
+        self.assertEqual(sorted(entry.weight for entry in replies), [1])
+        self.assertEqual(choice, ((1, 3), (3, 3)))
+
+    def test_frequency_weights(self):
+        # Arrange
+        builder = BookBuilder(max_ply=1, by_results=False, min_games=2)
+
+        # Act
+        for game in read_games(io.StringIO(PGN)):
+            builder.add_game(game)
+        entries = builder.entries()
+
+        # Assert
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(int(entries[0]["key"]), 0x463b96181691fc9c)
+        self.assertEqual(int(entries[0]["weight"]), 3)
+
+    def test_bad_fen_tag(self):
+        # Arrange
+        builder = BookBuilder(by_results=False)
+        games = read_games(io.StringIO('[FEN "x7/8/8/8/8/8/8/8 w - - 0 1"]\n\n1. e4 *\n\n[Event "Next"]\n\n1. e4 *\n'))
+
+        # Act
+        for game in games:
+            builder.add_game(game)
+
+        # Assert
+        self.assertEqual(builder.games, 1)
+        self.assertEqual(len(builder.entries()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
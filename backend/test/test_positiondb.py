@@ -0,0 +1,119 @@
+import io
+import numpy as np
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from pgn import read_games
+from positiondb import DatabaseBuilder, PositionDatabase, INDEX, _merge
+
+PGN = """[White "A"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 1-0
+
+[White "B"]
+[Result "0-1"]
+
+1. Nf3 Nc6 2. e4 e5 3. d4 0-1
+
+[White "C"]
+[Result "1/2-1/2"]
+
+1. d4 d5 2. c4 1/2-1/2
+
+[White "D"]
+[Result "1-0"]
+
+1. e4 e5 2. Ke3 1-0
+"""
+
+class TestPositionDatabase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # A run size of 4 spills several sorted runs, so closing has to merge them.
+        with DatabaseBuilder(self.directory.name, run_size=4) as builder:
+            self.errors = [builder.add_game(game) for game in read_games(io.StringIO(PGN))]
+            builder.add_moves([((1, 4), (3, 4)), ((6, 4), (4, 4))], "*", {"White": "E"})
+        self.database = PositionDatabase(self.directory.name)
+
+    def tearDown(self):
+        del self.database
+        self.directory.cleanup()
+
+    def test_build(self):
+        # Assert
+        self.assertEqual(len(self.database), 5)
+        self.assertEqual(self.errors[:3], [None, None, None])
+        self.assertIn("Ke3", self.errors[3])
+        self.assertTrue((self.database.keys[1:] >= self.database.keys[:-1]).all())
+        self.assertEqual(len(self.database.keys), 6 + 6 + 4 + 3 + 3)
+
+    def test_start_position(self):
+        # Act
+        occurrences = self.database.lookup(Board())
+
+        # Assert
+        self.assertEqual([(o.game, o.ply) for o in occurrences], [(i, 0) for i in range(5)])
+        self.assertEqual(self.database.results(Board()), {"1-0": 2, "0-1": 1, "1/2-1/2": 1, "*": 1})
+
+    def test_transposition(self):
+        # Arrange
+        board = Board("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+
+        # Act
+        occurrences = self.database.lookup(board)
+
+        # Assert
+        self.assertEqual([(o.game, o.ply, o.result) for o in occurrences], [(0, 4, "1-0"), (1, 4, "0-1")])
+        self.assertEqual(self.database.position(0, 4)[:24], board.to_bytes()[:24])
+
+    def test_game_info(self):
+        # Act
+        info = self.database.game(2)
+
+        # Assert
+        self.assertEqual(info.tags["White"], "C")
+        self.assertEqual(info.plies, 3)
+        self.assertEqual(info.result, "1/2-1/2")
+        self.assertEqual(self.database.game(3).plies, 2)
+        self.assertEqual(self.database.game(4).tags, {"White": "E"})
+
+    def test_bad_fen_tag(self):
+        # Arrange
+        game = next(read_games(io.StringIO('[FEN "x7/8/8/8/8/8/8/8 w - - 0 1"]\n\n1. e4 *\n')))
+
+        # Act
+        with DatabaseBuilder(os.path.join(self.directory.name, "bad")) as builder:
+            error = builder.add_game(game)
+
+        # Assert
+        self.assertIn("Invalid FEN", error)
+        self.assertEqual(builder.game_count, 0)
+
+    def test_merge_keeps_game_order_across_blocks(self):
+        # Arrange
+        paths = []
+        for i, (keys, games) in enumerate((([1, 5, 5, 5, 5], range(0, 5)), ([5, 5, 5, 9], range(5, 9)))):
+            run = np.zeros(len(keys), dtype=INDEX)
+            run["key"], run["game"] = keys, games
+            paths.append(os.path.join(self.directory.name, f"merge{i}.bin"))
+            run.tofile(paths[-1])
+
+        # Act
+        blocks = list(_merge(paths, block_size=2))
+
+        # Assert
+        self.assertGreater(len(blocks), 1)
+        self.assertEqual(list(np.concatenate(blocks)["game"]), list(range(9)))
+
+    def test_missing_position(self):
+        # Assert
+        self.assertEqual(self.database.lookup(Board("8/8/8/8/8/8/8/K6k w - - 0 1")), [])
+
+if __name__ == '__main__':
+    unittest.main()
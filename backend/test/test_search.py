@@ -0,0 +1,121 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from search import INFINITY, MATE_SCORE, Search, search
+
+class TestSearch(unittest.TestCase):
+    def test_mate_in_one(self):
+        # Arrange
+        board = Board("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1")
+
+        # Act
+        res = search(board, 4)
+
+        # Assert
+        self.assertEqual(res.move, ((0, 4), (7, 4)))
+        self.assertEqual(res.score, MATE_SCORE - 1)
+        self.assertEqual(res.pv, [((0, 4), (7, 4))])
+
+    def test_mate_in_two(self):
+        # Arrange
+        board = Board("k7/8/8/1K6/8/8/8/7R w - - 0 1")
+
+        # Act
+        res = search(board, 4)
+
+        # Assert
+        self.assertEqual(res.score, MATE_SCORE - 3)
+        self.assertEqual(len(res.pv), 3)
+
+    def test_wins_hanging_queen(self):
+        # Arrange
+        board = Board("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+
+        # Act
+        res = search(board, 2)
+
+        # Assert
+        self.assertEqual(res.move, ((1, 4), (4, 4)))
+        self.assertGreater(res.score, 400)
+
+    def test_board_restored(self):
+        # Arrange
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        board = Board(fen)
+
+        # Act
+        res = search(board, 3, node_limit=500)
+
+        # Assert
+        self.assertEqual(board.to_fen(), fen)
+        self.assertEqual(board.hash, Board(fen).hash)
+        self.assertEqual(board.undo_stack, [])
+        self.assertIsNotNone(res.move)
+
+    def test_node_limit(self):
+        # Act
+        res = Search(Board(), node_limit=300).search()
+
+        # Assert
+        self.assertLessEqual(res.nodes, 300)
+        self.assertGreaterEqual(res.depth, 1)
+        self.assertEqual(res.pv[0], res.move)
+
+    def test_time_limit(self):
+        # Act
+        res = search(Board(), time_limit=0.2)
+
+        # Assert
+        self.assertLess(res.time, 1.0)
+        self.assertIsNotNone(res.move)
+
+    def test_no_moves(self):
+        # Assert
+        self.assertEqual(search(Board("k7/2Q5/1K6/8/8/8/8/8 b - - 0 1"), 3).score, 0)
+        self.assertEqual(search(Board("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1"), 3).score, -MATE_SCORE)
+        self.assertIsNone(search(Board("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1"), 3).move)
+
+    def test_quiescence_stands_pat(self):
+        # Arrange
+        engine = Search(Board())
+
+        # Act
+        score = engine.quiescence(-INFINITY, INFINITY, 0)
+
+        # Assert
+        self.assertEqual(score, 0)
+        self.assertEqual(engine.nodes, 1)
+
+    def test_quiescence_resolves_exchanges(self):
+        # Arrange
+        board = Board("4k3/8/8/3p4/4P3/8/8/3QK3 w - - 0 1")
+        engine = Search(board)
+        # Black has no recapture, so the best of exd5 and Qxd5 is a static score.
+        expected = -INFINITY
+        for move in (((3, 3), (4, 4)), ((0, 4), (4, 4))):
+            board.push(move)
+            expected = max(expected, -engine.evaluate())
+            board.pop()
+
+        # Act
+        score = engine.quiescence(-INFINITY, INFINITY, 0)
+
+        # Assert
+        self.assertEqual(score, expected)
+        self.assertGreater(score, 900)
+
+    def test_quiescence_avoids_defended_pawn(self):
+        # Arrange
+        board = Board("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1")
+
+        # Act
+        res = search(board, 1)
+
+        # Assert
+        self.assertNotEqual(res.move, ((0, 4), (4, 4)))
+        self.assertGreater(res.score, 600)
+        self.assertLess(res.score, 800)
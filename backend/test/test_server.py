@@ -0,0 +1,170 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from loadgen import Connection, handler_move, run_load
+from server import GameServer, LatencyStats, percentiles
+
+FOOLS_MATE = ["f2f3", "e7e5", "g2g4", "d8h4"]
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GameServer(max_games=3)
+        await self.server.start(port=0)
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.server.wait_closed()
+
+    async def connect(self) -> Connection:
+        return Connection(*await asyncio.open_connection("127.0.0.1", self.server.port))
+
+    async def test_play_to_checkmate(self):
+        # Arrange
+        client = await self.connect()
+        game = (await client.request(op="new", id=7))
+
+        # Act
+        responses = [await client.request(op="move", game=game["game"], move=move) for move in FOOLS_MATE]
+        after = await client.request(op="move", game=game["game"], move="e2e4")
+        await client.close()
+
+        # Assert
+        self.assertEqual(game["id"], 7)
+        self.assertTrue(game["fen"].startswith("rnbqkbnr/pppppppp"))
+        self.assertTrue(all(response["ok"] for response in responses))
+        self.assertFalse(responses[-2]["game_over"])
+        self.assertTrue(responses[-1]["game_over"])
+        self.assertTrue(responses[-1]["result"].startswith("BLACK wins!"))
+        self.assertEqual(after, {"ok": False, "error": "Game is over.", **{key: responses[-1][key] for key in ("fen", "game_over", "result")}})
+
+    async def test_invalid_requests(self):
+        # Arrange
+        client = await self.connect()
+        game = (await client.request(op="new", fen="8/P1k5/K7/8/8/8/8/8 w - - 0 1"))["game"]
+        start = (await client.request(op="new"))["game"]
+
+        # Act
+        unrequested_promotion = await client.request(op="move", game=start, move="e2e4=q")
+        malformed = await client.request(op="move", game=game, move="a7")
+        illegal = await client.request(op="move", game=game, move="a6b7")
+        missing_promotion = await client.request(op="move", game=game, move="a7a8")
+        promotion = await client.request(op="move", game=game, move="a7a8=n")
+        unknown = await client.request(op="resign", game=game)
+        client.writer.write(b"not json\n")
+        garbage = await client.reader.readline()
+        start_state = await client.request(op="state", game=start)
+        await client.close()
+
+        # Assert
+        self.assertFalse(unrequested_promotion["ok"])
+        self.assertIn("is not a legal move", unrequested_promotion["error"])
+        self.assertTrue(start_state["fen"].startswith("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w"))
+        self.assertIn("Too short", malformed["error"])
+        self.assertIn("puts the current player in check", illegal["error"])
+        self.assertIn("requires promotion piece", missing_promotion["error"])
+        self.assertTrue(promotion["fen"].startswith("N7/2k5/K7"))
+        self.assertEqual(unknown["error"], "Unknown operation resign.")
+        self.assertIn(b'"ok": false', garbage)
+
+    async def test_invalid_fen(self):
+        # Arrange
+        client = await self.connect()
+
+        # Act
+        garbage = await client.request(op="new", fen="garbage")
+        bad_piece = await client.request(op="new", fen="x7/8/8/8/8/8/8/8 w - - 0 1")
+        stats = await client.request(op="stats")
+        await client.close()
+
+        # Assert
+        self.assertEqual(garbage, {"ok": False, "error": "Invalid FEN garbage: Invalid FEN string."})
+        self.assertFalse(bad_piece["ok"])
+        self.assertTrue(bad_piece["error"].startswith("Invalid FEN x7/8"))
+        self.assertEqual(stats["games"], 0)
+
+    async def test_games_belong_to_their_connection(self):
+        # Arrange
+        first, second = await self.connect(), await self.connect()
+        game = (await first.request(op="new"))["game"]
+
+        # Act
+        other = await second.request(op="state", game=game)
+        await first.close()
+        # A round trip on another connection lets the server notice the close.
+        await asyncio.sleep(0.05)
+        await second.request(op="stats")
+        open_games = len(self.server.sessions)
+        await second.close()
+
+        # Assert
+        self.assertEqual(other["error"], f"No game {game} on this connection.")
+        self.assertEqual(open_games, 0)
+
+    async def test_max_games(self):
+        # Arrange
+        client = await self.connect()
+
+        # Act
+        responses = [await client.request(op="new") for _ in range(4)]
+        await client.request(op="close", game=responses[0]["game"])
+        reopened = await client.request(op="new")
+        await client.close()
+
+        # Assert
+        self.assertEqual([response["ok"] for response in responses], [True, True, True, False])
+        self.assertEqual(responses[3]["error"], "Server is full (3 games).")
+        self.assertTrue(reopened["ok"])
+
+    async def test_stats(self):
+        # Arrange
+        client = await self.connect()
+        game = (await client.request(op="new"))["game"]
+        await client.request(op="move", game=game, move="e2e4")
+
+        # Act
+        stats = await client.request(op="stats")
+        await client.close()
+
+        # Assert
+        self.assertEqual(stats["games"], 1)
+        self.assertEqual(set(stats["latency"]), {"new", "move"})
+        self.assertEqual(stats["latency"]["move"]["count"], 1)
+        self.assertLessEqual(stats["latency"]["move"]["p50"], stats["latency"]["move"]["max"])
+
+    async def test_load_generator(self):
+        # Arrange
+        self.server.max_games = 20
+
+        # Act
+        result = await run_load("127.0.0.1", self.server.port, connections=2, games=20, moves=3, active=2, seed=1)
+
+        # Assert
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(result.requests, 20 + 2 * 2 * 3)
+        self.assertEqual(result.server["games"], 20)
+        self.assertEqual(result.server["latency"]["move"]["count"], 12)
+
+class TestLatency(unittest.TestCase):
+    def test_percentiles(self):
+        # Arrange
+        stats = LatencyStats(size=100)
+
+        # Act
+        for i in range(200):
+            stats.add("move", i / 1000)
+
+        # Assert
+        self.assertEqual(stats.summary(), {"move": {"count": 200, "p50": 150.0, "p90": 190.0, "p99": 199.0, "max": 199.0}})
+        self.assertEqual(percentiles([0.001]), {"p50": 1.0, "p90": 1.0, "p99": 1.0, "max": 1.0})
+
+    def test_handler_move(self):
+        # Assert
+        self.assertEqual(handler_move(((1, 3), (3, 3))), "e2e4")
+        self.assertEqual(handler_move(((6, 7), (7, 7, 'q'))), "a7a8=q")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from evaluator import GameEvaluator
+from movegen import legal_moves
+from search import Search, MATE_SCORE
+from tablebase import Tablebases, ProbeResult, generate, parse_signature, signature_name, canonical, ILLEGAL
+
+def random_board(rng: random.Random, white: str, black: str) -> Board:
+    """A random placement of the given pieces, which may be illegal."""
+    while True:
+        cells = [""] * 64
+        for letter, sq in zip(white + black.lower(), rng.sample(range(64), len(white) + len(black))):
+            cells[sq] = letter
+        if "P" in cells[:8] + cells[56:] or "p" in cells[:8] + cells[56:]:
+            continue
+        ranks = []
+        for rank in range(8):
+            text = "".join(cell or "1" for cell in cells[rank * 8:rank * 8 + 8])
+            for count in range(8, 1, -1):
+                text = text.replace("1" * count, str(count))
+            ranks.append(text)
+        return Board(f"{'/'.join(ranks)} {rng.choice('wb')} - - 0 1")
+
+class TestTablebase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        generate("KQvK", cls.directory)
+        generate("KPvK", cls.directory)
+        cls.tablebases = Tablebases(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_signatures(self):
+        # Assert
+        self.assertEqual(parse_signature("KQvK"), ((0, 6), (0, 5), (1, 6)))
+        self.assertEqual(parse_signature("knbk"), ((0, 6), (0, 3), (0, 2), (1, 6)))
+        self.assertEqual(signature_name(parse_signature("KNBvK")), "KBNvK")
+        self.assertEqual(canonical(parse_signature("KvKR")), (parse_signature("KRvK"), True))
+        self.assertEqual(canonical(parse_signature("KNvKN")), (parse_signature("KNvKN"), False))
+        for signature in ("KQ", "KQvKvK", "KXvK", "KQRvKR"):
+            with self.assertRaises(ValueError):
+                parse_signature(signature)
+
+    def test_generated_tables(self):
+        # Generating KPvK also writes the tables its promotions and captures lead to.
+        # Assert
+        self.assertEqual(sorted(os.listdir(self.directory)), ["KBvK.tb", "KNvK.tb", "KPvK.tb", "KQvK.tb", "KRvK.tb", "KvK.tb"])
+        values = np.fromfile(os.path.join(self.directory, "KQvK.tb"), dtype=np.int8)
+        self.assertEqual(len(values), 2 * 64 ** 3)
+        # The longest KQK mate is 10 moves, and the lone king can never win.
+        self.assertEqual(values[values != ILLEGAL].max(), 19)
+        self.assertFalse((values[64 ** 3:] > 0).any())
+        knight = np.fromfile(os.path.join(self.directory, "KNvK.tb"), dtype=np.int8)
+        self.assertTrue((knight[knight != ILLEGAL] == 0).all())
+
+    def test_probe(self):
+        # Assert
+        self.assertEqual(self.tablebases.probe(Board("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1")), ProbeResult(-1, 0))
+        self.assertEqual(self.tablebases.probe(Board("k7/7Q/1K6/8/8/8/8/8 w - - 0 1")), ProbeResult(1, 1))
+        self.assertEqual(self.tablebases.probe(Board("k7/2Q5/1K6/8/8/8/8/8 b - - 0 1")), ProbeResult(0, 0))
+        self.assertEqual(self.tablebases.probe(Board("8/8/8/8/8/k7/p7/K7 w - - 0 1")), ProbeResult(0, 0))
+        # Colors are swapped to probe the black side's material.
+        self.assertEqual(self.tablebases.probe(Board("K7/1q6/1k6/8/8/8/8/8 w - - 0 1")), ProbeResult(-1, 0))
+        self.assertEqual(self.tablebases.probe(Board("8/8/8/8/8/8/8/K1k4q w - - 0 1")),
+                         self.tablebases.probe(Board("k1K4Q/8/8/8/8/8/8/8 b - - 0 1")))
+        for backend in ("bitboard", "compact"):
+            self.assertEqual(self.tablebases.probe(Board("k7/7Q/1K6/8/8/8/8/8 w - - 0 1", backend)), ProbeResult(1, 1))
+
+    def test_probe_outside_tables(self):
+        # Assert
+        self.assertIsNone(self.tablebases.probe(Board()))
+        self.assertIsNone(self.tablebases.probe(Board("8/8/8/8/8/k7/8/K5NB w - - 0 1")))
+        self.assertIsNone(self.tablebases.probe(Board("k7/8/8/8/8/8/8/4K2R w K - 0 1")))
+        # The side not to move is in check.
+        self.assertIsNone(self.tablebases.probe(Board("k7/8/8/8/8/8/8/Q6K w - - 0 1")))
+
+    def test_tables_load_lazily(self):
+        # Arrange
+        tablebases = Tablebases(self.directory)
+
+        # Act
+        opened = dict(tablebases.tables)
+        result = tablebases.probe(Board("k7/7Q/1K6/8/8/8/8/8 w - - 0 1"))
+
+        # Assert
+        self.assertEqual(opened, {})
+        self.assertEqual(result, ProbeResult(1, 1))
+        self.assertEqual([signature_name(pieces) for pieces in tablebases.tables], ["KQvK"])
+
+    def test_matches_legal_moves(self):
+        # Every position's value must follow from the values after each of its legal moves.
+        # Arrange
+        rng = random.Random(7)
+        checked = 0
+
+        while checked < 150:
+            board = random_board(rng, *rng.choice([("KQ", "K"), ("KP", "K"), ("K", "KP")]))
+            result = self.tablebases.probe(board)
+            if result is None:
+                continue
+            checked += 1
+
+            # Act
+            moves = legal_moves(board)
+            outcomes = []
+            for move in moves:
+                board.push(move)
+                child = self.tablebases.probe(board)
+                board.pop()
+                outcomes.append((-child.wdl, child.dtm + 1 if child.wdl else 0))
+            wins = [dtm for wdl, dtm in outcomes if wdl > 0]
+            losses = [dtm for wdl, dtm in outcomes if wdl < 0]
+
+            # Assert
+            if not moves:
+                expected = ProbeResult(-1, 0) if GameEvaluator(board).in_check() else ProbeResult(0, 0)
+            elif wins:
+                expected = ProbeResult(1, min(wins))
+            elif len(losses) == len(outcomes):
+                expected = ProbeResult(-1, max(losses))
+            else:
+                expected = ProbeResult(0, 0)
+            self.assertEqual(result, expected, board.to_fen())
+
+    def test_search_uses_tablebases(self):
+        # Arrange
+        board = Board("8/8/8/4k3/8/8/8/KQ6 w - - 0 1")
+        dtm = self.tablebases.probe(board).dtm
+
+        # Act
+        result = Search(board, max_depth=2, tablebases=self.tablebases).search()
+
+        # Assert
+        self.assertEqual(result.score, MATE_SCORE - dtm)
+        board.push(result.move)
+        self.assertEqual(self.tablebases.probe(board), ProbeResult(-1, dtm - 1))
+
+if __name__ == '__main__':
+    unittest.main()
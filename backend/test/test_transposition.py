@@ -0,0 +1,111 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from board import Board
+from search import MATE_SCORE, Search
+from transposition import ENTRY, EXACT, LOWER, UPPER, TranspositionTable, encode_move, decode_move
+
+class TestTransposition(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.table = TranspositionTable(0.001)
+
+    def test_size_budget(self):
+        # Act
+        table = TranspositionTable(2)
+
+        # Assert
+        self.assertLessEqual(table.size_bytes, 2 * 1024 * 1024)
+        self.assertGreater(table.size_bytes, 2 * 1024 * 1024 - 2 * ENTRY.itemsize)
+        self.assertEqual(len(table) % 2, 0)
+
+    def test_encode_move(self):
+        # Arrange
+        moves = [((1, 3), (3, 3)), ((6, 7), (7, 6, "n")), ((0, 0), (7, 7, "q")), ((7, 7), (0, 0))]
+
+        # Assert
+        for move in moves:
+            self.assertEqual(decode_move(encode_move(move)), move)
+        self.assertEqual(encode_move(None), 0)
+        self.assertIsNone(decode_move(0))
+
+    def test_store_and_probe(self):
+        # Arrange
+        key = Board().hash ^ (1 << 63)
+
+        # Act
+        self.table.store(key, 5, EXACT, -42, ((1, 3), (3, 3)))
+
+        # Assert
+        self.assertEqual(self.table.probe(key), (5, EXACT, -42, ((1, 3), (3, 3))))
+        self.assertIsNone(self.table.probe(key + 1))
+        self.assertEqual(self.table.hit_rate(), 0.5)
+
+    def test_depth_preferred_replacement(self):
+        # Arrange
+        buckets = len(self.table) // 2
+        deep, shallow, newer = 7, 7 + buckets, 7 + 2 * buckets
+
+        # Act
+        self.table.store(deep, 6, LOWER, 10, None)
+        self.table.store(shallow, 2, UPPER, 20, None)
+        self.table.store(newer, 1, EXACT, 30, None)
+
+        # Assert
+        self.assertEqual(self.table.probe(deep), (6, LOWER, 10, None))
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertEqual(self.table.probe(newer), (1, EXACT, 30, None))
+
+    def test_new_search_frees_depth_preferred_slot(self):
+        # Arrange
+        buckets = len(self.table) // 2
+        self.table.store(3, 6, EXACT, 10, None)
+
+        # Act
+        self.table.new_search()
+        self.table.store(3 + buckets, 1, EXACT, 20, None)
+
+        # Assert
+        self.assertEqual(self.table.slot(3), 6)
+        self.assertEqual(self.table.keys[6], 3 + buckets)
+
+    def test_keeps_best_move(self):
+        # Act
+        self.table.store(11, 3, EXACT, 0, ((1, 3), (3, 3)))
+        self.table.store(11, 4, UPPER, -5, None)
+
+        # Assert
+        self.assertEqual(self.table.probe(11), (4, UPPER, -5, ((1, 3), (3, 3))))
+
+    def test_stats(self):
+        # Arrange
+        table = TranspositionTable(1)
+
+        # Act
+        res = Search(Board(), 3, table=table).search()
+        stats = table.stats()
+
+        # Assert
+        self.assertIsNotNone(res.move)
+        self.assertGreater(stats["hits"], 0)
+        self.assertGreater(stats["occupancy"], 0)
+        self.assertLessEqual(stats["occupancy"], 1)
+        table.clear()
+        self.assertEqual(table.occupancy(), 0)
+
+    def test_search_mate_through_table(self):
+        # Arrange
+        table = TranspositionTable(1)
+        board = Board("k7/8/8/1K6/8/8/8/7R w - - 0 1")
+
+        # Act
+        first = Search(board, 4, table=table).search()
+        second = Search(board, 4, table=table).search()
+
+        # Assert
+        self.assertEqual(first.score, MATE_SCORE - 3)
+        self.assertEqual(second.score, MATE_SCORE - 3)
+        self.assertLessEqual(second.nodes, first.nodes)
@@ -0,0 +1,135 @@
+import io
+import os
+import sys
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from movegen import legal_moves
+from perft import move_to_str
+from search import MATE_SCORE
+from transposition import DEFAULT_SIZE_MB
+from uci import UciEngine, time_for_move, format_score
+
+class TestUci(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.engine = UciEngine(self.output)
+
+    def lines(self) -> list[str]:
+        return self.output.getvalue().splitlines()
+
+    def test_handshake(self):
+        # Act
+        self.engine.handle("uci")
+        self.engine.handle("isready")
+
+        # Assert
+        self.assertTrue(self.lines()[0].startswith("id name"))
+        self.assertEqual(self.lines()[-2:], ["uciok", "readyok"])
+        self.assertFalse(self.engine.handle("quit"))
+
+    def test_position(self):
+        # Act
+        self.engine.handle("position startpos moves e2e4 e7e5 g1f3")
+        startpos = self.engine.board.to_fen().split()[:4]
+        self.engine.handle("position fen 8/P1k5/K7/8/8/8/8/8 w - - 0 1 moves a7a8n")
+
+        # Assert
+        self.assertEqual(startpos, "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq -".split())
+        self.assertEqual(self.engine.board.to_fen().split()[:4], "N7/2k5/K7/8/8/8/8/8 b - -".split())
+
+    def test_illegal_position_move(self):
+        # Act
+        self.engine.handle("position startpos moves e2e5")
+
+        # Assert
+        self.assertEqual(self.lines(), ["info string Illegal move e2e5"])
+        self.assertEqual(self.engine.board.to_fen().split()[:4], "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -".split())
+
+    def test_invalid_position_fen(self):
+        # Arrange
+        self.engine.handle("position startpos moves d2d4")
+
+        # Act
+        self.engine.handle("position fen garbage moves e2e4")
+
+        # Assert
+        self.assertEqual(self.lines(), ["info string Invalid position garbage: Invalid FEN string."])
+        self.assertEqual(self.engine.board.to_fen().split()[:3], "rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq".split())
+
+    def test_invalid_option_values(self):
+        # Act
+        self.engine.handle("setoption name BookFile value /nonexistent.bin")
+        self.engine.handle("setoption name Hash value big")
+        self.engine.handle("setoption name Hash value 0")
+        running = self.engine.handle("isready")
+
+        # Assert
+        self.assertTrue(running)
+        self.assertTrue(self.lines()[0].startswith("info string Invalid value /nonexistent.bin for option bookfile"))
+        self.assertTrue(self.lines()[1].startswith("info string Invalid value big for option hash"))
+        self.assertEqual(self.lines()[2], "info string Invalid value 0 for option hash: Hash must be a positive number of megabytes.")
+        self.assertEqual(self.lines()[3], "readyok")
+        self.assertIsNone(self.engine.book)
+        self.assertEqual(self.engine.size_mb, DEFAULT_SIZE_MB)
+
+    def test_go_depth(self):
+        # Arrange
+        self.engine.handle("position fen k7/7Q/1K6/8/8/8/8/8 w - - 0 1")
+        legal = {move_to_str(move) for move in legal_moves(self.engine.board)}
+
+        # Act
+        self.engine.handle("go depth 2")
+        self.engine.stop_search()
+
+        # Assert
+        self.assertIn("score mate 1", self.lines()[-2])
+        self.assertIn(self.lines()[-1].split()[1], legal)
+        self.assertIn(self.lines()[-1], ("bestmove h7b7", "bestmove h7a7"))
+
+    def test_stop_and_isready_during_infinite_search(self):
+        # Act
+        self.engine.handle("position startpos")
+        self.engine.handle("go infinite")
+        time.sleep(0.2)
+        self.engine.handle("isready")
+        ready = list(self.lines())
+        start = time.perf_counter()
+        self.engine.handle("stop")
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertIn("readyok", ready)
+        self.assertFalse(any(line.startswith("bestmove") for line in ready))
+        self.assertTrue(self.lines()[-1].startswith("bestmove"))
+        self.assertLess(elapsed, 2)
+
+    def test_clock(self):
+        # Act
+        self.engine.handle("position startpos")
+        self.engine.handle("go wtime 3000 btime 3000 winc 0 binc 0")
+        start = time.perf_counter()
+        self.engine.worker.join()
+
+        # Assert
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertTrue(self.lines()[-1].startswith("bestmove"))
+
+    def test_time_for_move(self):
+        # Assert
+        self.assertAlmostEqual(time_for_move(60000), 2.0)
+        self.assertAlmostEqual(time_for_move(60000, 1000, 10), 6.75)
+        self.assertAlmostEqual(time_for_move(100, 1000), 0.05)
+        self.assertAlmostEqual(time_for_move(0), 0.01)
+
+    def test_format_score(self):
+        # Assert
+        self.assertEqual(format_score(35), "cp 35")
+        self.assertEqual(format_score(MATE_SCORE - 1), "mate 1")
+        self.assertEqual(format_score(MATE_SCORE - 3), "mate 2")
+        self.assertEqual(format_score(-MATE_SCORE + 2), "mate -1")
+
+if __name__ == '__main__':
+    unittest.main()